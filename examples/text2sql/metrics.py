@@ -9,6 +9,8 @@ Two orthogonal metrics:
 import sqlite3
 from typing import Any, Dict
 
+from qym.metrics import cpu_bound
+
 
 def _clean_sql(sql: str) -> str:
     """Remove markdown code blocks if present."""
@@ -75,6 +77,7 @@ def valid_sql(output: Any, expected: Any, input_data: Dict[str, Any]) -> Dict[st
         }
 
 
+@cpu_bound
 def execution_accuracy(output: Any, expected: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Check if the generated SQL produces the same results as the expected SQL.
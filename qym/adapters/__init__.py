@@ -1 +1,6 @@
-"""Task adapters for different LLM frameworks."""
\ No newline at end of file
+"""Task adapters for different LLM frameworks."""
+
+from .base import batch_task, is_batch_task
+from .replay import Replay, TaskRecorder
+
+__all__ = ["batch_task", "is_batch_task", "Replay", "TaskRecorder"]
@@ -3,9 +3,30 @@
 import asyncio
 import inspect
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Callable, Dict, Tuple, List
+from concurrent.futures import Executor
+from typing import Any, Optional, Callable, Dict, Sequence, Tuple, List
 from langfuse import Langfuse
 
+_BATCH_TASK_ATTR = "__qym_batch_task__"
+
+
+def batch_task(func: Callable) -> Callable:
+    """Mark a task function as batched: it takes a list of inputs and returns
+    a list of outputs in the same order.
+
+    The evaluator groups concurrent items into micro-batches (up to
+    ``task_batch_size`` items, waiting at most ``task_batch_wait`` seconds)
+    and scatters the outputs back to each item's trace and result row. An
+    exception returned in an input's slot fails only that item.
+    """
+    setattr(func, _BATCH_TASK_ATTR, True)
+    return func
+
+
+def is_batch_task(func: Any) -> bool:
+    """Whether ``func`` was marked with :func:`batch_task`."""
+    return bool(getattr(func, _BATCH_TASK_ATTR, False))
+
 
 class TaskAdapter(ABC):
     """Base class for task adapters."""
@@ -13,6 +34,12 @@ class TaskAdapter(ABC):
     def __init__(self, task: Any, client: Optional[Langfuse]):
         self.task = task
         self.client = client
+        # Thread pool for sync tasks; set by the Evaluator for the duration of a
+        # run (None falls back to the loop's default executor).
+        self.executor: Optional[Executor] = None
+        # Subprocess pool for sync tasks (config.task_processes); used instead
+        # of ``executor`` when set.
+        self.processes: Optional[Any] = None
     
     @abstractmethod
     async def arun(self, input_data: Any, trace: Any, *, model_name: Optional[str] = None) -> Any:
@@ -23,6 +50,28 @@ class TaskAdapter(ABC):
         """Run the task synchronously."""
         return asyncio.run(self.arun(input_data, trace, model_name=model_name))
 
+    @property
+    def supports_batch(self) -> bool:
+        """Whether ``arun_batch`` can send several inputs in one backend call."""
+        return False
+
+    async def arun_batch(
+        self, inputs: Sequence[Any], traces: Sequence[Any], *, model_name: Optional[str] = None
+    ) -> List[Any]:
+        """Run the task on a batch of inputs; outputs are returned in input order.
+
+        An input that failed on its own is returned as its exception, in its slot.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support batched calls")
+
+    @staticmethod
+    def _trace_batch(traces: Sequence[Any], outputs: Sequence[Any]) -> None:
+        for trace, output in zip(traces, outputs):
+            if isinstance(output, BaseException):
+                trace.update(output={"error": str(output)})
+            else:
+                trace.update(output=output)
+
 
 class FunctionAdapter(TaskAdapter):
     """Adapter for regular Python functions with smart argument resolution."""
@@ -154,9 +203,11 @@ class FunctionAdapter(TaskAdapter):
             # Check if function is async
             if self._is_async:
                 output = await self.task(*args, **kwargs)
+            elif self.processes is not None:
+                output = await self.processes.call(args, kwargs)
             else:
                 # Run sync function in thread pool to avoid blocking
-                output = await loop.run_in_executor(None, lambda: self.task(*args, **kwargs))
+                output = await loop.run_in_executor(self.executor, lambda: self.task(*args, **kwargs))
 
             # Update trace with output
             trace.update(output=output)
@@ -166,30 +217,78 @@ class FunctionAdapter(TaskAdapter):
             trace.update(output={"error": str(e)})
             raise
 
+    @property
+    def supports_batch(self) -> bool:
+        return is_batch_task(self.task)
+
+    async def arun_batch(
+        self, inputs: Sequence[Any], traces: Sequence[Any], *, model_name: Optional[str] = None
+    ) -> List[Any]:
+        """Call a :func:`batch_task` function once with the list of inputs."""
+        for trace, input_data in zip(traces, inputs):
+            trace.update(input=input_data)
+
+        kwargs: Dict[str, Any] = {}
+        if self._model_param:
+            kwargs[self._model_param] = model_name
+        elif self._accepts_kwargs and model_name:
+            kwargs["model"] = model_name
+
+        batch = list(inputs)
+        try:
+            if self._is_async:
+                outputs = await self.task(batch, **kwargs)
+            elif self.processes is not None:
+                outputs = await self.processes.call((batch,), kwargs)
+            else:
+                loop = asyncio.get_event_loop()
+                outputs = await loop.run_in_executor(self.executor, lambda: self.task(batch, **kwargs))
+            outputs = list(outputs)
+        except Exception as e:
+            for trace in traces:
+                trace.update(output={"error": str(e)})
+            raise
+        self._trace_batch(traces, outputs)
+        return outputs
+
 
 class LangChainAdapter(TaskAdapter):
     """Adapter for LangChain chains and agents."""
     
+    def _chain_input(self, input_data: Any, model_name: Optional[str]) -> Dict[str, Any]:
+        """Map an item input to the chain's input dict."""
+        if isinstance(input_data, dict):
+            chain_input = dict(input_data)
+        else:
+            # Try to determine input key
+            if hasattr(self.task, 'input_keys') and self.task.input_keys:
+                chain_input = {self.task.input_keys[0]: input_data}
+            else:
+                chain_input = {"input": input_data}
+
+        if model_name:
+            chain_input.setdefault("model", model_name)
+            chain_input.setdefault("model_name", model_name)
+        return chain_input
+
+    def _final_output(self, output: Any) -> Any:
+        """Pick the main output out of a chain result."""
+        if isinstance(output, dict):
+            # Try to get the main output
+            if 'output' in output:
+                return output['output']
+            if hasattr(self.task, 'output_keys') and self.task.output_keys:
+                return output.get(self.task.output_keys[0], output)
+        return output
+
     async def arun(self, input_data: Any, trace: Any, *, model_name: Optional[str] = None) -> Any:
         """Run LangChain component with Langfuse callback."""
         # Update trace with input
         trace.update(input=input_data)
         
         try:
-            # Prepare input
-            if isinstance(input_data, dict):
-                chain_input = dict(input_data)
-            else:
-                # Try to determine input key
-                if hasattr(self.task, 'input_keys') and self.task.input_keys:
-                    chain_input = {self.task.input_keys[0]: input_data}
-                else:
-                    chain_input = {"input": input_data}
-
-            if model_name:
-                chain_input.setdefault("model", model_name)
-                chain_input.setdefault("model_name", model_name)
-            
+            chain_input = self._chain_input(input_data, model_name)
+
             # Run chain/agent
             if hasattr(self.task, 'ainvoke'):
                 # Async chain
@@ -198,23 +297,13 @@ class LangChainAdapter(TaskAdapter):
                 # Sync chain - run in thread pool
                 loop = asyncio.get_event_loop()
                 output = await loop.run_in_executor(
-                    None,
+                    self.executor,
                     lambda: self.task.invoke(chain_input)
                 )
             else:
                 raise ValueError("LangChain object must have 'invoke' or 'ainvoke' method")
             
-            # Extract output
-            if isinstance(output, dict):
-                # Try to get the main output
-                if 'output' in output:
-                    final_output = output['output']
-                elif hasattr(self.task, 'output_keys') and self.task.output_keys:
-                    final_output = output.get(self.task.output_keys[0], output)
-                else:
-                    final_output = output
-            else:
-                final_output = output
+            final_output = self._final_output(output)
             
             # Update trace with output
             trace.update(output=final_output)
@@ -224,6 +313,42 @@ class LangChainAdapter(TaskAdapter):
             trace.update(output={"error": str(e)})
             raise
 
+    @property
+    def supports_batch(self) -> bool:
+        return hasattr(self.task, 'abatch') or hasattr(self.task, 'batch')
+
+    async def arun_batch(
+        self, inputs: Sequence[Any], traces: Sequence[Any], *, model_name: Optional[str] = None
+    ) -> List[Any]:
+        """Run a micro-batch through the runnable's ``abatch`` (or ``batch``).
+
+        ``return_exceptions=True`` keeps one bad input from failing the whole
+        micro-batch: its exception comes back in its own slot.
+        """
+        for trace, input_data in zip(traces, inputs):
+            trace.update(input=input_data)
+
+        chain_inputs = [self._chain_input(input_data, model_name) for input_data in inputs]
+        try:
+            if hasattr(self.task, 'abatch'):
+                outputs = await self.task.abatch(chain_inputs, return_exceptions=True)
+            else:
+                loop = asyncio.get_event_loop()
+                outputs = await loop.run_in_executor(
+                    self.executor,
+                    lambda: self.task.batch(chain_inputs, return_exceptions=True)
+                )
+            final_outputs = [
+                output if isinstance(output, BaseException) else self._final_output(output)
+                for output in outputs
+            ]
+        except Exception as e:
+            for trace in traces:
+                trace.update(output={"error": str(e)})
+            raise
+        self._trace_batch(traces, final_outputs)
+        return final_outputs
+
 
 class OpenAIAdapter(TaskAdapter):
     """Adapter for OpenAI client calls."""
@@ -244,7 +369,7 @@ class OpenAIAdapter(TaskAdapter):
                 output = await self.task(payload)
             else:
                 loop = asyncio.get_event_loop()
-                output = await loop.run_in_executor(None, self.task, payload)
+                output = await loop.run_in_executor(self.executor, self.task, payload)
             
             # Update trace with output
             trace.update(output=output)
@@ -266,6 +391,11 @@ def auto_detect_task(task: Any, client: Optional[Langfuse]) -> TaskAdapter:
     Returns:
         Appropriate TaskAdapter instance
     """
+    # Recorded task calls (offline replay)
+    from .replay import Replay, ReplayAdapter
+    if isinstance(task, Replay):
+        return ReplayAdapter(task, client)
+
     # Check for LangChain
     if hasattr(task, 'invoke') or hasattr(task, 'ainvoke'):
         return LangChainAdapter(task, client)
@@ -0,0 +1,200 @@
+"""Record task calls and replay them offline with their recorded latencies."""
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from langfuse import Langfuse
+
+from ..utils.errors import status_code_of
+from .base import TaskAdapter
+
+
+def _input_key(task_input: Any, model: Optional[str]) -> str:
+    payload = json.dumps(
+        {"model": model or "", "input": task_input},
+        sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TaskRecorder:
+    """Append one JSON line per task call: input, model, output or error, latency.
+
+    Set ``record_task_calls`` in the evaluator config to record a run. Every
+    attempt is recorded (retries and hedges included) in call order, so a
+    replay reproduces errors followed by successful retries.
+    """
+
+    def __init__(self, path: str, *, task_name: Optional[str] = None) -> None:
+        self.path = path
+        self.task_name = task_name
+        self.records = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(
+        self,
+        task_input: Any,
+        model: Optional[str],
+        latency: float,
+        *,
+        output: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        entry: Dict[str, Any] = {
+            "key": _input_key(task_input, model),
+            "task": self.task_name,
+            "model": model,
+            "input": task_input,
+            "latency": round(latency, 6),
+            "recorded_at": time.time(),
+        }
+        if error is not None:
+            entry["error"] = str(error) or type(error).__name__
+            entry["error_type"] = type(error).__name__
+            status = status_code_of(error)
+            if status is not None:
+                entry["status_code"] = status
+        else:
+            entry["output"] = output
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.records += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class ReplayError(RuntimeError):
+    """A task call that failed when it was recorded.
+
+    Carries the original exception's class name (``error_type``) and HTTP
+    ``status_code`` so error classification treats it like the live failure.
+    """
+
+    def __init__(
+        self, message: str, *, error_type: Optional[str] = None, status_code: Optional[int] = None
+    ) -> None:
+        super().__init__(message)
+        self.error_type = error_type
+        self.status_code = status_code
+
+
+class ReplayMiss(LookupError):
+    """No recorded call for an input."""
+
+
+class Replay:
+    """Stand-in task that serves recorded outputs; pass it as an Evaluator task.
+
+    ``timing="exact"`` waits each call's own recorded latency (calls with the
+    same input are replayed in recorded order, cycling). ``timing="sampled"``
+    draws latencies from the recording's overall latency distribution, which
+    also covers inputs with a single noisy recording. ``speed`` scales time:
+    2.0 replays twice as fast. With ``strict=False`` unknown inputs return
+    ``None`` after a sampled delay instead of raising :class:`ReplayMiss`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        timing: str = "exact",
+        speed: float = 1.0,
+        seed: Optional[int] = None,
+        strict: bool = True,
+        ignore_model: bool = False,
+    ) -> None:
+        if timing not in {"exact", "sampled"}:
+            raise ValueError("timing must be 'exact' or 'sampled'")
+        if speed <= 0:
+            raise ValueError("speed must be > 0")
+        self.path = path
+        self.timing = timing
+        self.speed = float(speed)
+        self.strict = strict
+        self.ignore_model = ignore_model
+        self._rng = random.Random(seed)
+        self._calls: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self._cursor: Dict[str, int] = defaultdict(int)
+        self.latencies: List[float] = []
+        task_names = set()
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                key = _input_key(entry.get("input"), None) if ignore_model else entry["key"]
+                self._calls[key].append(entry)
+                self.latencies.append(float(entry.get("latency") or 0.0))
+                if entry.get("task"):
+                    task_names.add(entry["task"])
+        # Replayed runs file under the recorded task's name.
+        self.__name__ = self.__qualname__ = (
+            f"{task_names.pop()}_replay" if len(task_names) == 1 else "replay"
+        )
+        self.replayed = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(calls) for calls in self._calls.values())
+
+    def lookup(self, task_input: Any, model: Optional[str]) -> Optional[Dict[str, Any]]:
+        key = _input_key(task_input, None if self.ignore_model else model)
+        calls = self._calls.get(key)
+        if not calls:
+            return None
+        position = self._cursor[key]
+        self._cursor[key] = position + 1
+        return calls[position % len(calls)]
+
+    def delay(self, entry: Optional[Dict[str, Any]]) -> float:
+        if self.timing == "sampled" or entry is None:
+            latency = self._rng.choice(self.latencies) if self.latencies else 0.0
+        else:
+            latency = float(entry.get("latency") or 0.0)
+        return latency / self.speed
+
+
+class ReplayAdapter(TaskAdapter):
+    """Adapter for :class:`Replay` tasks: recorded outputs after recorded delays."""
+
+    def __init__(self, task: Replay, client: Optional[Langfuse]):
+        super().__init__(task, client)
+
+    async def arun(self, input_data: Any, trace: Any, *, model_name: Optional[str] = None) -> Any:
+        trace.update(input=input_data)
+        replay: Replay = self.task
+        entry = replay.lookup(input_data, model_name)
+        await asyncio.sleep(replay.delay(entry))
+        if entry is None:
+            replay.misses += 1
+            if replay.strict:
+                error = ReplayMiss(f"No recorded task call for this input in {replay.path}")
+                trace.update(output={"error": str(error)})
+                raise error
+            return None
+        replay.replayed += 1
+        if "error" in entry:
+            trace.update(output={"error": entry["error"]})
+            raise ReplayError(
+                entry["error"],
+                error_type=entry.get("error_type"),
+                status_code=entry.get("status_code"),
+            )
+        trace.update(output=entry.get("output"))
+        return entry.get("output")
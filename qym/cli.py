@@ -6,9 +6,10 @@ import json
 import sys
 import importlib.util
 from pathlib import Path
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 import shlex
 import asyncio
+import time
 
 from rich.console import Console
 from .core.evaluator import Evaluator
@@ -18,6 +19,7 @@ from .utils.text import arabic_display
 
 from .core.dataset import CsvDataset
 from .core.checkpoint import load_checkpoint_state
+from .adapters.replay import Replay
 
 console = Console()
 
@@ -52,8 +54,14 @@ def _load_runs_file(config_path: Path) -> Any:
 def load_multi_run_specs(config_path: Path) -> List[RunSpec]:
     """Parse a JSON/YAML config file into RunSpec objects."""
     data = _load_runs_file(config_path)
+    # Either a plain list of runs, or {"rate_limits": {...}, "runs": [...]} where
+    # the shared rate limits apply to every run (run-level entries win).
+    shared_rate_limits: Dict[str, Any] = {}
+    if isinstance(data, dict):
+        shared_rate_limits = dict(data.get("rate_limits") or {})
+        data = data.get("runs")
     if not isinstance(data, list):
-        raise ValueError("Multi-run config must be a list of run definitions")
+        raise ValueError("Multi-run config must be a list of run definitions or an object with a 'runs' list")
 
     specs: List[RunSpec] = []
     base_dir = config_path.parent
@@ -84,6 +92,11 @@ def load_multi_run_specs(config_path: Path) -> List[RunSpec]:
             raise ValueError(f"Run #{idx} metrics must be a list or comma-separated string")
 
         config_template = dict(entry.get("config") or {})
+        if shared_rate_limits:
+            config_template["rate_limits"] = {
+                **shared_rate_limits,
+                **dict(config_template.get("rate_limits") or {}),
+            }
         metadata_template = dict(entry.get("metadata") or {})
         # Resolve dataset object/name
         resolved_dataset: Any
@@ -199,17 +212,101 @@ def run_dashboard_command(args: List[str]) -> None:
     )
 
 
+def run_worker_command(args: List[str]) -> None:
+    """Run the worker subcommand (evaluate leases from a coordinator)."""
+    from .core.distributed import run_worker
+
+    parser = argparse.ArgumentParser(
+        prog="qym worker",
+        description="Evaluate items leased from a `qym coordinator`",
+    )
+    parser.add_argument(
+        "--connect",
+        required=True,
+        help="Coordinator address (host:port)",
+    )
+    parser.add_argument(
+        "--task-file",
+        default=None,
+        help="Load the task from this file instead of the coordinator's path",
+    )
+    parser.add_argument(
+        "--task-function",
+        default=None,
+        help="Task function name in --task-file",
+    )
+    parser.add_argument(
+        "--work-dir",
+        default=None,
+        help="Directory for lease checkpoints (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Name reported to the coordinator (default: hostname-pid)",
+    )
+
+    parsed = parser.parse_args(args)
+    if bool(parsed.task_file) != bool(parsed.task_function):
+        parser.error("--task-file and --task-function go together")
+    task = load_function_from_file(parsed.task_file, parsed.task_function) if parsed.task_file else None
+    try:
+        evaluated = run_worker(
+            parsed.connect, worker_id=parsed.worker_id, task=task, work_dir=parsed.work_dir
+        )
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Worker interrupted; its lease will be re-issued[/yellow]")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+    console.print(f"Worker finished: {evaluated} items evaluated")
+
+
+def _run_coordinator(evaluator: Evaluator, listen: str, lease_size: int, lease_ttl: float):
+    from .core.distributed import Coordinator
+
+    host, _, port = listen.rpartition(":")
+    coordinator = Coordinator(
+        evaluator, host=host or "127.0.0.1", port=int(port), lease_size=lease_size, lease_ttl=lease_ttl
+    )
+    host, port = coordinator.start()
+    console.print(f"Coordinator listening on {host}:{port} — start workers with: qym worker --connect <this-host>:{port}")
+    if coordinator.resumed:
+        console.print(f"Resuming {coordinator.path}: {coordinator.resumed} items already done")
+    try:
+        with console.status("Waiting for workers...") as status:
+            result = coordinator.wait(
+                on_progress=lambda s: status.update(
+                    f"{s['done']}/{s['total']} items • {len(s['workers'])} workers busy"
+                    f" • {s['expired_leases']} leases re-issued"
+                )
+            )
+        # Let polling workers see that the run is done before shutting down.
+        time.sleep(2)
+    finally:
+        coordinator.stop()
+    return result
+
+
 def main():
     """Main CLI entry point."""
     # Check for dashboard subcommand first
     if len(sys.argv) > 1 and sys.argv[1] == "dashboard":
         run_dashboard_command(sys.argv[2:])
         return
+    if len(sys.argv) > 1 and sys.argv[1] == "worker":
+        run_worker_command(sys.argv[2:])
+        return
     resume_mode = False
+    coordinator_mode = False
     argv = sys.argv[1:]
     if len(argv) > 0 and argv[0] == "resume":
         resume_mode = True
         argv = argv[1:]
+    elif len(argv) > 0 and argv[0] == "coordinator":
+        coordinator_mode = True
+        argv = argv[1:]
 
     parser = argparse.ArgumentParser(
         # Use arabic_display() for proper RTL text rendering in terminals
@@ -233,6 +330,11 @@ Examples:
 
   # Open dashboard to view historical runs
   qym dashboard
+
+  # Distribute a run: coordinator on one host, workers anywhere
+  qym coordinator --task-file bot.py --task-function chat \\
+           --dataset-csv data.csv --metrics exact_match --listen 0.0.0.0:8765
+  qym worker --connect coordinator-host:8765
         """
     )
     
@@ -320,6 +422,83 @@ Examples:
         dest="resume_from",
         help="Path to a checkpoint CSV to resume from"
     )
+    parser.add_argument(
+        "--cache",
+        choices=["on", "off", "refresh"],
+        default=None,
+        help="Task-output cache under the output dir: reuse (on), bypass (off) "
+             "or recompute and overwrite (refresh) cached outputs"
+    )
+    parser.add_argument(
+        "--record-calls",
+        default=None,
+        help="Append every task call (input, output, latency) to this JSONL file for --replay"
+    )
+    parser.add_argument(
+        "--replay",
+        default=None,
+        help="Replay task calls recorded with --record-calls instead of running --task-file"
+    )
+    parser.add_argument(
+        "--replay-timing",
+        choices=["exact", "sampled"],
+        default="exact",
+        help="--replay delays: each call's recorded latency (exact) or drawn from all recorded latencies (sampled)"
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="--replay time scale (2.0 = twice as fast)"
+    )
+    parser.add_argument(
+        "--load-rate",
+        type=float,
+        default=None,
+        help="Open-loop load test: send items at this many per second (in-flight capped by max_concurrency)"
+    )
+    parser.add_argument(
+        "--load-pattern",
+        choices=["constant", "poisson", "ramp"],
+        default=None,
+        help="--load-rate arrival pattern (default: constant)"
+    )
+    parser.add_argument(
+        "--task-processes",
+        type=int,
+        default=None,
+        help="Run a sync task in N worker subprocesses; calls past the timeout are killed"
+    )
+    parser.add_argument(
+        "--circuit-breaker",
+        action="store_true",
+        help="Pause calls to a failing model and probe before resuming; items skipped "
+        "while it is down are retried on --resume-from"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Split the dataset across N worker processes, each with its own "
+             "event loop and checkpoint; results are merged into one run file"
+    )
+    parser.add_argument(
+        "--listen",
+        default="127.0.0.1:8765",
+        help="qym coordinator: address to serve leases on (default: 127.0.0.1:8765)"
+    )
+    parser.add_argument(
+        "--lease-size",
+        type=int,
+        default=20,
+        help="qym coordinator: items per lease (default: 20)"
+    )
+    parser.add_argument(
+        "--lease-ttl",
+        type=float,
+        default=60.0,
+        help="qym coordinator: seconds without a heartbeat before a lease is re-issued (default: 60)"
+    )
     parser.add_argument(
         "--quiet", "-q",
         action="store_true",
@@ -334,11 +513,22 @@ Examples:
         "--runs-config",
         help="Path to JSON/YAML file describing multiple runs to execute in parallel"
     )
+    parser.add_argument(
+        "--global-concurrency",
+        type=int,
+        default=None,
+        help="With --runs-config: cap in-flight task calls across all runs, "
+             "shared fairly by model and run (config.fair_share_weight)"
+    )
     
     args = parser.parse_args(argv)
     is_multi_run = bool(args.runs_config)
     if resume_mode and not args.resume_from:
         parser.error("--run-file is required for resume")
+    if coordinator_mode and args.runs_config:
+        parser.error("qym coordinator runs a single run; --runs-config is not supported")
+    if is_multi_run and args.replay:
+        parser.error("--replay replaces --task-file for a single run; set the task per run in --runs-config")
     if is_multi_run and args.model:
         console.print("[yellow]⚠️  Ignoring --model because --runs-config is provided.[/yellow]")
 
@@ -361,6 +551,25 @@ Examples:
         if not run_specs:
             console.print("[red]Runs config is empty[/red]")
             sys.exit(1)
+        if args.cache:
+            for spec in run_specs:
+                spec.config.task_cache = args.cache
+        if args.workers:
+            for spec in run_specs:
+                spec.config.workers = args.workers
+        for spec in run_specs:
+            if args.circuit_breaker:
+                # Runs of the same model share one breaker in MultiModelRunner.
+                spec.config.circuit_breaker = True
+            if args.task_processes:
+                spec.config.task_processes = args.task_processes
+            if args.load_rate:
+                spec.config.load_rate = args.load_rate
+            if args.load_pattern:
+                spec.config.load_pattern = args.load_pattern
+            if args.record_calls:
+                # One file for all runs; entries are keyed by model and input.
+                spec.config.record_task_calls = args.record_calls
 
         show_tui = not args.quiet and not args.no_progress and not args.no_ui
         runner = MultiModelRunner(run_specs, console=console)
@@ -370,6 +579,7 @@ Examples:
                     show_tui=show_tui,
                     auto_save=True,
                     save_format="csv",
+                    global_concurrency=args.global_concurrency,
                 )
             )
         except RuntimeError as exc:
@@ -405,8 +615,8 @@ Examples:
         missing = {}
         if not is_multi_run:
             missing = {
-                "--task-file": args.task_file,
-                "--task-function": args.task_function,
+                "--task-file": args.task_file or args.replay,
+                "--task-function": args.task_function or args.replay,
                 "--dataset/--dataset-csv": (args.dataset or args.dataset_csv),
                 "--metrics": args.metrics,
             }
@@ -418,8 +628,12 @@ Examples:
             parser.error("Provide exactly one of --dataset (Langfuse) or --dataset-csv (CSV).")
 
         # Load the task function
-        console.print(f"Loading task function '{args.task_function}' from {args.task_file}")
-        task_function = load_function_from_file(args.task_file, args.task_function)
+        if args.replay:
+            console.print(f"Replaying recorded task calls from {args.replay}")
+            task_function = Replay(args.replay, timing=args.replay_timing, speed=args.replay_speed)
+        else:
+            console.print(f"Loading task function '{args.task_function}' from {args.task_file}")
+            task_function = load_function_from_file(args.task_file, args.task_function)
         
         # Parse metrics
         metrics = [m.strip() for m in args.metrics.split(",")]
@@ -432,6 +646,20 @@ Examples:
             except json.JSONDecodeError as e:
                 console.print(f"[red]Error parsing config JSON: {e}[/red]")
                 sys.exit(1)
+        if args.cache:
+            config["task_cache"] = args.cache
+        if args.workers:
+            config["workers"] = args.workers
+        if args.load_rate:
+            config["load_rate"] = args.load_rate
+        if args.load_pattern:
+            config["load_pattern"] = args.load_pattern
+        if args.record_calls:
+            config["record_task_calls"] = args.record_calls
+        if args.circuit_breaker:
+            config["circuit_breaker"] = True
+        if args.task_processes:
+            config["task_processes"] = args.task_processes
         if args.resume_from:
             config["resume_from"] = args.resume_from
             if "run_name" not in config:
@@ -478,10 +706,15 @@ Examples:
         )
         
         # Run evaluation
-        console.print("Starting evaluation...")
-        show_progress = not args.no_progress and not args.quiet
-        show_table = not args.no_ui
-        raw_results = evaluator.run(show_progress=show_progress, show_table=show_table)
+        if coordinator_mode:
+            if len(evaluator.models) > 1:
+                parser.error("qym coordinator runs a single model; pass one --model")
+            raw_results = _run_coordinator(evaluator, args.listen, args.lease_size, args.lease_ttl)
+        else:
+            console.print("Starting evaluation...")
+            show_progress = not args.no_progress and not args.quiet
+            show_table = not args.no_ui
+            raw_results = evaluator.run(show_progress=show_progress, show_table=show_table)
         run_results = raw_results if isinstance(raw_results, list) else [raw_results]
         
         # Show results
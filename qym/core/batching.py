@@ -0,0 +1,91 @@
+"""Micro-batching of per-item task calls for batch-capable backends."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """Collect concurrent ``submit`` calls into batches for one backend call.
+
+    A batch is sent when ``max_size`` values are waiting or ``max_wait``
+    seconds after its first value arrived, whichever comes first. Each caller
+    gets its own result back; an exception returned in a caller's slot is
+    raised for that caller only. If the batch call itself fails, every caller
+    in it sees the error (and goes through its own retry/error path).
+    """
+
+    def __init__(
+        self,
+        call_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        *,
+        max_size: int,
+        max_wait: float,
+    ) -> None:
+        self.call_batch = call_batch
+        self.max_size = max(1, int(max_size))
+        self.max_wait = max(0.0, float(max_wait))
+        self._pending: List[Tuple[Any, "asyncio.Future"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set["asyncio.Task"] = set()
+        self.batches = 0
+        self.items = 0
+        self.full_batches = 0
+
+    async def submit(self, value: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((value, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Callers that timed out or were cancelled while waiting are dropped.
+        batch = [(value, future) for value, future in self._pending if not future.done()]
+        self._pending = []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        if len(batch) >= self.max_size:
+            self.full_batches += 1
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, "asyncio.Future"]]) -> None:
+        try:
+            outputs = list(await self.call_batch([value for value, _ in batch]))
+            if len(outputs) != len(batch):
+                raise ValueError(
+                    f"Batch task returned {len(outputs)} outputs for {len(batch)} inputs"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), output in zip(batch, outputs):
+            if future.done():
+                continue
+            if isinstance(output, BaseException):
+                future.set_exception(output)
+            else:
+                future.set_result(output)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_size": self.max_size,
+            "batches": self.batches,
+            "items": self.items,
+            "full_batches": self.full_batches,
+            "avg_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "waiting": len(self._pending),
+        }
@@ -5,7 +5,7 @@ from __future__ import annotations
 import csv
 import json
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 
@@ -22,6 +22,7 @@ BASE_FIELDS = [
     "expected_output",
     "time",
     "task_started_at_ms",
+    "execution_meta",
 ]
 
 
@@ -36,6 +37,11 @@ def _is_error_row(row: Dict[str, Any], metrics: Sequence[str]) -> bool:
     return False
 
 
+def is_retryable_row(row: Dict[str, Any]) -> bool:
+    """Whether the row is an item that was skipped (e.g. by an open circuit breaker)."""
+    return bool(parse_execution_meta(row.get("execution_meta")).get("retryable"))
+
+
 def _parse_metric_score(value: Any) -> Optional[float]:
     if value is None:
         return None
@@ -69,6 +75,19 @@ def parse_metric_score(value: Any) -> Optional[float]:
     return _parse_metric_score(value)
 
 
+def parse_execution_meta(value: Any) -> Dict[str, Any]:
+    """Decode the ``execution_meta`` column (retries, backoff, ...); {} if absent."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    try:
+        parsed = json.loads(value)
+    except (TypeError, ValueError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
 def build_checkpoint_header(metrics: Sequence[str]) -> List[str]:
     header = list(BASE_FIELDS)
     for metric in metrics:
@@ -93,6 +112,7 @@ def serialize_checkpoint_row(
     task_started_at_ms: Optional[int],
     scores: Dict[str, Any],
     metric_meta: Optional[Dict[str, Dict[str, Any]]] = None,
+    execution_meta: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     row: Dict[str, Any] = {
         "dataset_name": dataset_name,
@@ -109,6 +129,7 @@ def serialize_checkpoint_row(
         "expected_output": expected_output,
         "time": time_seconds,
         "task_started_at_ms": task_started_at_ms if task_started_at_ms is not None else "",
+        "execution_meta": json.dumps(execution_meta, ensure_ascii=False) if execution_meta else "",
     }
 
     metric_meta = metric_meta or {}
@@ -127,6 +148,8 @@ class CheckpointState:
     metrics: List[str]
     completed_item_ids: Set[str]
     error_item_ids: Set[str]
+    # Items skipped without running; not completed, so a resume runs them
+    retryable_item_ids: Set[str] = field(default_factory=set)
 
 
 class CheckpointWriter:
@@ -148,10 +171,18 @@ class CheckpointWriter:
     def open(self) -> None:
         os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
         file_exists = os.path.exists(self.path)
-        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        is_empty = not file_exists or os.path.getsize(self.path) == 0
         header = build_checkpoint_header(self.metrics)
-        self._writer = csv.DictWriter(self._file, fieldnames=header)
-        if not file_exists or os.path.getsize(self.path) == 0:
+        if not is_empty:
+            # Appending on resume: keep the columns of the existing file so rows
+            # stay aligned with checkpoints written by older versions.
+            with open(self.path, "r", newline="", encoding="utf-8") as existing:
+                existing_header = next(csv.reader(existing), None)
+            if existing_header:
+                header = existing_header
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=header, extrasaction="ignore")
+        if is_empty:
             self._writer.writeheader()
             self._flush()
 
@@ -205,6 +236,7 @@ def load_checkpoint_state(path: str) -> Optional[CheckpointState]:
         )
         completed: Set[str] = set()
         error_ids: Set[str] = set()
+        retryable: Set[str] = set()
         dataset_name: Optional[str] = None
         run_name: Optional[str] = None
         for row in reader:
@@ -217,6 +249,9 @@ def load_checkpoint_state(path: str) -> Optional[CheckpointState]:
             item_id = str(row.get("item_id", "") or "")
             if not item_id:
                 continue
+            if is_retryable_row(row):
+                retryable.add(item_id)
+                continue
             completed.add(item_id)
             if _is_error_row(row, metrics):
                 error_ids.add(item_id)
@@ -227,9 +262,35 @@ def load_checkpoint_state(path: str) -> Optional[CheckpointState]:
             metrics=metrics,
             completed_item_ids=completed,
             error_item_ids=error_ids,
+            retryable_item_ids=retryable - completed,
         )
 
 
+def drop_retryable_rows(path: str) -> int:
+    """Rewrite the checkpoint without its retryable rows; returns how many were dropped.
+
+    Called before a resume appends to the file, so items that are run again
+    do not end up with two rows.
+    """
+    if not os.path.exists(path):
+        return 0
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = [row for row in reader if row]
+    kept = [row for row in rows if not is_retryable_row(row)]
+    dropped = len(rows) - len(kept)
+    if not dropped or not fieldnames:
+        return 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(kept)
+    os.replace(tmp_path, path)
+    return dropped
+
+
 def iter_checkpoint_rows(path: str) -> Iterable[Dict[str, Any]]:
     if not os.path.exists(path):
         return []
@@ -258,6 +319,8 @@ def parse_checkpoint_row(
     except (ValueError, TypeError):
         result["task_started_at_ms"] = None
 
+    result["execution_meta"] = parse_execution_meta(row.get("execution_meta"))
+
     scores: Dict[str, Any] = {}
     metric_meta: Dict[str, Dict[str, Any]] = {}
     for metric in metrics:
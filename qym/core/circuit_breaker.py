@@ -0,0 +1,175 @@
+"""Per-model circuit breaker that stops sending work to a failing endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+from ..utils.errors import CircuitOpenError, classify_error
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    """Whether a task error says the endpoint is unhealthy (not a bad input or bug)."""
+    return classify_error(exc) is not None or isinstance(exc, OSError)
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one model endpoint.
+
+    While closed every call goes through. The breaker opens after
+    ``failure_threshold`` consecutive endpoint failures, or when the failure
+    rate over the last ``window`` calls reaches ``error_rate``. While open,
+    callers wait (dispatch pauses) for ``open_seconds``; then up to
+    ``half_open_probes`` calls are let through as probes. Enough successful
+    probes close the breaker and the waiting callers resume; a failed probe
+    reopens it. After ``probe_attempts`` failed probes in a row the endpoint
+    is treated as down: waiting and new callers get :class:`CircuitOpenError`
+    immediately (probes still go out every ``open_seconds``), so the rest of
+    the run is skipped instead of timing out item by item.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        *,
+        failure_threshold: int = 5,
+        error_rate: float = 0.5,
+        window: int = 20,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 1,
+        probe_attempts: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.key = key
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.error_rate = float(error_rate)
+        self.window = max(1, int(window))
+        self.open_seconds = float(open_seconds)
+        self.half_open_probes = max(1, int(half_open_probes))
+        self.probe_attempts = max(1, int(probe_attempts))
+        self.clock = clock
+        self.state = CLOSED
+        self.opens = 0
+        self.skipped = 0
+        self.failed_probes = 0
+        self._results: Deque[bool] = deque(maxlen=self.window)
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._changed = asyncio.Event()
+
+    @property
+    def given_up(self) -> bool:
+        return self.state != CLOSED and self.failed_probes >= self.probe_attempts
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opens += 1
+        self._opened_at = self.clock()
+        self._probe_successes = 0
+        self._notify()
+
+    def _close(self) -> None:
+        self.state = CLOSED
+        self.failed_probes = 0
+        self._consecutive_failures = 0
+        self._results.clear()
+        self._notify()
+
+    def _should_open(self) -> bool:
+        if self._consecutive_failures >= self.failure_threshold:
+            return True
+        if len(self._results) < self.window:
+            return False
+        failures = sum(1 for ok in self._results if not ok)
+        return failures / len(self._results) >= self.error_rate
+
+    async def acquire(self) -> str:
+        """Wait until a call may go out; returns ``"call"`` or ``"probe"``.
+
+        Raises :class:`CircuitOpenError` once the endpoint has been given up on.
+        """
+        while True:
+            now = self.clock()
+            if self.state == OPEN and now >= self._opened_at + self.open_seconds:
+                self.state = HALF_OPEN
+                self._notify()
+            if self.state == CLOSED:
+                return "call"
+            if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return "probe"
+            if self.given_up:
+                self.skipped += 1
+                raise CircuitOpenError(self.key, self.failed_probes)
+            changed = self._changed
+            timeout = max(0.0, self._opened_at + self.open_seconds - now) if self.state == OPEN else None
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def record(self, admission: str, *, failed: bool) -> None:
+        """Report the outcome of a call admitted by :meth:`acquire`."""
+        if admission == "probe":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if self.state != HALF_OPEN:
+                return
+            if failed:
+                self.failed_probes += 1
+                self._open()
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._close()
+            return
+        self._results.append(not failed)
+        self._consecutive_failures = self._consecutive_failures + 1 if failed else 0
+        if self.state == CLOSED and failed and self._should_open():
+            self._open()
+
+    def cancel(self, admission: str) -> None:
+        """Give back an admission whose call never finished (e.g. a lost hedge)."""
+        if admission == "probe":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._notify()
+
+    def snapshot(self) -> Dict[str, Any]:
+        results = self._results
+        return {
+            "key": self.key,
+            "state": self.state,
+            "opens": self.opens,
+            "skipped": self.skipped,
+            "failed_probes": self.failed_probes,
+            "consecutive_failures": self._consecutive_failures,
+            "error_rate": round(sum(1 for ok in results if not ok) / len(results), 4) if results else 0.0,
+        }
+
+
+class CircuitBreakerRegistry:
+    """One breaker per model, shared by every run that holds the registry."""
+
+    def __init__(self) -> None:
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, key: Optional[str], **settings: Any) -> CircuitBreaker:
+        key = key or "default"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = self._breakers[key] = CircuitBreaker(key, **settings)
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {key: breaker.snapshot() for key, breaker in self._breakers.items()}
@@ -0,0 +1,68 @@
+"""Single-flight coalescing of task calls for items with identical inputs."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from .task_cache import canonical_json
+
+
+def input_key(task_input: Any) -> str:
+    """Hash of the canonical JSON form of an item input."""
+    return hashlib.sha256(canonical_json(task_input).encode("utf-8")).hexdigest()
+
+
+def _retrieve_exception(future: "asyncio.Future") -> None:
+    # Nobody may be waiting on a failed leader; avoid "exception never retrieved".
+    if not future.cancelled():
+        future.exception()
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers with the same key.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight wait for its result or error instead of calling
+    again. Once the call finishes the key is released, so later duplicates
+    start a new call (or hit the task cache, which sits underneath).
+    """
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, "asyncio.Future"] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, make_call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return ``(output, shared)``; ``shared`` is True for callers that waited on a leader."""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Shielded so a follower timing out does not cancel the leader's result.
+            return await asyncio.shield(future), True
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve_exception)
+        self._inflight[key] = future
+        self.calls += 1
+        try:
+            output = await make_call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(output)
+            return output, False
+        finally:
+            self._inflight.pop(key, None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._inflight),
+        }
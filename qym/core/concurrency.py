@@ -0,0 +1,131 @@
+"""Adaptive (AIMD) concurrency control for task execution."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from ..utils.errors import classify_error
+
+
+class AdaptiveConcurrencyLimiter:
+    """Gate task calls behind a limit that follows the provider's capacity.
+
+    The limit grows while latency stays flat and is cut multiplicatively when a
+    call is throttled, times out or hits a provider 5xx:
+
+    * slow start: until the first congestion signal, every success adds one slot
+      (the limit roughly doubles per round trip);
+    * additive increase: afterwards each success adds ``1 / limit`` (one slot per
+      round trip), but only while the smoothed latency stays within
+      ``latency_tolerance`` of the best latency seen;
+    * multiplicative decrease: a congestion signal multiplies the limit by
+      ``decrease_factor``. Calls that started before the last cut cannot cut it
+      again, so one burst of 429s counts as a single signal.
+
+    Workers call ``acquire()`` before the task and ``release()`` afterwards; the
+    number of workers is the ceiling (``max_limit``).
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        *,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 1.5,
+        smoothing: float = 0.2,
+    ) -> None:
+        self.max_limit = max(1, int(max_limit))
+        self.min_limit = max(1, min(int(min_limit), self.max_limit))
+        start = initial_limit if initial_limit is not None else self.min_limit
+        self._limit = float(max(self.min_limit, min(int(start), self.max_limit)))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self.latency_baseline: Optional[float] = None
+        self.decreases = 0
+        self.last_signal: Optional[str] = None
+        self._slow_start = True
+        self._last_cut_at = float("-inf")
+        self._cond: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built outside the event loop.
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    async def acquire(self) -> float:
+        """Wait for a free slot; returns a ticket to pass to ``release``."""
+        cond = self._condition()
+        async with cond:
+            await cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(
+        self,
+        ticket: float,
+        *,
+        latency: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Return a slot and feed the outcome of the call into the controller."""
+        signal = classify_error(error) if error is not None else None
+        if signal is not None:
+            self._on_congestion(ticket, signal)
+        elif error is None and latency is not None:
+            self._on_success(latency)
+
+        cond = self._condition()
+        async with cond:
+            self.in_flight = max(0, self.in_flight - 1)
+            cond.notify_all()
+
+    def _on_success(self, latency: float) -> None:
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma += self.smoothing * (latency - self.latency_ewma)
+        if self.latency_baseline is None or self.latency_ewma < self.latency_baseline:
+            self.latency_baseline = self.latency_ewma
+
+        if self.latency_ewma > self.latency_baseline * self.latency_tolerance:
+            # Queueing at the provider: hold the limit and stop probing fast.
+            self._slow_start = False
+            return
+        if self._slow_start:
+            self._limit = min(float(self.max_limit), self._limit + 1.0)
+        else:
+            self._limit = min(float(self.max_limit), self._limit + 1.0 / max(self._limit, 1.0))
+
+    def _on_congestion(self, ticket: float, signal: str) -> None:
+        self.last_signal = signal
+        if ticket < self._last_cut_at:
+            return
+        self._slow_start = False
+        self._limit = max(float(self.min_limit), self._limit * self.decrease_factor)
+        self._last_cut_at = time.monotonic()
+        self.decreases += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "min": self.min_limit,
+            "max": self.max_limit,
+            "in_flight": self.in_flight,
+            "latency_ewma_s": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "latency_baseline_s": round(self.latency_baseline, 3) if self.latency_baseline is not None else None,
+            "decreases": self.decreases,
+            "last_signal": self.last_signal,
+        }
@@ -8,7 +8,141 @@ class EvaluatorConfig(BaseModel):
 
     run_name: Optional[str] = None
     max_concurrency: int = Field(default=10, ge=1)
+    # Deadline per item, covering every attempt, backoff and hedge; with
+    # retries, attempt_timeout (default: timeout) caps each single attempt
     timeout: float = Field(default=30.0, gt=0)
+    attempt_timeout: Optional[float] = Field(default=None, gt=0)
+    # Adaptive (AIMD) mode: the live task limit moves between min_concurrency
+    # and max_concurrency based on latency and 429/5xx/timeout errors
+    adaptive_concurrency: bool = False
+    min_concurrency: int = Field(default=1, ge=1)
+    # Optional deadline (seconds) for all metrics of one item; None = no limit
+    metric_timeout: Optional[float] = Field(default=None, gt=0)
+    # Max in-flight calls per metric name across items (e.g. {"answer_relevancy": 4})
+    metric_concurrency_limits: Dict[str, int] = Field(default_factory=dict)
+    # Separate metric worker pool; when set, task workers hand outputs to a
+    # bounded queue (metric_queue_size, default 2x metric_concurrency)
+    metric_concurrency: Optional[int] = Field(default=None, ge=1)
+    metric_queue_size: Optional[int] = Field(default=None, ge=1)
+    # Threads for sync metrics (default: metric_concurrency or max_concurrency);
+    # sync tasks always get max_concurrency threads
+    metric_threads: Optional[int] = Field(default=None, ge=1)
+    # Process pool size for CPU-bound sync metrics (marked with
+    # qym.metrics.cpu_bound or detected from their CPU time); None = threads only
+    metric_processes: Optional[int] = Field(default=None, ge=1)
+    # Run a sync task function in this many worker subprocesses instead of
+    # threads: a call that outlives the item timeout is killed with its
+    # process, and a worker is replaced after task_process_max_items calls or
+    # once its RSS exceeds task_process_max_rss_mb. None = threads
+    task_processes: Optional[int] = Field(default=None, ge=1)
+    task_process_max_items: Optional[int] = Field(default=None, ge=1)
+    task_process_max_rss_mb: Optional[float] = Field(default=None, gt=0)
+    # Vectorized metrics (@batch_metric / register_metric(..., batch=True)) are
+    # called with up to metric_batch_size items scored at the same time, after
+    # at most metric_batch_wait seconds
+    metric_batch_size: int = Field(default=32, ge=1)
+    metric_batch_wait: float = Field(default=0.05, ge=0)
+    # Persistent score cache (<output_dir>/metric_cache.sqlite) for the metrics
+    # named here or marked with @cache_metric; only for deterministic metrics.
+    # LRU beyond metric_cache_max_entries, entries expire after metric_cache_ttl_days
+    metric_cache: List[str] = Field(default_factory=list)
+    metric_cache_max_entries: Optional[int] = Field(default=100000, ge=1)
+    metric_cache_ttl_days: Optional[float] = Field(default=None, gt=0)
+    # Retries for transient task / async-metric failures (429, 5xx, timeouts):
+    # exponential backoff with full jitter, honoring Retry-After when exposed.
+    # retry_budget caps retries run-wide at that fraction of calls (plus a small floor).
+    max_retries: int = Field(default=0, ge=0)
+    retry_base_delay: float = Field(default=1.0, gt=0)
+    retry_max_delay: float = Field(default=60.0, gt=0)
+    retry_budget: float = Field(default=0.2, ge=0)
+    # Hedged requests: once a task runs past this latency percentile of the run
+    # (e.g. 0.95, after hedge_min_samples successes) a duplicate call races it;
+    # hedges are capped at hedge_max_extra extra calls per task call
+    hedge_percentile: Optional[float] = Field(default=None, gt=0, lt=1)
+    hedge_max_extra: float = Field(default=0.05, ge=0)
+    hedge_min_samples: int = Field(default=20, ge=1)
+    # Shared rate limits keyed by full model, provider prefix or bare model name,
+    # e.g. {"openai": {"rpm": 500, "tpm": 200000}}; buckets are process-wide so
+    # every run hitting the same key draws from the same quota
+    rate_limits: Dict[str, Dict[str, float]] = Field(default_factory=dict)
+    # Micro-batching for batch-capable tasks (@batch_task functions, LangChain
+    # runnables with abatch/batch): up to task_batch_size concurrent items per
+    # backend call, sent after at most task_batch_wait seconds. Batch functions
+    # default to max_concurrency; LangChain batching needs task_batch_size.
+    task_batch_size: Optional[int] = Field(default=None, ge=1)
+    task_batch_wait: float = Field(default=0.05, ge=0)
+    # Persistent task-output cache (<output_dir>/task_cache.sqlite) keyed by task
+    # identity + full model name + canonical item input: "on" serves and stores
+    # outputs, "refresh" recomputes and overwrites them, "off" bypasses the cache.
+    # Least recently used entries go past task_cache_max_mb; older ones past max age
+    task_cache: str = "off"
+    task_cache_max_mb: Optional[float] = Field(default=1024.0, gt=0)
+    task_cache_max_age_days: Optional[float] = Field(default=None, gt=0)
+    # Explicit cache identity of the task, replacing the derived one. Needed for
+    # tasks configured at construction (chain/client instances, bound methods):
+    # without it the task cache is disabled for them. Change it when the task does.
+    task_cache_key: Optional[str] = None
+    # Items whose inputs are identical (canonical JSON) share one in-flight task
+    # call; metrics, traces and checkpoint rows stay per item
+    coalesce_inputs: bool = False
+    # Append every task call (input, model, output or error, latency) to this
+    # JSONL file, for offline replay with qym.adapters.Replay
+    record_task_calls: Optional[str] = None
+    # Item order: "dataset", or "longest_first" to start the items predicted to
+    # be slowest first (median latency from past runs of the same task/dataset
+    # in output_dir, input size for items without history); shortens the tail
+    schedule: str = "dataset"
+    # Sequential early stopping: items are drawn in random order (early_stop_seed)
+    # and the run stops once each monitored metric (early_stop_metrics, default
+    # all numeric ones) has a confidence interval within ±early_stop_precision,
+    # or entirely above/below early_stop_threshold; never before
+    # early_stop_min_items scored items. Needs the full item list (no streaming)
+    early_stop: bool = False
+    early_stop_metrics: List[str] = Field(default_factory=list)
+    early_stop_precision: Optional[float] = Field(default=0.01, gt=0)
+    early_stop_threshold: Optional[float] = None
+    early_stop_confidence: float = Field(default=0.95, gt=0, lt=1)
+    early_stop_min_items: int = Field(default=30, ge=2)
+    early_stop_seed: Optional[int] = None
+    # Open-loop load test: items are sent at load_rate per second (pattern
+    # "constant", "poisson" or "ramp" from load_ramp_from over
+    # load_ramp_seconds) whether or not earlier ones finished; max_concurrency
+    # caps in-flight items. Items sent in the first load_warmup_seconds are
+    # excluded from the summary; a per-second timeline is saved with the run
+    load_rate: Optional[float] = Field(default=None, gt=0)
+    load_pattern: str = "constant"
+    load_ramp_from: float = Field(default=0.0, ge=0)
+    load_ramp_seconds: float = Field(default=60.0, ge=0)
+    load_warmup_seconds: float = Field(default=0.0, ge=0)
+    load_seed: Optional[int] = None
+    # Streaming ingestion for very large datasets: items are read from the
+    # dataset iterator into a bounded queue (stream_queue_size, default 2x
+    # max_concurrency) and the live UI keeps only the last stream_ui_rows
+    # finished items
+    stream_dataset: bool = False
+    stream_queue_size: Optional[int] = Field(default=None, ge=1)
+    stream_ui_rows: int = Field(default=1000, ge=0)
+    # Per-model circuit breaker (shared by the runs of a MultiModelRunner):
+    # opens after circuit_failure_threshold consecutive endpoint failures or a
+    # circuit_error_rate failure rate over the last circuit_window calls, pauses
+    # dispatch for circuit_open_seconds, then sends half-open probes. After
+    # circuit_probe_attempts failed probes the remaining items are skipped and
+    # marked retryable in the checkpoint
+    circuit_breaker: bool = False
+    circuit_failure_threshold: int = Field(default=5, ge=1)
+    circuit_error_rate: float = Field(default=0.5, gt=0, le=1)
+    circuit_window: int = Field(default=20, ge=1)
+    circuit_open_seconds: float = Field(default=30.0, ge=0)
+    circuit_half_open_probes: int = Field(default=1, ge=1)
+    circuit_probe_attempts: int = Field(default=3, ge=1)
+    # Weight of this run in a global fair-share budget (MultiModelRunner /
+    # run_parallel with global_concurrency); ignored otherwise
+    fair_share_weight: float = Field(default=1.0, gt=0)
+    # Split the items across this many worker processes (item index % workers),
+    # each with its own event loop and checkpoint (<run>.shardKofN.csv); the
+    # parent merges progress, results and the run file. Needs the full item
+    # list in dataset order, and a task/metrics importable by the workers
+    workers: int = Field(default=1, ge=1)
     run_metadata: Dict[str, Any] = Field(default_factory=dict)
     model: Optional[str] = None
     models: Optional[List[str]] = None
@@ -23,6 +157,9 @@ class EvaluatorConfig(BaseModel):
     ui_port: int = 0
     # UI settings
     ui_port: int = 0
+    # Serve the live web UI; off for shard processes and distributed worker
+    # leases, which report to a parent that serves its own
+    web_ui: bool = True
     cli_invocation: Optional[str] = None
     
     # Output settings
@@ -46,6 +183,69 @@ class EvaluatorConfig(BaseModel):
             return [str(m).strip() for m in v if m]
         return v
 
+    @field_validator("metric_cache", "early_stop_metrics", mode="before")
+    @classmethod
+    def normalize_metric_names(cls, v: Any) -> List[str]:
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return [m.strip() for m in v.split(",") if m.strip()]
+        return v
+
+    @field_validator("task_cache", mode="before")
+    @classmethod
+    def validate_task_cache(cls, v: Any) -> str:
+        if v is None or v is False:
+            return "off"
+        if v is True:
+            return "on"
+        mode = str(v).strip().lower()
+        if mode not in {"on", "off", "refresh"}:
+            raise ValueError("task_cache must be 'on', 'off' or 'refresh'")
+        return mode
+
+    @field_validator("schedule", mode="before")
+    @classmethod
+    def validate_schedule(cls, v: Any) -> str:
+        mode = str(v or "dataset").strip().lower().replace("-", "_")
+        if mode not in {"dataset", "longest_first"}:
+            raise ValueError("schedule must be 'dataset' or 'longest_first'")
+        return mode
+
+    @field_validator("load_pattern", mode="before")
+    @classmethod
+    def validate_load_pattern(cls, v: Any) -> str:
+        pattern = str(v or "constant").strip().lower()
+        if pattern not in {"constant", "poisson", "ramp"}:
+            raise ValueError("load_pattern must be 'constant', 'poisson' or 'ramp'")
+        return pattern
+
+    @field_validator("rate_limits", mode="before")
+    @classmethod
+    def validate_rate_limits(cls, v: Any) -> Dict[str, Dict[str, float]]:
+        if v is None:
+            return {}
+        if not isinstance(v, dict):
+            raise ValueError("rate_limits must map a model or provider to {'rpm': ..., 'tpm': ...}")
+        normalized: Dict[str, Dict[str, float]] = {}
+        for key, spec in v.items():
+            if not isinstance(spec, dict):
+                raise ValueError(f"rate_limits[{key!r}] must be a mapping with 'rpm' and/or 'tpm'")
+            unknown = set(spec) - {"rpm", "tpm"}
+            if unknown:
+                raise ValueError(f"rate_limits[{key!r}] has unknown keys: {sorted(unknown)}")
+            entry: Dict[str, float] = {}
+            for name in ("rpm", "tpm"):
+                value = spec.get(name)
+                if value is None:
+                    continue
+                value = float(value)
+                if value <= 0:
+                    raise ValueError(f"rate_limits[{key!r}].{name} must be > 0")
+                entry[name] = value
+            normalized[str(key)] = entry
+        return normalized
+
 class RunSpec(BaseModel):
     """Specification for a multi-model run."""
     model_config = ConfigDict(arbitrary_types_allowed=True)
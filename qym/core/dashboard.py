@@ -54,6 +54,7 @@ class RunVisualState:
     status: str = "pending"
     last_update: Optional[float] = None
     last_error: Optional[str] = None
+    run_stats: Dict[str, Any] = field(default_factory=dict)
 
     def success_rate(self) -> float:
         if not self.total_items:
@@ -200,15 +201,17 @@ class RunDashboard:
         state.touch()
         self.refresh()
 
-    def record_item_complete(self, run_id: str, elapsed: float) -> None:
+    def record_item_complete(self, run_id: str, elapsed: float, cached: bool = False) -> None:
         state = self.states.get(run_id)
         if not state:
             return
         state.completed += 1
         state.in_progress = max(0, state.in_progress - 1)
-        state.latency_total += elapsed
-        state.latency_count += 1
-        state.latency_samples.append(elapsed)
+        # Cache hits skip the model call, so they would skew latency down.
+        if not cached:
+            state.latency_total += elapsed
+            state.latency_count += 1
+            state.latency_samples.append(elapsed)
         if state.completed >= state.total_items and state.failed == 0:
             state.status = "completed"
             state.end_time = time.time()
@@ -231,6 +234,14 @@ class RunDashboard:
         state.touch()
         self.refresh()
 
+    def record_run_stats(self, run_id: str, stats: Dict[str, Any]) -> None:
+        state = self.states.get(run_id)
+        if not state:
+            return
+        state.run_stats = dict(stats or {})
+        state.touch()
+        self.refresh()
+
     def mark_run_complete(self, run_id: str) -> None:
         state = self.states.get(run_id)
         if not state:
@@ -439,8 +450,11 @@ class RunDashboard:
 
         chips_line = self._render_progress_chips(state)
         stats_line = self._render_progress_stats(state)
+        runtime_line = self._render_run_stats(state)
 
-        return Group(bar_row, chips_line, stats_line)
+        if runtime_line is None:
+            return Group(bar_row, chips_line, stats_line)
+        return Group(bar_row, chips_line, stats_line, runtime_line)
 
     def _render_progress_chips(self, state: RunVisualState) -> Text:
         pending_val = "—"
@@ -493,6 +507,101 @@ class RunDashboard:
             combined.append_text(part)
         return combined
 
+    def _render_run_stats(self, state: RunVisualState) -> Optional[Text]:
+        """Compact line with live scheduling stats (limits, queues, backpressure)."""
+        stats = state.run_stats or {}
+        parts: List[str] = []
+        concurrency = stats.get("concurrency")
+        if concurrency:
+            limit_text = f"limit {concurrency.get('limit')}/{concurrency.get('max')}"
+            if concurrency.get("last_signal"):
+                limit_text += f" (last cut: {concurrency['last_signal']})"
+            parts.append(limit_text)
+        retries = stats.get("retries")
+        if retries and retries.get("retries"):
+            retry_text = f"retries {retries['retries']}"
+            if retries.get("exhausted"):
+                retry_text += f" (budget exhausted ×{retries['exhausted']})"
+            parts.append(retry_text)
+        hedging = stats.get("hedging")
+        if hedging and hedging.get("hedges"):
+            parts.append(f"hedges {hedging['hedges']} (won {hedging.get('hedge_wins', 0)})")
+        task_cache = stats.get("task_cache")
+        if task_cache and (task_cache.get("hits") or task_cache.get("misses")):
+            parts.append(f"cache hits {task_cache.get('hits', 0)}/{task_cache['hits'] + task_cache['misses']}")
+        metric_cache = stats.get("metric_cache") or {}
+        metric_hits = sum(c.get("hits", 0) for c in metric_cache.values())
+        if metric_cache:
+            metric_calls = metric_hits + sum(c.get("misses", 0) for c in metric_cache.values())
+            parts.append(f"metric cache hits {metric_hits}/{metric_calls}")
+        shards = stats.get("shards")
+        if shards:
+            shard_text = f"shards running {shards.get('running', 0)}/{shards.get('workers')}"
+            if shards.get("failed"):
+                shard_text += f" ({shards['failed']} failed)"
+            parts.append(shard_text)
+        fair_share = stats.get("fair_share")
+        if fair_share:
+            parts.append(f"global slots {fair_share.get('in_flight', 0)}/{fair_share.get('capacity')}")
+        breaker = stats.get("circuit_breaker")
+        if breaker and (breaker.get("state") != "closed" or breaker.get("skipped")):
+            breaker_text = f"circuit {breaker.get('state', 'closed').replace('_', '-')}"
+            if breaker.get("skipped"):
+                breaker_text += f" ({breaker['skipped']} skipped)"
+            parts.append(breaker_text)
+        early_stop = stats.get("early_stop")
+        if early_stop:
+            if early_stop.get("stopped_at"):
+                parts.append(f"early-stopped at {early_stop['stopped_at']}")
+            else:
+                widths = [m["ci_half_width"] for m in early_stop.get("metrics", {}).values() if m.get("ci_half_width") is not None]
+                if widths:
+                    parts.append(f"CI ±{max(widths):.3f} (n={early_stop.get('items', 0)})")
+        load = stats.get("load")
+        if load:
+            load_text = f"rate {load.get('achieved_rate', 0):.1f}/{load.get('target_rate', 0):.1f}/s"
+            load_text += f" in flight {load.get('in_flight', 0)}"
+            if load.get("warming_up"):
+                load_text += " (warm-up)"
+            parts.append(load_text)
+        recording = stats.get("recording")
+        if recording:
+            parts.append(f"recorded {recording.get('records', 0)} calls")
+        coalescing = stats.get("coalescing")
+        if coalescing and coalescing.get("coalesced"):
+            parts.append(f"coalesced {coalescing['coalesced']} calls")
+        batching = stats.get("batching")
+        if batching and batching.get("batches"):
+            parts.append(f"batches {batching['batches']} (avg {batching.get('avg_size', 0)}/{batching.get('max_size')})")
+        for name, batcher in (stats.get("metric_batching") or {}).items():
+            if batcher.get("batches"):
+                parts.append(f"{name} batches {batcher['batches']} (avg {batcher.get('avg_size', 0)})")
+        for key, bucket in (stats.get("rate_limits") or {}).items():
+            waited = float(bucket.get("waited_seconds") or 0.0)
+            parts.append(f"rate {key} waited {waited:.1f}s")
+        for name, pool in (stats.get("executors") or {}).items():
+            if pool.get("completed") or pool.get("active"):
+                label = name.replace("_", " ")
+                pool_text = f"{label} {pool.get('active', 0)}/{pool.get('size', 0)}"
+                if pool.get("killed"):
+                    pool_text += f" ({pool['killed']} killed)"
+                parts.append(pool_text)
+        stages = stats.get("stages") or {}
+        for name in ("task", "metric"):
+            stage = stages.get(name)
+            if not stage:
+                continue
+            depth = stage.get("queue_depth", 0)
+            capacity = stage.get("queue_capacity")
+            queue_text = f"{depth}/{capacity}" if capacity else f"{depth}"
+            parts.append(f"{name} {stage.get('busy', 0)}/{stage.get('workers', 0)} q{queue_text}")
+            blocked = float(stage.get("blocked_seconds") or 0.0)
+            if blocked >= 0.1:
+                parts.append(f"{name} backpressure {blocked:.1f}s")
+        if not parts:
+            return None
+        return Text(" • ".join(parts), style="dim")
+
     def _render_latency(self, state: RunVisualState) -> RenderableType:
         if not state.latency_samples:
             return Text("-", style="dim")
@@ -649,17 +758,20 @@ class _DashboardObserver(EvaluationObserver):
             if start:
                 elapsed = time.time() - start
         
+        result = kwargs.get("result") or {}
         # Fallback if time provided in result (unlikely based on investigation)
         if elapsed == 0.0:
-            result = kwargs.get("result") or {}
             elapsed = float(result.get("time") or 0.0)
             
-        self.dashboard.record_item_complete(self.run_id, elapsed)
+        self.dashboard.record_item_complete(self.run_id, elapsed, cached=bool(result.get("cached")))
 
     def on_item_error(self, **kwargs: Any) -> None:
         error = kwargs.get("error", "error")
         self.dashboard.record_item_error(self.run_id, str(error))
 
+    def on_run_stats(self, **kwargs: Any) -> None:
+        self.dashboard.record_run_stats(self.run_id, kwargs.get("stats") or {})
+
     def on_run_complete(self, **kwargs: Any) -> None:
         self.dashboard.mark_run_complete(self.run_id)
 
@@ -2,6 +2,8 @@
 
 - `LangfuseDataset`: loads datasets from Langfuse
 - `CsvDataset`: loads datasets from a local CSV file
+
+Both also expose `iter_items()` for streaming runs (`stream_dataset=True`).
 """
 
 from __future__ import annotations
@@ -10,7 +12,7 @@ import csv
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 from langfuse import Langfuse
 
@@ -68,6 +70,12 @@ class LangfuseDataset:
         if self._items is None:
             self._items = list(self._dataset.items)
         return self._items
+
+    def iter_items(self) -> Iterator[Any]:
+        """Iterate dataset items without building a second list."""
+        if self._items is not None:
+            return iter(self._items)
+        return iter(self._dataset.items)
     
     def validate_item(self, item: Any, index: int) -> List[str]:
         """
@@ -192,6 +200,9 @@ class CsvDataset:
             ) from exc
 
     def _load_items(self) -> List[CsvDatasetItem]:
+        return list(self._iter_rows())
+
+    def _iter_rows(self) -> Iterator[CsvDatasetItem]:
         file_path = str(self.path)
         try:
             with self.path.open("r", encoding="utf-8", newline="") as f:
@@ -216,7 +227,6 @@ class CsvDataset:
                 for c in self.metadata_cols:
                     _require_col(c)
 
-                items: List[CsvDatasetItem] = []
                 # DictReader yields data rows; CSV line numbers are 1-based with header at row=1.
                 # So the first data row is row=2.
                 for i, row in enumerate(reader):
@@ -254,16 +264,12 @@ class CsvDataset:
                     for c in self.metadata_cols:
                         md[c] = self._parse_cell(row.get(c, ""), file_path=file_path, row=csv_row_num, column=c)
 
-                    items.append(
-                        CsvDatasetItem(
-                            id=item_id,
-                            input=parsed_input,
-                            expected_output=parsed_expected,
-                            metadata=md,
-                        )
+                    yield CsvDatasetItem(
+                        id=item_id,
+                        input=parsed_input,
+                        expected_output=parsed_expected,
+                        metadata=md,
                     )
-
-                return items
         except CsvDatasetSchemaError:
             raise
         except Exception as exc:
@@ -274,6 +280,12 @@ class CsvDataset:
             self._items = self._load_items()
         return self._items
 
+    def iter_items(self) -> Iterator[CsvDatasetItem]:
+        """Stream items row by row; schema errors surface when the bad row is reached."""
+        if self._items is not None:
+            return iter(self._items)
+        return self._iter_rows()
+
     @property
     def size(self) -> int:
         return len(self.get_items())
@@ -284,3 +296,10 @@ class CsvDataset:
     def __repr__(self) -> str:
         return f"CsvDataset(name='{self.name}', path='{self.path}', items={self.size})"
 
+
+def iter_dataset_items(dataset: Any) -> Iterator[Any]:
+    """Iterate any dataset: `iter_items()` when it streams, else `get_items()`."""
+    iter_items = getattr(dataset, "iter_items", None)
+    if callable(iter_items):
+        return iter(iter_items())
+    return iter(dataset.get_items())
@@ -0,0 +1,483 @@
+"""Distributed runs: a coordinator leasing item ranges to remote workers over HTTP.
+
+The coordinator owns the dataset and the run file; workers only need the
+task code. Protocol (JSON over HTTP, all served by the coordinator):
+
+- ``GET /job``: run name, dataset name, metrics, task reference and config.
+- ``POST /lease`` ``{"worker"}``: ``{"lease": {"id", "items", "ttl"}}``,
+  ``{"wait": seconds}`` while the remaining items are leased elsewhere, or
+  ``{"done": true}``.
+- ``POST /renew`` ``{"lease"}``: extend a lease; ``{"ok": false}`` once it expired.
+- ``POST /complete`` ``{"lease", "rows"}``: checkpoint rows of the leased items.
+- ``GET /status``: progress counters.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import json
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from .checkpoint import (
+    CheckpointWriter,
+    drop_retryable_rows,
+    is_retryable_row,
+    iter_checkpoint_rows,
+    load_checkpoint_state,
+    parse_checkpoint_row,
+)
+from .results import EvaluationResult
+from .sharding import ShardDataset, ShardItem, _resolve, run_item_id
+
+if TYPE_CHECKING:
+    from .evaluator import Evaluator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Lease:
+    id: str
+    worker: str
+    indexes: List[int]
+    expires_at: float
+
+
+class LeaseTable:
+    """Item ranges handed out under leases that expire unless renewed.
+
+    Ranges of an expired lease (a dead or stuck worker) go back to the front
+    of the queue, as do leased items a worker returned no result for. Items
+    are tracked individually, so a late result from an expired lease still
+    counts and the item is skipped when its range is leased again.
+    """
+
+    def __init__(
+        self,
+        indexes: Sequence[int],
+        *,
+        lease_size: int = 20,
+        lease_ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.lease_size = max(1, int(lease_size))
+        self.lease_ttl = float(lease_ttl)
+        self.clock = clock
+        self.total = len(indexes)
+        self.done: Set[int] = set()
+        self.leases: Dict[str, Lease] = {}
+        self.expired = 0
+        self._pending: Deque[List[int]] = deque(
+            list(indexes[i:i + self.lease_size]) for i in range(0, len(indexes), self.lease_size)
+        )
+        self._ids = itertools.count(1)
+
+    @property
+    def finished(self) -> bool:
+        return len(self.done) >= self.total
+
+    def acquire(self, worker: str) -> Optional[Lease]:
+        self.reap()
+        while self._pending:
+            indexes = [i for i in self._pending.popleft() if i not in self.done]
+            if indexes:
+                lease = Lease(f"{worker}-{next(self._ids)}", worker, indexes, self.clock() + self.lease_ttl)
+                self.leases[lease.id] = lease
+                return lease
+        return None
+
+    def renew(self, lease_id: str) -> bool:
+        lease = self.leases.get(lease_id)
+        if lease is None:
+            return False
+        lease.expires_at = self.clock() + self.lease_ttl
+        return True
+
+    def complete(self, lease_id: str, indexes: Sequence[int]) -> None:
+        """Record finished items; leased items left unfinished are queued again."""
+        self.done.update(indexes)
+        lease = self.leases.pop(lease_id, None)
+        if lease is not None:
+            missing = [i for i in lease.indexes if i not in self.done]
+            if missing:
+                self._pending.appendleft(missing)
+
+    def reap(self) -> List[Lease]:
+        now = self.clock()
+        expired = [lease for lease in self.leases.values() if lease.expires_at <= now]
+        for lease in expired:
+            del self.leases[lease.id]
+            self._pending.appendleft(lease.indexes)
+            self.expired += 1
+        return expired
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "done": len(self.done),
+            "leased": sum(len(lease.indexes) for lease in self.leases.values()),
+            "workers": sorted({lease.worker for lease in self.leases.values()}),
+            "expired_leases": self.expired,
+        }
+
+
+def function_reference(obj: Any) -> Dict[str, str]:
+    """JSON reference to a metric name or a module-level function (its source file)."""
+    if isinstance(obj, str):
+        return {"name": obj}
+    try:
+        source = inspect.getsourcefile(obj)
+    except TypeError:
+        source = None
+    name = getattr(obj, "__name__", None)
+    if not source or not name or getattr(obj, "__qualname__", name) != name:
+        raise ValueError(
+            f"{obj!r} cannot be sent to remote workers; use a module-level function "
+            "or pass --task-file/--task-function to the workers"
+        )
+    return {"file": os.path.abspath(source), "name": name}
+
+
+def load_reference(ref: Dict[str, str]) -> Any:
+    if "file" not in ref:
+        return ref["name"]
+    return _resolve(("file", (ref["file"], ref["name"])))
+
+
+class Coordinator:
+    """Serve a run's items to workers and merge their rows into the run file.
+
+    The run file is the usual ``<output_dir>/<task>/<model>/<date>/...csv``
+    (or ``config.resume_from``); items it already holds are not leased again,
+    so a restarted coordinator resumes the run.
+    """
+
+    def __init__(
+        self,
+        evaluator: "Evaluator",
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        lease_size: int = 20,
+        lease_ttl: float = 60.0,
+    ) -> None:
+        self.evaluator = evaluator
+        self.host = host
+        self.port = port
+        config = evaluator.config
+        if config.resume_from:
+            state = load_checkpoint_state(config.resume_from)
+            if state and state.run_name:
+                evaluator.run_name = state.run_name
+                config.run_name = state.run_name
+        self.metric_names = list(evaluator.metrics.keys())
+        self.result = EvaluationResult(
+            dataset_name=evaluator.dataset_name,
+            run_name=evaluator.run_name,
+            metrics=self.metric_names,
+            run_metadata=evaluator.run_metadata.copy(),
+            run_config={
+                "max_concurrency": evaluator.max_concurrency,
+                "timeout": evaluator.timeout,
+                "distributed": True,
+                "user_provided_run_name": bool(config.run_name),
+            },
+        )
+        items = evaluator.dataset.get_items()
+        evaluator.run_metadata["total_items"] = len(items)
+        self.result.run_metadata["total_items"] = len(items)
+        self.items: List[ShardItem] = [
+            ShardItem(
+                id=run_item_id(idx, item),
+                input=item.input,
+                expected_output=getattr(item, "expected_output", None),
+                metadata=dict(getattr(item, "metadata", None) or {}),
+            )
+            for idx, item in enumerate(items)
+        ]
+        self._index_by_id = {item.id: idx for idx, item in enumerate(self.items)}
+        self.path = config.resume_from or self.result._default_save_path("csv", output_dir=config.output_dir)
+
+        state = load_checkpoint_state(self.path)
+        if state and sorted(state.metrics) != sorted(self.metric_names):
+            raise ValueError(f"Resume metrics mismatch: {state.metrics} != {self.metric_names}")
+        drop_retryable_rows(self.path)
+        recorded: List[int] = []
+        for row in iter_checkpoint_rows(self.path):
+            if self._add_row(row) is not None:
+                recorded.append(self._index_by_id[row["item_id"]])
+        self.leases = LeaseTable(range(len(self.items)), lease_size=lease_size, lease_ttl=lease_ttl)
+        self.leases.complete("", recorded)
+        self.resumed = len(recorded)
+
+        self.job = {
+            "run_name": evaluator.run_name,
+            "dataset_name": evaluator.dataset_name,
+            "dataset_id": evaluator._langfuse_dataset_id,
+            "task": function_reference(evaluator.task),
+            "metrics": [function_reference(m) for m in evaluator._raw_metrics],
+            "config": config.model_dump(
+                mode="json",
+                exclude={"models", "workers", "resume_from", "run_name", "output_dir", "ui_port", "web_ui", "cli_invocation"},
+            ),
+            "lease_ttl": lease_ttl,
+        }
+        self._lock = threading.Lock()
+        self._writer: Optional[CheckpointWriter] = None
+        self.httpd: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def _add_row(self, row: Dict[str, Any]) -> Optional[str]:
+        """Add a checkpoint row to the result unless its item is unknown or already recorded."""
+        item_id, row_result, is_error = parse_checkpoint_row(row, self.metric_names)
+        if item_id not in self._index_by_id or item_id in self.result.results or item_id in self.result.errors:
+            return None
+        if is_error:
+            error_msg = str(row_result.get("output", "") or "").replace("ERROR:", "").strip()
+            self.result.add_error(
+                item_id,
+                error_msg or "error",
+                row_result.get("trace_id"),
+                task_started_at_ms=row_result.get("task_started_at_ms"),
+                execution_meta=row_result.get("execution_meta"),
+            )
+        else:
+            self.result.add_result(item_id, row_result)
+        item = self.items[self._index_by_id[item_id]]
+        self.result.add_input(item_id, item.input)
+        self.result.add_metadata(item_id, item.metadata)
+        return item_id
+
+    def _lease(self, worker: str) -> Dict[str, Any]:
+        with self._lock:
+            if self.leases.finished:
+                return {"done": True}
+            lease = self.leases.acquire(worker)
+            if lease is None:
+                return {"wait": min(5.0, max(0.2, self.leases.lease_ttl / 4))}
+            items = [
+                {"index": idx, "id": item.id, "input": item.input,
+                 "expected_output": item.expected_output, "metadata": item.metadata}
+                for idx, item in ((i, self.items[i]) for i in lease.indexes)
+            ]
+            return {"lease": {"id": lease.id, "items": items, "ttl": self.leases.lease_ttl}}
+
+    def _complete(self, lease_id: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._lock:
+            finished = []
+            requeued = 0
+            for row in rows:
+                if is_retryable_row(row):
+                    # Skipped while the worker's circuit breaker was open: lease it again.
+                    requeued += 1
+                    continue
+                item_id = self._add_row(row)
+                if item_id is None:
+                    continue
+                self._writer.append_row(row)
+                finished.append(self._index_by_id[item_id])
+            self.leases.complete(lease_id, finished)
+            return {"ok": True, "recorded": len(finished), "requeued": requeued}
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            self.leases.reap()
+            return {**self.leases.snapshot(), "errors": len(self.result.errors), "path": self.path}
+
+    def start(self) -> Tuple[str, int]:
+        coordinator = self
+        self._writer = CheckpointWriter(self.path, metrics=self.metric_names)
+        self._writer.open()
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt: str, *args: Any) -> None:  # quiet
+                return
+
+            def _send(self, data: Dict[str, Any], status=HTTPStatus.OK) -> None:
+                body = json.dumps(data, ensure_ascii=False, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):  # noqa: N802
+                if self.path == "/job":
+                    self._send(coordinator.job)
+                elif self.path == "/status":
+                    self._send(coordinator.status())
+                else:
+                    self._send({"error": "not found"}, HTTPStatus.NOT_FOUND)
+
+            def do_POST(self):  # noqa: N802
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send({"error": "invalid JSON"}, HTTPStatus.BAD_REQUEST)
+                    return
+                if self.path == "/lease":
+                    self._send(coordinator._lease(str(payload.get("worker") or "worker")))
+                elif self.path == "/renew":
+                    with coordinator._lock:
+                        ok = coordinator.leases.renew(str(payload.get("lease")))
+                    self._send({"ok": ok})
+                elif self.path == "/complete":
+                    self._send(coordinator._complete(str(payload.get("lease")), list(payload.get("rows") or [])))
+                else:
+                    self._send({"error": "not found"}, HTTPStatus.NOT_FOUND)
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="qym-coordinator", daemon=True)
+        self.thread.start()
+        return self.host, self.port
+
+    def wait(
+        self,
+        timeout: Optional[float] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        poll_interval: float = 0.5,
+    ) -> EvaluationResult:
+        """Block until every item has a row, then return the merged result."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            status = self.status()
+            if on_progress is not None:
+                on_progress(status)
+            if self.leases.finished:
+                break
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Distributed run not finished: {status['done']}/{status['total']} items")
+            time.sleep(poll_interval)
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        self.result.last_saved_path = self.path
+        self.result.finish()
+        return self.result
+
+    def stop(self) -> None:
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def _call(base_url: str, path: str, payload: Optional[Dict[str, Any]] = None, timeout: float = 30.0) -> Dict[str, Any]:
+    data = None if payload is None else json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+    request = urllib.request.Request(
+        base_url + path, data=data, headers={"Content-Type": "application/json"},
+        method="GET" if payload is None else "POST",
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read() or b"{}")
+
+
+def run_worker(
+    address: str,
+    *,
+    worker_id: Optional[str] = None,
+    task: Any = None,
+    work_dir: Optional[str] = None,
+    max_leases: Optional[int] = None,
+) -> int:
+    """Evaluate leases from the coordinator at ``host:port`` until the run is done.
+
+    Each lease runs as a normal evaluation of its items with a checkpoint in
+    ``work_dir``; its rows are then sent back. The task comes from the
+    coordinator's job (same source file path) unless ``task`` is given.
+    Returns the number of items evaluated.
+    """
+    from .evaluator import Evaluator
+
+    base_url = address if address.startswith("http") else f"http://{address}"
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    work_dir = work_dir or tempfile.mkdtemp(prefix="qym-worker-")
+    job = _call(base_url, "/job")
+    task = task if task is not None else load_reference(job["task"])
+    metrics = [load_reference(ref) for ref in job["metrics"]]
+    evaluated = 0
+    leases = 0
+    while max_leases is None or leases < max_leases:
+        try:
+            reply = _call(base_url, "/lease", {"worker": worker_id})
+        except urllib.error.URLError:
+            # The coordinator exits once the run is merged.
+            break
+        if reply.get("done"):
+            break
+        if "wait" in reply:
+            time.sleep(float(reply["wait"]))
+            continue
+        lease = reply["lease"]
+        leases += 1
+        checkpoint = os.path.join(work_dir, f"{lease['id']}.csv")
+        dataset = ShardDataset(
+            job["dataset_name"],
+            [
+                ShardItem(id=i["id"], input=i["input"], expected_output=i.get("expected_output"), metadata=i.get("metadata") or {})
+                for i in lease["items"]
+            ],
+            job.get("dataset_id"),
+        )
+        evaluator = Evaluator(
+            task=task,
+            dataset=dataset,
+            metrics=metrics,
+            config={
+                **job["config"],
+                "run_name": job["run_name"],
+                "resume_from": checkpoint,
+                "output_dir": work_dir,
+                "checkpoint_enabled": True,
+                # One UI server per lease would pile up in a long-running worker.
+                "web_ui": False,
+            },
+        )
+        stop_renewing = threading.Event()
+
+        def _renew(lease_id: str = lease["id"], interval: float = max(0.5, float(lease["ttl"]) / 3)) -> None:
+            while not stop_renewing.wait(interval):
+                try:
+                    if not _call(base_url, "/renew", {"lease": lease_id}).get("ok"):
+                        return
+                except (urllib.error.URLError, OSError):
+                    pass
+
+        renewer = threading.Thread(target=_renew, name="qym-lease-renew", daemon=True)
+        renewer.start()
+        try:
+            result = asyncio.run(evaluator.arun(show_tui=False))
+        finally:
+            stop_renewing.set()
+            renewer.join(timeout=5)
+        rows = list(iter_checkpoint_rows(checkpoint))
+        done = _call(base_url, "/complete", {"lease": lease["id"], "rows": rows}, timeout=120.0)
+        os.remove(checkpoint)
+        requeued = int(done.get("requeued") or 0)
+        evaluated += len(rows) - requeued
+        if requeued:
+            # The model was down: give it the breaker's cool-down before the next lease.
+            time.sleep(float(job["config"].get("circuit_open_seconds") or 0))
+        if getattr(result, "interrupted", False):
+            break
+    return evaluated
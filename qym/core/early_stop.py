@@ -0,0 +1,124 @@
+"""Sequential early stopping once metric estimates have converged."""
+
+from __future__ import annotations
+
+import math
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, Optional
+
+
+def _numeric(score: Any) -> Optional[float]:
+    """Main numeric value of a metric score, or None (errors, strings)."""
+    if isinstance(score, dict):
+        if "error" in score:
+            return None
+        score = score.get("score")
+    if isinstance(score, bool):
+        return 1.0 if score else 0.0
+    if isinstance(score, (int, float)) and math.isfinite(score):
+        return float(score)
+    return None
+
+
+class RunningMean:
+    """Welford running mean/variance with a normal-approximation confidence interval."""
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self._m2 += delta * (value - self.mean)
+
+    def half_width(self, z: float) -> float:
+        if self.n < 2:
+            return math.inf
+        return z * math.sqrt(self._m2 / (self.n - 1) / self.n)
+
+
+class EarlyStopper:
+    """Decide when a run has scored enough (randomly ordered) items.
+
+    A metric is settled once its confidence interval is at most
+    ``precision`` wide on either side of the mean, or, with a ``threshold``,
+    once the whole interval lies above ("pass") or below ("fail") it. The run
+    stops when every monitored metric is settled and at least ``min_items``
+    items were scored. Without an explicit ``metrics`` list every metric that
+    produces numeric scores is monitored.
+    """
+
+    def __init__(
+        self,
+        metrics: Optional[Iterable[str]] = None,
+        *,
+        precision: Optional[float] = 0.01,
+        threshold: Optional[float] = None,
+        confidence: float = 0.95,
+        min_items: int = 30,
+    ) -> None:
+        self.metrics = list(metrics) if metrics else None
+        self.precision = precision
+        self.threshold = threshold
+        self.confidence = confidence
+        self.min_items = max(2, int(min_items))
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        self.stats: Dict[str, RunningMean] = {m: RunningMean() for m in self.metrics or ()}
+        self.items = 0
+        self.stopped_at: Optional[int] = None
+        self.reason: Optional[str] = None
+
+    def observe(self, scores: Dict[str, Any]) -> bool:
+        """Add one item's scores; returns True the first time the run should stop."""
+        self.items += 1
+        for name, score in scores.items():
+            if self.metrics is not None and name not in self.metrics:
+                continue
+            value = _numeric(score)
+            if value is not None:
+                self.stats.setdefault(name, RunningMean()).add(value)
+        if self.stopped_at is not None or self.items < self.min_items:
+            return False
+        decisions = {name: self._decision(stat) for name, stat in self.stats.items()}
+        if not decisions or None in decisions.values():
+            return False
+        self.stopped_at = self.items
+        self.reason = ", ".join(f"{name} {decision}" for name, decision in decisions.items())
+        return True
+
+    def _decision(self, stat: RunningMean) -> Optional[str]:
+        if stat.n < self.min_items:
+            return None
+        half = stat.half_width(self.z)
+        if self.threshold is not None:
+            if stat.mean - half > self.threshold:
+                return "pass"
+            if stat.mean + half < self.threshold:
+                return "fail"
+        if self.precision is not None and half <= self.precision:
+            return "converged"
+        return None
+
+    def estimates(self) -> Dict[str, Dict[str, Any]]:
+        estimates = {}
+        for name, stat in self.stats.items():
+            half = stat.half_width(self.z)
+            estimates[name] = {
+                "n": stat.n,
+                "mean": round(stat.mean, 6),
+                "ci_half_width": round(half, 6) if math.isfinite(half) else None,
+                "decision": self._decision(stat),
+            }
+        return estimates
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "items": self.items,
+            "stopped_at": self.stopped_at,
+            "reason": self.reason,
+            "confidence": self.confidence,
+            "metrics": self.estimates(),
+        }
@@ -6,13 +6,18 @@ import asyncio
 import inspect
 import os
 import traceback
-from typing import Any, Callable, Dict, List, Optional, Sequence, Union, Tuple, Set
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union, Tuple, Set
 from datetime import datetime
 import time
 import subprocess
 from pathlib import Path
 import copy
-from contextlib import nullcontext
+import contextvars
+import functools
+import itertools
+import random
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 import re
 
 from langfuse import Langfuse
@@ -20,16 +25,17 @@ from rich.console import Console
 from rich.live import Live
 from rich.table import Table
 
-from .results import EvaluationResult
+from .results import EvaluationResult, _sanitize_path_component
 from .checkpoint import (
     CheckpointWriter,
     load_checkpoint_state,
+    drop_retryable_rows,
     iter_checkpoint_rows,
     parse_checkpoint_row,
     parse_metric_score,
     serialize_checkpoint_row,
 )
-from .dataset import LangfuseDataset
+from .dataset import LangfuseDataset, iter_dataset_items
 from .progress import ProgressTracker, ProgressObserver
 from .observers import (
     EvaluationObserver,
@@ -37,7 +43,39 @@ from .observers import (
     CompositeEvaluationObserver,
 )
 from .dashboard import RunDashboard, console_supports_live
-from ..adapters.base import TaskAdapter, auto_detect_task
+from .pipeline import StageStats
+from .concurrency import AdaptiveConcurrencyLimiter
+from .retry import RetryBudget, RetryPolicy, call_with_retry
+from .hedging import Hedger, call_hedged
+from .batching import MicroBatcher
+from .coalescing import SingleFlight, input_key
+from .early_stop import EarlyStopper
+from .fair_share import FairShareFlow
+from .circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, is_endpoint_failure
+from .run_discovery import RunDiscovery
+from .load import LoadTimeline, arrival_offsets
+from .scheduling import longest_first_order
+from .sharding import run_sharded
+from .task_cache import CACHE_FILENAME, TaskCache, cache_key, task_identity
+from .metric_cache import CACHE_FILENAME as METRIC_CACHE_FILENAME, MetricCache, metric_cache_key
+from .executors import (
+    CpuProfiler,
+    InstrumentedProcessPoolExecutor,
+    InstrumentedThreadPoolExecutor,
+    IsolatedTaskPool,
+    compute_metric_batch,
+    compute_metric_sync,
+)
+from .metric_plan import MetricPlan, compile_metric_plan
+from .rate_limit import (
+    RateLimiter,
+    acquire_rate_limits,
+    estimate_tokens,
+    get_rate_limiter_registry,
+)
+from ..adapters.base import FunctionAdapter, TaskAdapter, auto_detect_task, is_batch_task
+from ..adapters.replay import TaskRecorder
+from ..metrics.markers import cache_version
 from ..metrics.registry import get_metric
 
 
@@ -49,7 +87,13 @@ def _strip_model_provider(model_name: Optional[str]) -> str:
     return model_name[slash_idx + 1:] if slash_idx > 0 else model_name
 
 
-from ..utils.errors import LangfuseConnectionError, DatasetNotFoundError
+from ..utils.errors import (
+    LangfuseConnectionError,
+    DatasetNotFoundError,
+    TaskTimeoutError,
+    MetricTimeoutError,
+    CircuitOpenError,
+)
 from ..server.app import UIServer
 import json
 import logging
@@ -93,6 +137,22 @@ class NullTrace:
 
 from .config import EvaluatorConfig
 
+
+@dataclass
+class _StagedItem:
+    """An item whose task has finished and which is waiting to be scored."""
+
+    index: int
+    item: Any
+    span: Any
+    meta: Dict[str, Any]
+    output: Any
+    task_started_at_ms: Optional[int]
+    task_elapsed_time: float
+    # Retry counts / backoff time etc., saved with the item's checkpoint row
+    execution_meta: Dict[str, Any] = field(default_factory=dict)
+
+
 class Evaluator:
     """
     Simple evaluator for LLM tasks using Langfuse datasets.
@@ -107,6 +167,7 @@ class Evaluator:
         observer: Optional[EvaluationObserver] = None,
         model: Optional[Union[str, Sequence[str]]] = None,
         langfuse_client: Optional[Langfuse] = None,
+        workers: Optional[int] = None,
     ):
         """
         Initialize the evaluator.
@@ -117,6 +178,8 @@ class Evaluator:
             self.config = config
         else:
             self.config = EvaluatorConfig(**(config or {}))
+        if workers is not None:
+            self.config.workers = EvaluatorConfig(workers=workers).workers
         self._task_name = _derive_task_name(task)
             
         # Override model if provided explicitly
@@ -163,6 +226,43 @@ class Evaluator:
         # Configuration shortcuts
         self.max_concurrency = self.config.max_concurrency
         self.timeout = self.config.timeout
+        self.metric_timeout = self.config.metric_timeout
+        # Per-metric semaphores, created lazily on the running loop
+        self._metric_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+        self._rate_limiters: List[RateLimiter] = []
+        self._retry_policy = RetryPolicy(
+            max_retries=self.config.max_retries,
+            base_delay=self.config.retry_base_delay,
+            max_delay=self.config.retry_max_delay,
+        )
+        self._retry_budget: Optional[RetryBudget] = None
+        self._hedger: Optional[Hedger] = None
+        self._batcher: Optional[MicroBatcher] = None
+        self._metric_batchers: Dict[str, MicroBatcher] = {}
+        self._task_cache: Optional[TaskCache] = None
+        self._task_cache_id: Optional[str] = None
+        self._single_flight: Optional[SingleFlight] = None
+        self._recorder: Optional[TaskRecorder] = None
+        self._load: Optional[LoadTimeline] = None
+        self._early_stopper: Optional[EarlyStopper] = None
+        self._schedule_stats: Dict[str, Any] = {}
+        # Share of a global concurrency budget, attached by MultiModelRunner
+        self.fair_share: Optional[FairShareFlow] = None
+        # Per-model circuit breakers, shared across runs when MultiModelRunner attaches one
+        self.circuit_breakers: Optional[CircuitBreakerRegistry] = None
+        self._breaker: Optional[CircuitBreaker] = None
+        self._metric_cache: Optional[MetricCache] = None
+        # Metric name -> version/fingerprint, for metrics opted into the metric cache
+        self._metric_cache_ids: Dict[str, str] = {}
+        self._task_executor: Optional[InstrumentedThreadPoolExecutor] = None
+        self._metric_executor: Optional[InstrumentedThreadPoolExecutor] = None
+        self._metric_process_pool: Optional[InstrumentedProcessPoolExecutor] = None
+        self._task_process_pool: Optional[IsolatedTaskPool] = None
+        self._cpu_profiler: Optional[CpuProfiler] = None
+        # Metrics that failed to run in the process pool (e.g. unpicklable)
+        self._process_fallback: Set[str] = set()
+        self._stage_stats: Dict[str, StageStats] = {}
 
         # Model handling - strip provider prefix once, keep full name for user's task
         # e.g., "qwen/qwen3-235b" -> model_name="qwen3-235b", model_name_full="qwen/qwen3-235b"
@@ -435,7 +535,11 @@ class Evaluator:
 
 
     def _prepare_metrics(self, metrics: List[Union[str, Callable]]) -> Dict[str, Callable]:
-        """Convert metric list to dict of callables."""
+        """Convert metric list to dict of callables.
+
+        Also compiles each metric's call plan (arguments, async flag, executor)
+        into ``self._metric_plans`` so scoring never introspects signatures.
+        """
         prepared = {}
         for metric in metrics:
             if isinstance(metric, str):
@@ -445,6 +549,9 @@ class Evaluator:
                 prepared[name] = metric
             else:
                 raise ValueError(f"Metric must be string or callable, got {type(metric)}")
+        self._metric_plans: Dict[str, MetricPlan] = {
+            name: compile_metric_plan(name, func) for name, func in prepared.items()
+        }
         return prepared
 
     def _build_langfuse_url(self) -> Optional[str]:
@@ -491,6 +598,8 @@ class Evaluator:
         auto_save: bool = True,
         save_format: str = "csv",
         max_parallel_runs: Optional[int] = None,
+        global_concurrency: Optional[int] = None,
+        model_weights: Optional[Dict[str, float]] = None,
     ) -> Union[EvaluationResult, List[EvaluationResult]]:
         """
         Run the evaluation synchronously.
@@ -504,6 +613,9 @@ class Evaluator:
                 None (default) = all models in parallel
                 1 = sequential (one model at a time)
                 N = run N models at a time
+            global_concurrency: Cap on in-flight task calls across all models,
+                shared by weighted fair queuing (multiple models only)
+            model_weights: Relative share of each model under global_concurrency
 
         Returns:
             EvaluationResult object with scores and statistics
@@ -528,7 +640,14 @@ class Evaluator:
             asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
         if len(self.models) > 1:
-            return self._run_multi_model(show_tui, auto_save, save_format, max_parallel_runs)
+            return self._run_multi_model(
+                show_tui,
+                auto_save,
+                save_format,
+                max_parallel_runs,
+                global_concurrency=global_concurrency,
+                model_weights=model_weights,
+            )
 
         # Run the async evaluation
         result = asyncio.run(self.arun(show_tui=show_tui, auto_save=auto_save, save_format=save_format))
@@ -557,6 +676,84 @@ class Evaluator:
         Note:
             The Web UI is always available at the URL printed at startup.
         """
+        if self.config.workers > 1:
+            return await run_sharded(
+                self, show_tui=show_tui, auto_save=auto_save, save_format=save_format
+            )
+        self._metric_semaphores = {}
+        self._concurrency = (
+            AdaptiveConcurrencyLimiter(self.max_concurrency, min_limit=self.config.min_concurrency)
+            if self.config.adaptive_concurrency
+            else None
+        )
+        self._retry_budget = (
+            RetryBudget(ratio=self.config.retry_budget) if self.config.max_retries else None
+        )
+        self._hedger = (
+            Hedger(
+                self.config.hedge_percentile,
+                max_extra=self.config.hedge_max_extra,
+                min_samples=self.config.hedge_min_samples,
+            )
+            if self.config.hedge_percentile
+            else None
+        )
+        # Batch-capable tasks: concurrent items are grouped into micro-batches
+        # (at most max_concurrency items are in flight, so that caps a batch too).
+        batch_size = self.config.task_batch_size
+        self._batcher = (
+            MicroBatcher(
+                self._call_task_batch,
+                max_size=batch_size or self.max_concurrency,
+                max_wait=self.config.task_batch_wait,
+            )
+            if self.task_adapter.supports_batch and (batch_size or is_batch_task(self.task))
+            else None
+        )
+        # Vectorized metrics: items being scored at the same time share one call.
+        self._metric_batchers = {
+            plan.name: MicroBatcher(
+                functools.partial(self._call_metric_batch, plan),
+                max_size=self.config.metric_batch_size,
+                max_wait=self.config.metric_batch_wait,
+            )
+            for plan in self._metric_plans.values()
+            if plan.is_batch
+        }
+        self._load = (
+            LoadTimeline(
+                self.config.load_rate,
+                pattern=self.config.load_pattern,
+                ramp_from=self.config.load_ramp_from,
+                ramp_seconds=self.config.load_ramp_seconds,
+                warmup_seconds=self.config.load_warmup_seconds,
+            )
+            if self.config.load_rate
+            else None
+        )
+        self._breaker = None
+        if self.config.circuit_breaker:
+            registry = self.circuit_breakers or CircuitBreakerRegistry()
+            self._breaker = registry.get(
+                self.model_name_full,
+                failure_threshold=self.config.circuit_failure_threshold,
+                error_rate=self.config.circuit_error_rate,
+                window=self.config.circuit_window,
+                open_seconds=self.config.circuit_open_seconds,
+                half_open_probes=self.config.circuit_half_open_probes,
+                probe_attempts=self.config.circuit_probe_attempts,
+            )
+        self._early_stopper = (
+            EarlyStopper(
+                self.config.early_stop_metrics,
+                precision=self.config.early_stop_precision,
+                threshold=self.config.early_stop_threshold,
+                confidence=self.config.early_stop_confidence,
+                min_items=self.config.early_stop_min_items,
+            )
+            if self.config.early_stop
+            else None
+        )
         checkpoint_state = None
         if self.config.resume_from:
             checkpoint_state = load_checkpoint_state(self.config.resume_from)
@@ -578,38 +775,167 @@ class Evaluator:
             }
         )
 
-        items = self.dataset.get_items()
-        if not items:
-            console.print("[yellow]Warning: Dataset is empty[/yellow]")
-            return result
-        self.run_metadata["total_items"] = len(items)
+        streaming = bool(self.config.stream_dataset)
+        if streaming and self._early_stopper is not None:
+            raise ValueError(
+                "early_stop draws items in random order and needs the full item list; "
+                "disable stream_dataset."
+            )
+        longest_first = self.config.schedule == "longest_first"
+        if longest_first and (streaming or self._early_stopper is not None):
+            raise ValueError(
+                "schedule='longest_first' needs the full item list in its own order; "
+                "it cannot be combined with stream_dataset or early_stop."
+            )
+        self._schedule_stats = {}
+        if streaming:
+            # Pull items lazily; peek at the first one only to detect an empty dataset.
+            item_source = iter_dataset_items(self.dataset)
+            first_item = next(item_source, None)
+            if first_item is None:
+                console.print("[yellow]Warning: Dataset is empty[/yellow]")
+                return result
+            items = None
+            item_source = enumerate(itertools.chain([first_item], item_source))
+            total_items = 0  # unknown until the dataset is exhausted
+        else:
+            items = self.dataset.get_items()
+            if not items:
+                console.print("[yellow]Warning: Dataset is empty[/yellow]")
+                return result
+            item_source = iter(items)
+            if self._early_stopper is not None:
+                # Random order keeps the running estimates unbiased at any stopping point.
+                order = list(range(len(items)))
+                random.Random(self.config.early_stop_seed).shuffle(order)
+                item_source = ((idx, items[idx]) for idx in order)
+            elif longest_first:
+                order, from_history = longest_first_order(items, self._latency_history())
+                self._schedule_stats = {
+                    "mode": "longest_first",
+                    "from_history": from_history,
+                    "estimated": len(items) - from_history,
+                }
+                item_source = ((idx, items[idx]) for idx in order)
+            else:
+                item_source = enumerate(items)
+            total_items = len(items)
+            self.run_metadata["total_items"] = total_items
         if self._langfuse_dataset_id:
             self.run_metadata["langfuse_dataset_id"] = self._langfuse_dataset_id
     
+        # Caches, recorder and worker pools hold files, threads and processes:
+        # create them only once the run has items (closed in the finally below).
+        cache_mode = self.config.task_cache
+        self._task_cache = None
+        if self.config.task_cache_key:
+            self._task_cache_id = f"key:{self.config.task_cache_key}"
+        else:
+            self._task_cache_id = task_identity(self.task)
+        if cache_mode != "off" and self._task_cache_id is None:
+            logger.warning(
+                f"task_cache is disabled: {type(self.task).__name__} instances can differ in "
+                "prompt, model or settings, so cached outputs could belong to another task; "
+                "set task_cache_key to cache them"
+            )
+            cache_mode = "off"
+        if cache_mode != "off":
+            max_mb = self.config.task_cache_max_mb
+            max_age_days = self.config.task_cache_max_age_days
+            self._task_cache = TaskCache(
+                os.path.join(self.config.output_dir, CACHE_FILENAME),
+                max_bytes=int(max_mb * 1024 * 1024) if max_mb else None,
+                max_age=max_age_days * 86400 if max_age_days else None,
+                refresh=cache_mode == "refresh",
+            )
+        # Shared with concurrent runs in the process; released in the finally
+        # below so this run's limits do not outlive it.
+        self._rate_limiters = get_rate_limiter_registry().resolve(
+            self.model_name_full, self.config.rate_limits
+        )
+        self._single_flight = SingleFlight() if self.config.coalesce_inputs else None
+        self._recorder = (
+            TaskRecorder(self.config.record_task_calls, task_name=self._task_name)
+            if self.config.record_task_calls
+            else None
+        )
+        self._metric_cache_ids = {}
+        for plan in self._metric_plans.values():
+            version = cache_version(plan.func)
+            if version is None and plan.name not in self.config.metric_cache:
+                continue
+            metric_id = version or task_identity(plan.func)
+            if metric_id is None:
+                logger.warning(
+                    f"Metric {plan.name} is not cached: it is a configured object; "
+                    "give it a version with @cache_metric(version=...)"
+                )
+                continue
+            self._metric_cache_ids[plan.name] = metric_id
+        self._metric_cache = None
+        if self._metric_cache_ids:
+            ttl_days = self.config.metric_cache_ttl_days
+            self._metric_cache = MetricCache(
+                os.path.join(self.config.output_dir, METRIC_CACHE_FILENAME),
+                max_entries=self.config.metric_cache_max_entries,
+                ttl=ttl_days * 86400 if ttl_days else None,
+            )
+        # Own thread pools instead of the loop's default executor (capped at
+        # min(32, cpu + 4)): sync tasks get max_concurrency threads and sync
+        # metrics a separate pool so the two never compete for threads.
+        self._task_executor = InstrumentedThreadPoolExecutor(
+            self.max_concurrency, thread_name_prefix="qym-task"
+        )
+        self._metric_executor = InstrumentedThreadPoolExecutor(
+            self.config.metric_threads or self.config.metric_concurrency or self.max_concurrency,
+            thread_name_prefix="qym-metric",
+        )
+        self.task_adapter.executor = self._task_executor
+        self._task_process_pool = None
+        if self.config.task_processes:
+            if isinstance(self.task_adapter, FunctionAdapter) and not self.task_adapter._is_async:
+                self._task_process_pool = IsolatedTaskPool(
+                    self.task,
+                    size=self.config.task_processes,
+                    max_items=self.config.task_process_max_items,
+                    max_rss_mb=self.config.task_process_max_rss_mb,
+                )
+                self.task_adapter.processes = self._task_process_pool
+            else:
+                logger.warning("task_processes only applies to sync task functions; running the task in-process")
+        if self.config.metric_processes:
+            # CPU-bound metrics (marked, or detected from their thread CPU time)
+            # run in processes so they do not hold the GIL the event loop needs.
+            self._metric_process_pool = InstrumentedProcessPoolExecutor(self.config.metric_processes)
+            self._cpu_profiler = CpuProfiler()
+
         run_info = self._build_run_info(result)
 
         # Initialize progress tracker
         metric_names = list(self.metrics.keys())
-        tracker = ProgressTracker(items, metric_names)
+        tracker = ProgressTracker(
+            items, metric_names, keep_finished=self.config.stream_ui_rows if streaming else None
+        )
     
-        # Web UI setup - always start the server
+        # Web UI setup - start the server unless disabled (config.web_ui)
         html_url = None
         ui_server = None
-        desired_port = 0
-        try:
-            desired_port = int(self.config.ui_port)
-        except Exception:
+        if self.config.web_ui:
             desired_port = 0
-        ui_server = UIServer(host="127.0.0.1", port=desired_port)
-        host, port = ui_server.start()
-        html_url = f"http://{host}:{port}/"
-        run_info = {**(run_info or {}), "html_url": html_url}
-        ui_server.run_state.set_run_info({
-            "dataset_name": self.dataset_name,
-            "run_name": self.run_name,
-            "config": {"max_concurrency": self.max_concurrency, "timeout": self.timeout},
-            **({} if run_info is None else run_info),
-        })
+            try:
+                desired_port = int(self.config.ui_port)
+            except Exception:
+                desired_port = 0
+            ui_server = UIServer(host="127.0.0.1", port=desired_port)
+            host, port = ui_server.start()
+            html_url = f"http://{host}:{port}/"
+            run_info = {**(run_info or {}), "html_url": html_url}
+            ui_server.run_state.set_run_info({
+                "dataset_name": self.dataset_name,
+                "run_name": self.run_name,
+                "config": {"max_concurrency": self.max_concurrency, "timeout": self.timeout},
+                **({} if run_info is None else run_info),
+            })
 
         dashboard = None
         live_context = nullcontext()
@@ -644,7 +970,6 @@ class Evaluator:
         checkpoint_path = None
         checkpoint_writer = None
         completed_item_ids: Set[str] = set()
-        checkpoint_rows: List[Dict[str, Any]] = []
         resume_completed = 0
         resume_failed = 0
         resume_metric_totals: Dict[str, float] = {m: 0.0 for m in metric_names}
@@ -670,11 +995,11 @@ class Evaluator:
                     raise ValueError(
                         "resume_rerun_errors is not supported when appending to the same run file."
                     )
+                drop_retryable_rows(checkpoint_path)
                 completed_item_ids = set(checkpoint_state.completed_item_ids)
                 resume_failed = len(checkpoint_state.error_item_ids)
                 resume_completed = max(0, len(completed_item_ids) - resume_failed)
                 for row in iter_checkpoint_rows(checkpoint_path):
-                    checkpoint_rows.append(row)
                     for m in metric_names:
                         val = parse_metric_score(row.get(f"{m}_score", ""))
                         if val is not None:
@@ -691,6 +1016,7 @@ class Evaluator:
                             error_msg,
                             row_result.get("trace_id"),
                             task_started_at_ms=row_result.get("task_started_at_ms"),
+                            execution_meta=row_result.get("execution_meta"),
                         )
                     else:
                         result.add_result(item_id, row_result)
@@ -714,38 +1040,44 @@ class Evaluator:
         self._notify_observer(
             "on_run_start",
             run_info=run_info or {},
-            total_items=len(items),
+            total_items=total_items,
             metrics=list(self.metrics.keys()),
         )
 
-        # Build item list and input metadata
-        item_id_to_index: Dict[str, int] = {}
-        pending_entries: List[Tuple[int, str, Any]] = []
+        # Item IDs and input metadata are resolved as items are pulled
+        # (Shard datasets already carry the run-wide ids, fallbacks included.)
         use_fallback_ids = bool(
             checkpoint_state
+            and not getattr(self.dataset, "fixed_item_ids", False)
             and any(str(item_id).startswith("item_") for item_id in completed_item_ids)
         )
-        for idx, item in enumerate(items):
+
+        def _pending_entry(idx: int, item: Any) -> Optional[Tuple[int, str, Any]]:
             primary_id_raw = getattr(item, "id", None)
             primary_id = str(primary_id_raw) if primary_id_raw is not None else None
             fallback_id = f"item_{idx}"
-            if primary_id:
-                item_id_to_index[primary_id] = idx
-            item_id_to_index[fallback_id] = idx
             # Use the same ID scheme as the checkpoint when resuming.
             item_id = fallback_id if use_fallback_ids or not primary_id else primary_id
             result.add_input(item_id, item.input)
             result.add_metadata(item_id, getattr(item, "metadata", {}))
             if item_id in completed_item_ids or fallback_id in completed_item_ids or (primary_id in completed_item_ids if primary_id else False):
-                continue
-            pending_entries.append((idx, item_id, item))
+                return None
+            return (idx, item_id, item)
+
+        self._stage_stats = {}
+
+        def publish_snapshot():
+            snap = tracker.get_snapshot()
+            run_stats = self._run_stats()
+            snap["run_stats"] = run_stats
+            if ui_server is not None:
+                ui_server.run_state.set_snapshot(snap)
+            self._notify_observer("on_run_stats", stats=run_stats)
 
         async def update_html():
             while True:
                 try:
-                    snap = tracker.get_snapshot()
-                    if ui_server is not None:
-                        ui_server.run_state.set_snapshot(snap)
+                    publish_snapshot()
                 except Exception as e:
                     logger.debug(f"Failed to update UI snapshot: {e}")
                     pass
@@ -759,9 +1091,31 @@ class Evaluator:
 
             html_update_task = asyncio.create_task(update_html())
 
-            work_queue: asyncio.Queue = asyncio.Queue()
+            # Streaming bounds the items read ahead of the workers; otherwise the
+            # whole (already loaded) dataset is queued up front.
+            work_queue: asyncio.Queue = asyncio.Queue(
+                maxsize=int(self.config.stream_queue_size or 2 * self.max_concurrency)
+                if streaming
+                else 0
+            )
             write_queue: asyncio.Queue = asyncio.Queue()
             interrupted = False
+            # Set once the early stopper is satisfied: no new items are started.
+            stop_event = asyncio.Event()
+
+            # Two-stage pipeline: when metric_concurrency is set, task workers hand
+            # finished outputs to a bounded queue drained by separate metric workers.
+            pipelined = bool(self.config.metric_concurrency)
+            metric_workers = int(self.config.metric_concurrency or 0)
+            metric_queue: Optional[asyncio.Queue] = None
+            if pipelined:
+                metric_queue = asyncio.Queue(
+                    maxsize=int(self.config.metric_queue_size or 2 * metric_workers)
+                )
+            task_stage = StageStats("task", self.max_concurrency, queue=work_queue)
+            self._stage_stats["task"] = task_stage
+            if pipelined:
+                self._stage_stats["metric"] = StageStats("metric", metric_workers, queue=metric_queue)
 
             async def _write_loop():
                 if not checkpoint_writer:
@@ -791,108 +1145,236 @@ class Evaluator:
                 langfuse_url = self._build_langfuse_url()
                 if langfuse_url:
                     md["langfuse_url"] = langfuse_url
+                if self._concurrency is not None:
+                    md["adaptive_concurrency"] = {
+                        "limit": self._concurrency.limit,
+                        "min": self._concurrency.min_limit,
+                        "max": self._concurrency.max_limit,
+                    }
                 return md
 
+            def _checkpoint_run_config() -> Dict[str, Any]:
+                cfg: Dict[str, Any] = {"max_concurrency": self.max_concurrency, "timeout": self.timeout}
+                if pipelined:
+                    cfg["metric_concurrency"] = metric_workers
+                if self._retry_policy.max_retries:
+                    cfg["max_retries"] = self._retry_policy.max_retries
+                if self._hedger is not None:
+                    cfg["hedge_percentile"] = self._hedger.percentile
+                if self._concurrency is not None:
+                    cfg["adaptive_concurrency"] = True
+                    cfg["min_concurrency"] = self._concurrency.min_limit
+                return cfg
+
+            # Open-loop load test: item id -> scheduled send time
+            load = self._load
+            send_times: Dict[str, float] = {}
+
+            def _task_returned(item_id: str, staged: Any) -> None:
+                """Close an item's load-test send once its task call returned or failed.
+
+                The load test measures the task endpoint, so metric time (and
+                the metric queue) stay out of its latency and in_flight.
+                """
+                if load is not None and item_id in send_times:
+                    load.record_done(
+                        send_times.pop(item_id), error=not isinstance(staged, _StagedItem)
+                    )
+
+            async def _record(item_id: str, item: Any, eval_result: Any) -> None:
+                if isinstance(eval_result, Exception):
+                    error_msg = str(eval_result)
+                    result.add_error(item_id, error_msg)
+                    row = serialize_checkpoint_row(
+                        dataset_name=self.dataset_name,
+                        run_name=self.run_name,
+                        run_metadata=_checkpoint_run_metadata(),
+                        run_config=_checkpoint_run_config(),
+                        trace_id="",
+                        item_id=item_id,
+                        item_input=item.input,
+                        item_metadata=getattr(item, "metadata", {}),
+                        output=f"ERROR: {error_msg}",
+                        expected_output=getattr(item, "expected_output", None),
+                        time_seconds=0.0,
+                        task_started_at_ms=None,
+                        scores={m: "N/A" for m in metric_names},
+                        metric_meta={},
+                    )
+                elif isinstance(eval_result, dict) and "_error" in eval_result:
+                    error_msg = str(eval_result.get("_error", "error"))
+                    result.add_error(
+                        item_id,
+                        error_msg,
+                        eval_result.get("_trace_id"),
+                        task_started_at_ms=eval_result.get("task_started_at_ms"),
+                        execution_meta=eval_result.get("execution_meta"),
+                    )
+                    row = serialize_checkpoint_row(
+                        dataset_name=self.dataset_name,
+                        run_name=self.run_name,
+                        run_metadata=_checkpoint_run_metadata(),
+                        run_config=_checkpoint_run_config(),
+                        trace_id=eval_result.get("_trace_id") or "",
+                        item_id=item_id,
+                        item_input=item.input,
+                        item_metadata=getattr(item, "metadata", {}),
+                        output=f"ERROR: {error_msg}",
+                        expected_output=getattr(item, "expected_output", None),
+                        time_seconds=0.0,
+                        task_started_at_ms=eval_result.get("task_started_at_ms"),
+                        scores={m: "N/A" for m in metric_names},
+                        metric_meta={},
+                        execution_meta=eval_result.get("execution_meta"),
+                    )
+                else:
+                    result.add_result(item_id, eval_result)
+                    scores = eval_result.get("scores", {})
+                    stopper = self._early_stopper
+                    if stopper is not None and stopper.observe(scores):
+                        stop_event.set()
+                        producer_task.cancel()
+                    metric_meta: Dict[str, Dict[str, Any]] = {}
+                    score_row: Dict[str, Any] = {}
+                    for m in metric_names:
+                        sc = scores.get(m)
+                        score_row[m] = _main_score(sc)
+                        if isinstance(sc, dict) and isinstance(sc.get("metadata"), dict):
+                            metric_meta[m] = sc["metadata"]
+                    row = serialize_checkpoint_row(
+                        dataset_name=self.dataset_name,
+                        run_name=self.run_name,
+                        run_metadata=_checkpoint_run_metadata(),
+                        run_config=_checkpoint_run_config(),
+                        trace_id=eval_result.get("trace_id") or "",
+                        item_id=item_id,
+                        item_input=item.input,
+                        item_metadata=getattr(item, "metadata", {}),
+                        output=eval_result.get("output"),
+                        expected_output=eval_result.get("expected"),
+                        time_seconds=float(eval_result.get("time", 0.0) or 0.0),
+                        task_started_at_ms=eval_result.get("task_started_at_ms"),
+                        scores=score_row,
+                        metric_meta=metric_meta,
+                        execution_meta=eval_result.get("execution_meta"),
+                    )
+
+                if checkpoint_writer:
+                    await write_queue.put(row)
+
             async def _worker():
                 while True:
                     entry = await work_queue.get()
                     if entry is None:
                         work_queue.task_done()
                         break
+                    if stop_event.is_set():
+                        # Early-stopped: drain the remaining items without running them.
+                        work_queue.task_done()
+                        continue
                     idx, item_id, item = entry
+                    if streaming:
+                        tracker.add_item(idx, item)
+                    task_stage.start()
                     try:
-                        eval_result = await self._evaluate_item(idx, item, tracker)
+                        staged = await self._run_task_stage(idx, item, tracker)
                     except Exception as e:
-                        eval_result = e
-
-                    if isinstance(eval_result, Exception):
-                        error_msg = str(eval_result)
-                        result.add_error(item_id, error_msg)
-                        row = serialize_checkpoint_row(
-                            dataset_name=self.dataset_name,
-                            run_name=self.run_name,
-                            run_metadata=_checkpoint_run_metadata(),
-                            run_config={"max_concurrency": self.max_concurrency, "timeout": self.timeout},
-                            trace_id="",
-                            item_id=item_id,
-                            item_input=item.input,
-                            item_metadata=getattr(item, "metadata", {}),
-                            output=f"ERROR: {error_msg}",
-                            expected_output=getattr(item, "expected_output", None),
-                            time_seconds=0.0,
-                            task_started_at_ms=None,
-                            scores={m: "N/A" for m in metric_names},
-                            metric_meta={},
-                        )
-                    elif isinstance(eval_result, dict) and "_error" in eval_result:
-                        error_msg = str(eval_result.get("_error", "error"))
-                        result.add_error(
-                            item_id,
-                            error_msg,
-                            eval_result.get("_trace_id"),
-                            task_started_at_ms=eval_result.get("task_started_at_ms"),
-                        )
-                        row = serialize_checkpoint_row(
-                            dataset_name=self.dataset_name,
-                            run_name=self.run_name,
-                            run_metadata=_checkpoint_run_metadata(),
-                            run_config={"max_concurrency": self.max_concurrency, "timeout": self.timeout},
-                            trace_id=eval_result.get("_trace_id") or "",
-                            item_id=item_id,
-                            item_input=item.input,
-                            item_metadata=getattr(item, "metadata", {}),
-                            output=f"ERROR: {error_msg}",
-                            expected_output=getattr(item, "expected_output", None),
-                            time_seconds=0.0,
-                            task_started_at_ms=eval_result.get("task_started_at_ms"),
-                            scores={m: "N/A" for m in metric_names},
-                            metric_meta={},
-                        )
+                        staged = e
+                    _task_returned(item_id, staged)
+                    if not pipelined and isinstance(staged, _StagedItem):
+                        # Same as _evaluate_item, split so the task's return is seen above.
+                        try:
+                            staged = await self._run_metric_stage(staged, tracker)
+                        except Exception as e:
+                            staged = e
+                    task_stage.finish()
+
+                    if isinstance(staged, _StagedItem):
+                        await task_stage.hand_off(metric_queue, (item_id, staged))
                     else:
-                        result.add_result(item_id, eval_result)
-                        scores = eval_result.get("scores", {})
-                        metric_meta: Dict[str, Dict[str, Any]] = {}
-                        score_row: Dict[str, Any] = {}
-                        for m in metric_names:
-                            sc = scores.get(m)
-                            score_row[m] = _main_score(sc)
-                            if isinstance(sc, dict) and isinstance(sc.get("metadata"), dict):
-                                metric_meta[m] = sc["metadata"]
-                        row = serialize_checkpoint_row(
-                            dataset_name=self.dataset_name,
-                            run_name=self.run_name,
-                            run_metadata=_checkpoint_run_metadata(),
-                            run_config={"max_concurrency": self.max_concurrency, "timeout": self.timeout},
-                            trace_id=eval_result.get("trace_id") or "",
-                            item_id=item_id,
-                            item_input=item.input,
-                            item_metadata=getattr(item, "metadata", {}),
-                            output=eval_result.get("output"),
-                            expected_output=eval_result.get("expected"),
-                            time_seconds=float(eval_result.get("time", 0.0) or 0.0),
-                            task_started_at_ms=eval_result.get("task_started_at_ms"),
-                            scores=score_row,
-                            metric_meta=metric_meta,
-                        )
-
-                    if checkpoint_writer:
-                        await write_queue.put(row)
+                        await _record(item_id, item, staged)
                     work_queue.task_done()
 
-            if pending_entries:
-                for entry in pending_entries:
-                    await work_queue.put(entry)
-            for _ in range(self.max_concurrency):
-                await work_queue.put(None)
-
+            async def _metric_worker():
+                metric_stage = self._stage_stats["metric"]
+                while True:
+                    entry = await metric_queue.get()
+                    if entry is None:
+                        metric_queue.task_done()
+                        break
+                    item_id, staged = entry
+                    metric_stage.start()
+                    try:
+                        eval_result = await self._run_metric_stage(staged, tracker)
+                    except Exception as e:
+                        eval_result = e
+                    metric_stage.finish()
+                    await _record(item_id, staged.item, eval_result)
+                    metric_queue.task_done()
+
+            async def _produce():
+                seen = 0
+                offsets = None
+                if load is not None:
+                    offsets = arrival_offsets(
+                        load.rate,
+                        pattern=load.pattern,
+                        ramp_from=load.ramp_from,
+                        ramp_seconds=load.ramp_seconds,
+                        seed=self.config.load_seed,
+                    )
+                    load.start()
+                try:
+                    for idx, item in item_source:
+                        seen = idx + 1
+                        entry = _pending_entry(idx, item)
+                        if entry is None:
+                            continue
+                        if offsets is not None:
+                            # Send on schedule, however many items are still in flight.
+                            scheduled = next(offsets)
+                            delay = scheduled - load.now()
+                            if delay > 0:
+                                await asyncio.sleep(delay)
+                            send_times[entry[1]] = scheduled
+                            load.record_send(scheduled, capped=load.in_flight >= self.max_concurrency)
+                        await work_queue.put(entry)
+                    if streaming:
+                        tracker.set_total(seen)
+                        self.run_metadata["total_items"] = seen
+                finally:
+                    for _ in range(self.max_concurrency):
+                        await work_queue.put(None)
+
+            producer_task = asyncio.create_task(_produce())
             writer_task = asyncio.create_task(_write_loop()) if checkpoint_writer else None
             worker_tasks = [asyncio.create_task(_worker()) for _ in range(self.max_concurrency)]
+            metric_worker_tasks = [
+                asyncio.create_task(_metric_worker()) for _ in range(metric_workers)
+            ]
 
-            try:
+            async def _run_stages():
                 await asyncio.gather(*worker_tasks)
+                for _ in metric_worker_tasks:
+                    await metric_queue.put(None)
+                await asyncio.gather(*metric_worker_tasks)
+                # Surface dataset errors (e.g. a bad CSV row reached mid-stream).
+                try:
+                    await producer_task
+                except asyncio.CancelledError:
+                    if not stop_event.is_set():
+                        raise
+
+            try:
+                await _run_stages()
             except KeyboardInterrupt:
                 interrupted = True
                 # Stop scheduling new work
+                producer_task.cancel()
+                try:
+                    await producer_task
+                except (asyncio.CancelledError, Exception):
+                    pass
                 while not work_queue.empty():
                     try:
                         work_queue.get_nowait()
@@ -901,13 +1383,19 @@ class Evaluator:
                         break
                 for _ in worker_tasks:
                     await work_queue.put(None)
+                for _ in metric_worker_tasks:
+                    try:
+                        metric_queue.put_nowait(None)
+                    except asyncio.QueueFull:
+                        break
+                all_workers = worker_tasks + metric_worker_tasks
                 try:
                     await asyncio.wait_for(
-                        asyncio.gather(*worker_tasks, return_exceptions=True),
+                        asyncio.gather(*all_workers, return_exceptions=True),
                         timeout=self.config.interrupt_grace_seconds,
                     )
                 except asyncio.TimeoutError:
-                    for task in worker_tasks:
+                    for task in all_workers:
                         task.cancel()
             finally:
                 if writer_task:
@@ -916,6 +1404,33 @@ class Evaluator:
                     await writer_task
                 if checkpoint_writer:
                     checkpoint_writer.close()
+                self.task_adapter.executor = None
+                for executor in (self._task_executor, self._metric_executor):
+                    executor.shutdown(wait=False)
+                if self._task_process_pool is not None:
+                    self.task_adapter.processes = None
+                    self._task_process_pool.close()
+                if self._metric_process_pool is not None:
+                    self._metric_process_pool.shutdown(wait=False, cancel_futures=True)
+                get_rate_limiter_registry().release(self.model_name_full, self.config.rate_limits)
+                if self._task_cache is not None:
+                    self._task_cache.close()
+                if self._metric_cache is not None:
+                    self._metric_cache.close()
+                    result.metric_cache_stats = self._metric_cache.snapshot()
+                if self._single_flight is not None:
+                    result.coalesced_calls = self._single_flight.coalesced
+                if self._recorder is not None:
+                    self._recorder.close()
+                if load is not None:
+                    result.load_test = {**load.summary(), "timeline": load.timeline()}
+                if stop_event.is_set():
+                    result.early_stopped = True
+                    result.early_stop = {
+                        "sample_size": self._early_stopper.items,
+                        "total_items": total_items,
+                        **self._early_stopper.snapshot(),
+                    }
 
             html_update_task.cancel()
             try:
@@ -925,9 +1440,7 @@ class Evaluator:
 
             # Final snapshot
             try:
-                if ui_server is not None:
-                    snap = tracker.get_snapshot()
-                    ui_server.run_state.set_snapshot(snap)
+                publish_snapshot()
             except Exception:
                 pass
 
@@ -944,6 +1457,11 @@ class Evaluator:
             dashboard.shutdown()
         if checkpoint_path:
             result.last_saved_path = checkpoint_path
+            if result.load_test:
+                # The timeline does not fit the per-item run file; keep it next to it.
+                load_path = os.path.splitext(checkpoint_path)[0] + ".load.json"
+                with open(load_path, "w", encoding="utf-8") as f:
+                    json.dump(result.load_test, f, indent=2)
         # Mark evaluation as finished
         result.finish()
 
@@ -991,6 +1509,8 @@ class Evaluator:
         auto_save: bool = False,
         save_format: str = "csv",
         max_parallel_runs: Optional[int] = None,
+        global_concurrency: Optional[int] = None,
+        model_weights: Optional[Dict[str, float]] = None,
     ) -> List[EvaluationResult]:
         """
         Evaluate multiple tasks concurrently from Python code.
@@ -1004,6 +1524,9 @@ class Evaluator:
                 None (default) = all runs in parallel
                 1 = sequential (queue mode)
                 N = run N at a time
+            global_concurrency: Cap on in-flight task calls across all runs,
+                shared by weighted fair queuing (see config.fair_share_weight)
+            model_weights: Relative share of each model under global_concurrency
 
         Note:
             The Web UI is always available at the URL printed at startup.
@@ -1032,6 +1555,8 @@ class Evaluator:
                 auto_save=auto_save,
                 save_format=save_format,
                 max_parallel_runs=max_parallel_runs,
+                global_concurrency=global_concurrency,
+                model_weights=model_weights,
             )
         )
 
@@ -1056,33 +1581,14 @@ class Evaluator:
 
 
 
-    async def _compute_metric(self, metric: Callable, output: Any, expected: Any, input_data: Any = None) -> Any:
+    async def _compute_metric(
+        self, metric: Union[MetricPlan, Callable], output: Any, expected: Any, input_data: Any = None
+    ) -> Any:
         """Compute a metric, handling both sync and async functions."""
-        import inspect
-        
-        # Determine metric signature
-        sig = inspect.signature(metric)
-        params = list(sig.parameters.keys())
-        
-        # Prepare arguments based on metric signature
-        if len(params) == 1:
-            args = (output,)
-        elif len(params) == 2:
-            args = (output, expected)
-        elif len(params) == 3:
-            # For DeepEval metrics that need input_data
-            args = (output, expected, input_data)
-        else:
-            # Try with keyword arguments for flexibility
-            kwargs = {'output': output, 'expected': expected, 'input_data': input_data}
-            filtered_kwargs = {k: v for k, v in kwargs.items() if k in params}
-            args = tuple(filtered_kwargs.values())
-        
-        # Call metric (async or sync)
-        if inspect.iscoroutinefunction(metric):
-            result = await metric(*args)
-        else:
-            result = metric(*args)
+        plan = metric if isinstance(metric, MetricPlan) else compile_metric_plan("", metric)
+        result = plan.call(output, expected, input_data)
+        if plan.is_async:
+            result = await result
         return result
     
     def _get_score_type(self, score: Any) -> str:
@@ -1096,13 +1602,25 @@ class Evaluator:
     
     # Frontend concerns moved to qym.utils.frontend
 
-    def _run_multi_model(self, show_tui: bool, auto_save: bool, save_format: str, max_parallel_runs: Optional[int] = None):
+    def _run_multi_model(
+        self,
+        show_tui: bool,
+        auto_save: bool,
+        save_format: str,
+        max_parallel_runs: Optional[int] = None,
+        *,
+        global_concurrency: Optional[int] = None,
+        model_weights: Optional[Dict[str, float]] = None,
+    ):
         """Kick off multiple model evaluations via the MultiModelRunner helper."""
         runs = []
         base_name = (self.config.run_name or "").strip() or self._task_name
 
         # Create base config dict from Pydantic model
-        base_config_dict = self.config.model_dump(exclude={'models', 'model', 'run_name', 'run_metadata'})
+        # (only fields the user set, so runs can tell defaults from explicit values)
+        base_config_dict = self.config.model_dump(
+            exclude={'models', 'model', 'run_name', 'run_metadata'}, exclude_unset=True
+        )
 
         # Iterate over both stripped and full model names
         for idx, (model_name, model_name_full) in enumerate(zip(self.models, self.models_full), start=1):
@@ -1134,8 +1652,23 @@ class Evaluator:
             auto_save=auto_save,
             save_format=save_format,
             max_parallel_runs=max_parallel_runs,
+            global_concurrency=global_concurrency,
+            model_weights=model_weights,
         )
     
+    def _latency_history(self) -> Dict[str, float]:
+        """Per-item latency of earlier runs of this task/dataset in output_dir."""
+        # Same task/model directories that EvaluationResult saves under.
+        task_dir = _sanitize_path_component(str(self.run_metadata.get("task_name") or "task"))
+        model_dir = _sanitize_path_component(str(self.run_metadata.get("model") or "nomodel"))
+        try:
+            return RunDiscovery(self.config.output_dir).item_latencies(
+                task_dir, self.dataset_name, model_dir
+            )
+        except Exception as e:
+            logger.debug(f"Could not load latency history: {e}")
+            return {}
+
     async def _evaluate_item(self, index: int, item: Any, tracker: "ProgressObserver"):
         """
         Evaluate a single item using fully async Langfuse operations.
@@ -1146,10 +1679,24 @@ class Evaluator:
         3. Using async_api for dataset run item linking
         4. Deferring score uploads to background tasks
         """
+        staged = await self._run_task_stage(index, item, tracker)
+        if not isinstance(staged, _StagedItem):
+            return staged
+        return await self._run_metric_stage(staged, tracker)
+
+    async def _run_task_stage(
+        self, index: int, item: Any, tracker: "ProgressObserver"
+    ) -> Union["_StagedItem", Dict[str, Any]]:
+        """Start an item and run its task.
+
+        Returns a _StagedItem ready for scoring, or the item's error dict if the
+        task failed.
+        """
         meta = {"trace_id": None, "trace_url": None}
         span = None
         # For dashboard display / persistence: when the task execution began (epoch ms).
         task_started_at_ms: Optional[int] = None
+        execution_meta: Dict[str, Any] = {}
 
         try:
             tracker.start_item(index)
@@ -1201,7 +1748,7 @@ class Evaluator:
             # Pass full model name (with provider) to user's task.
             task_started_at_ms = int(time.time() * 1000)
             task_start_time = time.time()
-            output = await self.task_adapter.arun(item.input, span, model_name=self.model_name_full)
+            output = await self._coalesced_task_call(item.input, span, execution_meta)
             task_elapsed_time = time.time() - task_start_time
 
             # Update span with output
@@ -1210,63 +1757,282 @@ class Evaluator:
             except Exception:
                 pass
 
-            # Compute metrics - async where possible
-            scores = {}
-            expected_output = getattr(item, 'expected_output', None)
+            return _StagedItem(
+                index=index,
+                item=item,
+                span=span,
+                meta=meta,
+                output=output,
+                task_started_at_ms=task_started_at_ms,
+                task_elapsed_time=task_elapsed_time,
+                execution_meta=execution_meta,
+            )
+        except Exception as e:
+            return await self._fail_item(
+                index, item, tracker, span, meta, e, task_started_at_ms, execution_meta
+            )
 
-            # Create parent span for all metrics evaluation
-            eval_metrics_span = span.start_span(name="eval_metrics")
+    async def _coalesced_task_call(
+        self, task_input: Any, span: Any, execution_meta: Dict[str, Any]
+    ) -> Any:
+        """Share one in-flight task call between items with identical inputs.
 
-            for m_name, m_func in self.metrics.items():
-                # Create child span for this metric
-                metric_span = eval_metrics_span.start_span(
-                    name=f"metric_{m_name}",
-                    input={"output": output, "expected": expected_output}
+        Items that reused another item's call get ``execution_meta["coalesced"]``;
+        the leader's retries/hedging/cache flags stay on the leader's row.
+        """
+        single_flight = self._single_flight
+        if single_flight is None:
+            return await self._cached_task_call(task_input, span, execution_meta)
+        output, shared = await single_flight.do(
+            input_key(task_input),
+            lambda: self._cached_task_call(task_input, span, execution_meta),
+        )
+        if shared:
+            execution_meta["coalesced"] = True
+        return output
+
+    async def _cached_task_call(
+        self, task_input: Any, span: Any, execution_meta: Dict[str, Any]
+    ) -> Any:
+        """Serve the task output from the task cache, or run the task and cache it.
+
+        Hits set ``execution_meta["cached"]`` so latency stats can skip them.
+        Cache errors (e.g. "database is locked") are logged and never change
+        the item's outcome.
+        """
+        cache = self._task_cache
+        if cache is None:
+            return await self._call_task(task_input, span, execution_meta)
+        key = cache_key(self._task_cache_id, self.model_name_full, task_input)
+        try:
+            found, output = await cache.aget(key)
+        except Exception as e:
+            logger.warning(f"Task cache lookup failed; running the task: {e}")
+            found = False
+        if found:
+            execution_meta["cached"] = True
+            return output
+        output = await self._call_task(task_input, span, execution_meta)
+        try:
+            await cache.aput(key, output)
+        except Exception as e:
+            logger.warning(f"Task cache write failed; output not cached: {e}")
+        return output
+
+    async def _call_task(
+        self, task_input: Any, span: Any, execution_meta: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Run the task for one input, retrying transient failures.
+
+        ``timeout`` bounds the whole call (attempts, backoff and hedges), so an
+        item never holds its worker for longer; each attempt also has its own
+        deadline (``attempt_timeout``). Retry counts, backoff time and whether
+        a hedge won are added to ``execution_meta``.
+        """
+        if self._hedger is not None:
+            def attempt():
+                return self._hedged_attempt(task_input, span, execution_meta)
+        else:
+            def attempt():
+                return self._attempt_task(task_input, span)
+
+        if (
+            not self._retry_policy.max_retries
+            and self._hedger is None
+            and (self.config.attempt_timeout or 0) <= self.timeout
+        ):
+            # A single attempt whose own deadline is within the item's.
+            return await attempt()
+        deadline = _ItemDeadline(self.timeout)
+        # Set before the call is wrapped in a task, so attempts (and hedges) see it.
+        token = _item_deadline.set(deadline)
+        try:
+            call = (
+                call_with_retry(
+                    attempt,
+                    policy=self._retry_policy,
+                    budget=self._retry_budget,
+                    stats=execution_meta,
+                    kind="task",
                 )
-                try:
-                    # Compute metric (async or sync)
-                    if asyncio.iscoroutinefunction(m_func):
-                        score = await self._compute_metric(
-                            m_func, output,
-                            expected_output,
-                            item.input
-                        )
-                    else:
-                        # Run sync metrics in thread pool to avoid blocking
-                        score = await asyncio.to_thread(
-                            self._compute_metric_sync,
-                            m_func, output,
-                            expected_output,
-                            item.input
-                        )
+                if self._retry_policy.max_retries
+                else attempt()
+            )
+            return await _with_item_deadline(call, deadline, lambda: TaskTimeoutError(self.timeout))
+        finally:
+            _item_deadline.reset(token)
+
+    async def _hedged_attempt(
+        self, task_input: Any, span: Any, execution_meta: Optional[Dict[str, Any]]
+    ) -> Any:
+        """Run one attempt, racing a duplicate once it outlives the hedge threshold."""
+        output, from_hedge = await call_hedged(
+            lambda: self._attempt_task(task_input, span), self._hedger
+        )
+        if from_hedge and execution_meta is not None:
+            execution_meta["hedged"] = True
+        return output
+
+    async def _attempt_task(self, task_input: Any, span: Any) -> Any:
+        """Run one task attempt under the per-item deadline.
+
+        Shared rate limits are acquired first (waiting does not count against
+        the deadlines), then a slot of the global fair-share budget when the run
+        is part of one. In adaptive mode the call also holds a slot of the AIMD
+        limiter and reports its latency or error class back to it. With a
+        circuit breaker, the attempt first waits for the model's breaker to
+        admit it and reports whether the endpoint failed.
+        """
+        breaker = self._breaker
+        if breaker is None:
+            return await self._attempt_task_admitted(task_input, span)
+        with _admission_wait():
+            admission = await breaker.acquire()
+        try:
+            output = await self._attempt_task_admitted(task_input, span)
+        except Exception as e:
+            breaker.record(admission, failed=is_endpoint_failure(e))
+            raise
+        except BaseException:
+            breaker.cancel(admission)
+            raise
+        breaker.record(admission, failed=False)
+        return output
+
+    async def _attempt_task_admitted(self, task_input: Any, span: Any) -> Any:
+        """Rate limits and fair-share slot, then the attempt itself."""
+        rate_limiters = self._rate_limiters
+        if rate_limiters:
+            with _admission_wait():
+                await acquire_rate_limits(rate_limiters, estimate_tokens(task_input))
+
+        fair_share = self.fair_share
+        if fair_share is None:
+            return await self._attempt_task_limited(task_input, span)
+        with _admission_wait():
+            await fair_share.acquire()
+        try:
+            return await self._attempt_task_limited(task_input, span)
+        finally:
+            fair_share.release()
+
+    async def _attempt_task_limited(self, task_input: Any, span: Any) -> Any:
+        """The attempt itself: AIMD slot, deadline, latency/token accounting."""
+        rate_limiters = self._rate_limiters
+        limiter = self._concurrency
+        ticket = None
+        if limiter is not None:
+            with _admission_wait():
+                ticket = await limiter.acquire()
+        attempt_timeout = self.config.attempt_timeout or self.timeout
+        started = time.perf_counter()
+        try:
+            if self._batcher is not None:
+                call = self._batcher.submit((task_input, span))
+            else:
+                call = self.task_adapter.arun(task_input, span, model_name=self.model_name_full)
+            output = await _with_deadline(
+                call,
+                attempt_timeout,
+                lambda: TaskTimeoutError(attempt_timeout),
+            )
+        except Exception as e:
+            if self._recorder is not None:
+                self._recorder.record(
+                    task_input, self.model_name_full, time.perf_counter() - started, error=e
+                )
+            if limiter is not None:
+                await limiter.release(ticket, error=e)
+            raise
+        except BaseException:
+            if limiter is not None:
+                await limiter.release(ticket)
+            raise
+        latency = time.perf_counter() - started
+        if self._recorder is not None:
+            self._recorder.record(task_input, self.model_name_full, latency, output=output)
+        if limiter is not None:
+            await limiter.release(ticket, latency=latency)
+        if self._hedger is not None:
+            self._hedger.record_latency(latency)
+
+        if rate_limiters:
+            # Charge completion tokens after the fact so later calls slow down.
+            completion_tokens = estimate_tokens(output)
+            for rate_limiter in rate_limiters:
+                rate_limiter.record_tokens(completion_tokens)
+        return output
+
+    async def _call_task_batch(self, entries: List[Tuple[Any, Any]]) -> List[Any]:
+        """Send one micro-batch of (input, span) pairs to the batch-capable task."""
+        inputs = [task_input for task_input, _ in entries]
+        spans = [span for _, span in entries]
+        return await self.task_adapter.arun_batch(inputs, spans, model_name=self.model_name_full)
+
+    async def _run_metric_stage(self, staged: "_StagedItem", tracker: "ProgressObserver") -> Dict[str, Any]:
+        """Score a staged item, close its trace and publish the results."""
+        index = staged.index
+        item = staged.item
+        span = staged.span
+        meta = staged.meta
+        output = staged.output
 
-                    # Extract main score value
-                    main_val = score
-                    if isinstance(score, dict):
-                        main_val = score.get('score', score)
+        try:
+            # Compute metrics concurrently - an item pays the slowest metric, not the sum
+            expected_output = getattr(item, 'expected_output', None)
 
-                    # Update metric span with result
-                    metric_span.update(output=score)
-                    metric_span.end()
+            # Create parent span for all metrics evaluation
+            eval_metrics_span = span.start_span(name="eval_metrics")
 
-                    # Queue score upload (non-blocking, uses internal queue)
-                    try:
-                        span.score(
-                            name=m_name,
-                            value=main_val if isinstance(main_val, (int, float)) else 0,
-                            comment=str(score) if not isinstance(main_val, (int, float)) else None
-                        )
-                    except Exception:
-                        pass
+            # All metrics of this item share one deadline so a straggling judge
+            # cannot hold the worker past metric_timeout.
+            loop = asyncio.get_running_loop()
+            metric_deadline = (
+                loop.time() + self.metric_timeout if self.metric_timeout else None
+            )
 
-                    scores[m_name] = score
-                except Exception as e:
-                    logger.error(f"Metric {m_name} failed: {e}")
-                    error_tb = traceback.format_exc()
-                    scores[m_name] = {"score": 0, "error": error_tb}
-                    # Update metric span with error
-                    metric_span.update(output={"error": error_tb}, level="ERROR")
-                    metric_span.end()
+            # Look up cached scores first so only misses go to the process pool.
+            cache_lookups = dict(zip(
+                self._metric_plans,
+                await asyncio.gather(*(
+                    self._metric_cache_lookup(m_name, output, expected_output, item.input)
+                    for m_name in self._metric_plans
+                )),
+            ))
+            process_metrics = {
+                m_name: plan
+                for m_name, plan in self._metric_plans.items()
+                if self._runs_in_process(plan) and not cache_lookups[m_name][1]
+            }
+            process_batch = (
+                asyncio.get_running_loop().run_in_executor(
+                    self._metric_process_pool,
+                    compute_metric_batch,
+                    process_metrics,
+                    output,
+                    expected_output,
+                    item.input,
+                )
+                if process_metrics
+                else None
+            )
+
+            metric_scores = await asyncio.gather(*(
+                self._score_metric(
+                    plan,
+                    output=output,
+                    expected=expected_output,
+                    input_data=item.input,
+                    span=span,
+                    parent_span=eval_metrics_span,
+                    deadline=metric_deadline,
+                    execution_meta=staged.execution_meta,
+                    process_batch=process_batch if plan.name in process_metrics else None,
+                    cache_lookup=cache_lookups[plan.name],
+                )
+                for plan in self._metric_plans.values()
+            ))
+            scores = dict(zip(self._metric_plans.keys(), metric_scores))
 
             # End the eval_metrics parent span
             eval_metrics_span.end()
@@ -1278,37 +2044,7 @@ class Evaluator:
                 pass
 
             # Link to Langfuse dataset run item only for Langfuse datasets (even if tracing is enabled for CSV).
-            dataset_item_id = getattr(item, 'id', None)
-            trace_id = meta.get('trace_id')
-            if isinstance(self.dataset, LangfuseDataset) and self.client and dataset_item_id and trace_id:
-                try:
-                    from langfuse.api.resources.dataset_run_items.types import CreateDatasetRunItemRequest
-                    response = await self.client.async_api.dataset_run_items.create(
-                        request=CreateDatasetRunItemRequest(
-                            runName=self.run_name,
-                            runDescription=None,
-                            metadata=self.run_metadata,
-                            datasetItemId=dataset_item_id,
-                            traceId=trace_id,
-                        )
-                    )
-                    # Capture run_id from first successful response for URL building
-                    if self._langfuse_run_id is None and response:
-                        # Try different possible attribute names
-                        run_id = (
-                            getattr(response, 'run_id', None) or
-                            getattr(response, 'runId', None) or
-                            getattr(response, 'dataset_run_id', None) or
-                            getattr(response, 'datasetRunId', None)
-                        )
-                        # Also check if it's in a nested 'run' object
-                        if not run_id and hasattr(response, 'run'):
-                            run_obj = response.run
-                            run_id = getattr(run_obj, 'id', None)
-                        self._langfuse_run_id = run_id
-                        logger.debug(f"Captured Langfuse run_id: {run_id}, response attrs: {dir(response)}")
-                except Exception as e:
-                    logger.debug(f"Failed to link dataset run item: {e}")
+            await self._link_dataset_run_item(item, meta.get('trace_id'), self.run_metadata)
 
             # Update tracker with results
             tracker.update_trace_info(index, meta.get('trace_id'), meta.get('trace_url'))
@@ -1354,6 +2090,7 @@ class Evaluator:
                 result={
                     "output": output,
                     "scores": scores,
+                    "cached": bool(staged.execution_meta.get("cached")),
                 },
             )
 
@@ -1364,79 +2101,444 @@ class Evaluator:
                 "scores": scores,
                 "trace_id": meta.get('trace_id'),
                 "trace_url": meta.get('trace_url'),
-                "time": task_elapsed_time,
-                "task_started_at_ms": task_started_at_ms,
+                "time": staged.task_elapsed_time,
+                "task_started_at_ms": staged.task_started_at_ms,
+                "execution_meta": staged.execution_meta,
                 "success": True,
             }
 
         except Exception as e:
-            # End span on error
-            if span:
-                try:
-                    span.update(output={"error": str(e)}, level="ERROR", status_message=str(e))
-                    span.end()
-                except Exception:
-                    pass
+            return await self._fail_item(
+                index, item, tracker, span, meta, e, staged.task_started_at_ms, staged.execution_meta
+            )
 
-                # Link to dataset run item even on error (Langfuse datasets only)
-                dataset_item_id = getattr(item, 'id', None)
-                trace_id = meta.get('trace_id')
-                if isinstance(self.dataset, LangfuseDataset) and self.client and dataset_item_id and trace_id:
-                    try:
-                        from langfuse.api.resources.dataset_run_items.types import CreateDatasetRunItemRequest
-                        response = await self.client.async_api.dataset_run_items.create(
-                            request=CreateDatasetRunItemRequest(
-                                runName=self.run_name,
-                                runDescription=None,
-                                metadata={**self.run_metadata, "error": str(e)},
-                                datasetItemId=dataset_item_id,
-                                traceId=trace_id,
-                            )
-                        )
-                        # Capture run_id from first successful response for URL building
-                        if self._langfuse_run_id is None and response:
-                            run_id = (
-                                getattr(response, 'run_id', None) or
-                                getattr(response, 'runId', None) or
-                                getattr(response, 'dataset_run_id', None) or
-                                getattr(response, 'datasetRunId', None)
-                            )
-                            if not run_id and hasattr(response, 'run'):
-                                run_obj = response.run
-                                run_id = getattr(run_obj, 'id', None)
-                            self._langfuse_run_id = run_id
-                    except Exception:
-                        pass
+    async def _fail_item(
+        self,
+        index: int,
+        item: Any,
+        tracker: "ProgressObserver",
+        span: Any,
+        meta: Dict[str, Any],
+        error: Exception,
+        task_started_at_ms: Optional[int],
+        execution_meta: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Close the item's trace, record the failure and build its error dict."""
+        # End span on error
+        if span:
+            try:
+                span.update(output={"error": str(error)}, level="ERROR", status_message=str(error))
+                span.end()
+            except Exception:
+                pass
 
-            # Update trace info even on error so Langfuse link appears in dashboard
-            tracker.update_trace_info(index, meta.get('trace_id'), meta.get('trace_url'))
-            tracker.fail_item(index, str(e))
-            self._notify_observer("on_item_error", item_index=index, error=str(e))
-            # Return error info with trace_id so it can be saved to results
-            return {
-                "_error": str(e),
-                "_trace_id": meta.get('trace_id'),
-                "task_started_at_ms": task_started_at_ms,
+            # Link to dataset run item even on error (Langfuse datasets only)
+            await self._link_dataset_run_item(
+                item, meta.get('trace_id'), {**self.run_metadata, "error": str(error)}
+            )
+
+        # Update trace info even on error so Langfuse link appears in dashboard
+        tracker.update_trace_info(index, meta.get('trace_id'), meta.get('trace_url'))
+        if isinstance(error, TaskTimeoutError):
+            tracker.fail_item_timeout(index, error.timeout)
+        else:
+            tracker.fail_item(index, str(error))
+        self._notify_observer("on_item_error", item_index=index, error=str(error))
+        execution_meta = dict(execution_meta or {})
+        if isinstance(error, CircuitOpenError):
+            # Never sent to the model: resume runs the item again.
+            execution_meta["retryable"] = True
+        # Return error info with trace_id so it can be saved to results
+        return {
+            "_error": str(error),
+            "_trace_id": meta.get('trace_id'),
+            "task_started_at_ms": task_started_at_ms,
+            "execution_meta": execution_meta,
+        }
+
+    async def _link_dataset_run_item(self, item: Any, trace_id: Optional[str], metadata: Dict[str, Any]) -> None:
+        """Attach the item's trace to the Langfuse dataset run (Langfuse datasets only)."""
+        dataset_item_id = getattr(item, 'id', None)
+        if not (isinstance(self.dataset, LangfuseDataset) and self.client and dataset_item_id and trace_id):
+            return
+        try:
+            from langfuse.api.resources.dataset_run_items.types import CreateDatasetRunItemRequest
+            response = await self.client.async_api.dataset_run_items.create(
+                request=CreateDatasetRunItemRequest(
+                    runName=self.run_name,
+                    runDescription=None,
+                    metadata=metadata,
+                    datasetItemId=dataset_item_id,
+                    traceId=trace_id,
+                )
+            )
+            # Capture run_id from first successful response for URL building
+            if self._langfuse_run_id is None and response:
+                # Try different possible attribute names
+                run_id = (
+                    getattr(response, 'run_id', None) or
+                    getattr(response, 'runId', None) or
+                    getattr(response, 'dataset_run_id', None) or
+                    getattr(response, 'datasetRunId', None)
+                )
+                # Also check if it's in a nested 'run' object
+                if not run_id and hasattr(response, 'run'):
+                    run_obj = response.run
+                    run_id = getattr(run_obj, 'id', None)
+                self._langfuse_run_id = run_id
+                logger.debug(f"Captured Langfuse run_id: {run_id}, response attrs: {dir(response)}")
+        except Exception as e:
+            logger.debug(f"Failed to link dataset run item: {e}")
+
+    def _run_stats(self) -> Dict[str, Any]:
+        """Live scheduling stats for the dashboard and UI snapshot."""
+        stats: Dict[str, Any] = {
+            "stages": {name: stage.snapshot() for name, stage in self._stage_stats.items()},
+        }
+        if self._concurrency is not None:
+            stats["concurrency"] = self._concurrency.snapshot()
+        if self._rate_limiters:
+            stats["rate_limits"] = {lim.key: lim.snapshot() for lim in self._rate_limiters}
+        if self._retry_budget is not None:
+            stats["retries"] = self._retry_budget.snapshot()
+        if self._hedger is not None:
+            stats["hedging"] = self._hedger.snapshot()
+        if self._batcher is not None:
+            stats["batching"] = self._batcher.snapshot()
+        if self._task_cache is not None:
+            stats["task_cache"] = self._task_cache.snapshot()
+        if self._metric_cache is not None:
+            stats["metric_cache"] = self._metric_cache.snapshot()
+        if self._single_flight is not None:
+            stats["coalescing"] = self._single_flight.snapshot()
+        if self._load is not None:
+            stats["load"] = self._load.snapshot()
+        if self._recorder is not None:
+            stats["recording"] = {"path": self._recorder.path, "records": self._recorder.records}
+        if self.fair_share is not None:
+            stats["fair_share"] = self.fair_share.scheduler.snapshot()
+        if self._breaker is not None:
+            stats["circuit_breaker"] = self._breaker.snapshot()
+        if self._schedule_stats:
+            stats["schedule"] = dict(self._schedule_stats)
+        if self._early_stopper is not None:
+            stats["early_stop"] = self._early_stopper.snapshot()
+        if self._metric_batchers:
+            stats["metric_batching"] = {
+                name: batcher.snapshot() for name, batcher in self._metric_batchers.items()
             }
+        executors = {
+            name: executor.snapshot()
+            for name, executor in (
+                ("task_threads", self._task_executor),
+                ("task_processes", self._task_process_pool),
+                ("metric_threads", self._metric_executor),
+                ("metric_processes", self._metric_process_pool),
+            )
+            if executor is not None
+        }
+        if executors:
+            stats["executors"] = executors
+        return stats
 
-    def _compute_metric_sync(self, metric_func: Callable, output: Any, expected: Any, input_data: Any) -> Any:
-        """Synchronous version of metric computation for thread pool execution."""
+    async def _score_metric(
+        self,
+        plan: MetricPlan,
+        *,
+        output: Any,
+        expected: Any,
+        input_data: Any,
+        span: Any,
+        parent_span: Any,
+        deadline: Optional[float],
+        execution_meta: Optional[Dict[str, Any]] = None,
+        process_batch: Optional["asyncio.Future"] = None,
+        cache_lookup: Optional[Tuple[Optional[str], bool, Any]] = None,
+    ) -> Any:
+        """Compute one metric for an item in its own span.
+
+        Errors are isolated to the metric: they become ``{"score": 0, "error": ...}``
+        and never fail the item. ``process_batch`` is the item's process-pool job
+        when this metric is computed there; ``cache_lookup`` is the result of
+        :meth:`_metric_cache_lookup` when the caller already did it.
+        """
+        m_name = plan.name
+        # Create child span for this metric
+        metric_span = parent_span.start_span(
+            name=f"metric_{m_name}",
+            input={"output": output, "expected": expected}
+        )
         try:
-            sig = inspect.signature(metric_func)
-            params = list(sig.parameters.keys())
-
-            if len(params) >= 3:
-                return metric_func(output, expected, input_data)
-            elif len(params) == 2:
-                return metric_func(output, expected)
-            elif len(params) == 1:
-                return metric_func(output)
-            else:
-                return metric_func()
+            def _metric_call():
+                # Compute metric (async or sync)
+                if plan.is_batch:
+                    return self._metric_batchers[m_name].submit((output, expected, input_data))
+                if plan.is_async:
+                    return self._compute_metric(plan, output, expected, input_data)
+                if process_batch is not None:
+                    return self._await_process_metric(
+                        process_batch, plan, output, expected, input_data
+                    )
+                return self._run_metric_in_thread(plan, output, expected, input_data)
+
+            if cache_lookup is None:
+                cache_lookup = await self._metric_cache_lookup(m_name, output, expected, input_data)
+            key, found, score = cache_lookup
+            store = False
+            if not found:
+                remaining = None
+                if deadline is not None:
+                    remaining = max(0.0, deadline - asyncio.get_running_loop().time())
+                if plan.is_async and self._retry_policy.max_retries:
+                    # Async metrics usually call a judge model: retry transient failures
+                    # (backoff happens outside the per-metric concurrency cap).
+                    metric_call = call_with_retry(
+                        lambda: self._limit_metric(m_name, _metric_call),
+                        policy=self._retry_policy,
+                        budget=self._retry_budget,
+                        stats=execution_meta,
+                        kind="metric",
+                    )
+                else:
+                    metric_call = self._limit_metric(m_name, _metric_call)
+                score = await _with_deadline(
+                    metric_call,
+                    remaining,
+                    lambda: MetricTimeoutError(self.metric_timeout),
+                )
+                store = key is not None and not (isinstance(score, dict) and "error" in score)
+
+            # Extract main score value
+            main_val = score
+            if isinstance(score, dict):
+                main_val = score.get('score', score)
+
+            # Update metric span with result
+            metric_span.update(output=score)
+            metric_span.end()
+
+            # Queue score upload (non-blocking, uses internal queue)
+            try:
+                span.score(
+                    name=m_name,
+                    value=main_val if isinstance(main_val, (int, float)) else 0,
+                    comment=str(score) if not isinstance(main_val, (int, float)) else None
+                )
+            except Exception:
+                pass
         except Exception as e:
+            logger.error(f"Metric {m_name} failed: {e}")
             error_tb = traceback.format_exc()
-            logger.error(f"Metric {getattr(metric_func, '__name__', 'unknown')} failed: {error_tb}")
-            return {"score": 0, "error": str(e), "traceback": error_tb}
+            # Update metric span with error
+            metric_span.update(output={"error": error_tb}, level="ERROR")
+            metric_span.end()
+            return {"score": 0, "error": error_tb}
+
+        # Outside the scoring try: a failed cache write must not turn a score into an error.
+        if store:
+            try:
+                await self._metric_cache.aput(m_name, key, score)
+            except Exception as e:
+                logger.warning(f"Metric cache write for {m_name} failed; score not cached: {e}")
+        return score
+
+    async def _metric_cache_lookup(
+        self, m_name: str, output: Any, expected: Any, input_data: Any
+    ) -> Tuple[Optional[str], bool, Any]:
+        """(cache key, found, score) for a metric; key is None when it is not cached.
+
+        Lookup errors are logged and count as a miss.
+        """
+        cache = self._metric_cache
+        if cache is None or m_name not in self._metric_cache_ids:
+            return None, False, None
+        key = metric_cache_key(m_name, self._metric_cache_ids[m_name], output, expected, input_data)
+        try:
+            found, score = await cache.aget(m_name, key)
+        except Exception as e:
+            logger.warning(f"Metric cache lookup for {m_name} failed; scoring it: {e}")
+            return key, False, None
+        return key, found, score
+
+    def _run_metric_in_thread(
+        self, plan: MetricPlan, output: Any, expected: Any, input_data: Any
+    ) -> "asyncio.Future":
+        """Run a sync metric in the metric thread pool to avoid blocking.
+
+        The context is copied like asyncio.to_thread does (for tracing). In
+        process mode, unmarked metrics are profiled until their CPU use is known.
+        """
+        call = functools.partial(self._compute_metric_sync, plan, output, expected, input_data)
+        profiler = self._cpu_profiler
+        if profiler is not None and plan.executor != "process" and not profiler.is_decided(plan.name):
+            call = functools.partial(profiler.measure, plan.name, call)
+        ctx = contextvars.copy_context()
+        return asyncio.get_running_loop().run_in_executor(
+            self._metric_executor, functools.partial(ctx.run, call)
+        )
+
+    def _runs_in_process(self, plan: MetricPlan) -> bool:
+        """Whether a metric should be computed in the metric process pool."""
+        if self._metric_process_pool is None or plan.name in self._process_fallback:
+            return False
+        if plan.executor in ("async", "batch"):
+            return False
+        if plan.executor == "process":
+            return True
+        return self._cpu_profiler is not None and self._cpu_profiler.is_cpu_bound(plan.name)
+
+    async def _call_metric_batch(
+        self, plan: MetricPlan, entries: List[Tuple[Any, Any, Any]]
+    ) -> List[Any]:
+        """Score one batch of (output, expected, input_data) with a vectorized metric."""
+        outputs, expecteds, inputs = (list(column) for column in zip(*entries))
+        if plan.is_async:
+            return await plan.call(outputs, expecteds, inputs)
+        ctx = contextvars.copy_context()
+        call = functools.partial(plan.call, outputs, expecteds, inputs)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._metric_executor, functools.partial(ctx.run, call)
+        )
+
+    async def _await_process_metric(
+        self,
+        process_batch: "asyncio.Future",
+        plan: MetricPlan,
+        output: Any,
+        expected: Any,
+        input_data: Any,
+    ) -> Any:
+        """Take this metric's result from the item's process-pool job."""
+        try:
+            # Shielded: the job is shared by all CPU-bound metrics of the item.
+            results = await asyncio.shield(process_batch)
+        except Exception as e:
+            # Metric errors are caught inside the job, so this is the pool itself
+            # (unpicklable metric/arguments, dead worker): fall back to threads.
+            if plan.name not in self._process_fallback:
+                logger.warning(f"Metric {plan.name} cannot run in a process ({e}); using threads")
+                self._process_fallback.add(plan.name)
+            return await self._run_metric_in_thread(plan, output, expected, input_data)
+        return results[plan.name]
+
+    async def _limit_metric(self, m_name: str, make_call: Callable[[], Any]) -> Any:
+        """Run a metric call under its per-metric concurrency cap, if configured."""
+        limit = (self.config.metric_concurrency_limits or {}).get(m_name)
+        if not limit or limit < 1:
+            return await make_call()
+        sem = self._metric_semaphores.get(m_name)
+        if sem is None:
+            sem = asyncio.Semaphore(int(limit))
+            self._metric_semaphores[m_name] = sem
+        async with sem:
+            return await make_call()
+
+    def _compute_metric_sync(
+        self, metric_func: Union[MetricPlan, Callable], output: Any, expected: Any, input_data: Any
+    ) -> Any:
+        """Synchronous version of metric computation for thread pool execution."""
+        return compute_metric_sync(metric_func, output, expected, input_data)
+
+
+class _ItemDeadline:
+    """Deadline of one item's task call (all attempts, backoff and hedges).
+
+    The clock is stopped while the item waits for admission (rate limits,
+    fair-share and AIMD slots, a paused circuit breaker): those waits are
+    throttling, not the task being slow. Waits can overlap when a hedge is
+    admitted next to its primary, so they are counted.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.expires = asyncio.get_running_loop().time() + timeout
+        self.waiting_since: Optional[float] = None
+        self._waits = 0
+
+    def remaining(self) -> float:
+        now = self.waiting_since
+        if now is None:
+            now = asyncio.get_running_loop().time()
+        return self.expires - now
+
+    def begin_wait(self) -> None:
+        if not self._waits:
+            self.waiting_since = asyncio.get_running_loop().time()
+        self._waits += 1
+
+    def end_wait(self) -> None:
+        self._waits -= 1
+        if not self._waits and self.waiting_since is not None:
+            self.expires += asyncio.get_running_loop().time() - self.waiting_since
+            self.waiting_since = None
+
+
+_item_deadline: contextvars.ContextVar[Optional[_ItemDeadline]] = contextvars.ContextVar(
+    "qym_item_deadline", default=None
+)
+
+
+@contextmanager
+def _admission_wait() -> Iterator[None]:
+    """Stop the current item's deadline while waiting for admission."""
+    deadline = _item_deadline.get()
+    if deadline is None:
+        yield
+        return
+    deadline.begin_wait()
+    try:
+        yield
+    finally:
+        deadline.end_wait()
+
+
+async def _with_item_deadline(
+    aw: Any, deadline: _ItemDeadline, on_timeout: Callable[[], BaseException]
+) -> Any:
+    """Like :func:`_with_deadline`, for a deadline that stops during admission waits.
+
+    While a wait is open :meth:`_ItemDeadline.remaining` stays frozen, so the
+    watchdog keeps sleeping instead of expiring the item.
+    """
+    fut = asyncio.ensure_future(aw)
+    try:
+        while not fut.done():
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                fut.cancel()
+                raise on_timeout()
+            await asyncio.wait({fut}, timeout=remaining)
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    return fut.result()
+
+
+async def _with_deadline(
+    aw: Any,
+    timeout: Optional[float],
+    on_timeout: Callable[[], BaseException],
+) -> Any:
+    """Await ``aw`` for at most ``timeout`` seconds.
+
+    On expiry the awaitable is cancelled and ``on_timeout()`` is raised. Work
+    running in an executor thread cannot be interrupted, so its future is
+    abandoned and the thread finishes in the background.
+    """
+    if timeout is None:
+        return await aw
+    fut = asyncio.ensure_future(aw)
+    if timeout <= 0 and not fut.done():
+        fut.cancel()
+        raise on_timeout()
+    try:
+        done, _ = await asyncio.wait({fut}, timeout=timeout)
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    if not done:
+        fut.cancel()
+        raise on_timeout()
+    return fut.result()
 
 
 def _announce_saved_results(results: Sequence[EvaluationResult], *, include_run_name: bool) -> None:
@@ -0,0 +1,414 @@
+"""Sized, instrumented executors for sync tasks and metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import pickle
+import signal
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .metric_plan import MetricPlan, compile_metric_plan
+from ..utils.errors import TaskExecutionError, status_code_of
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """ThreadPoolExecutor that tracks queued/active/completed work for the dashboard."""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str = "") -> None:
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self.size = max_workers
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self._stats_lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        with self._stats_lock:
+            self.queued += 1
+
+        def _run() -> Any:
+            with self._stats_lock:
+                self.queued -= 1
+                self.active += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._stats_lock:
+                    self.active -= 1
+                    self.completed += 1
+
+        try:
+            return super().submit(_run)
+        except Exception:
+            with self._stats_lock:
+                self.queued -= 1
+            raise
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "size": self.size,
+                "active": self.active,
+                "queued": self.queued,
+                "completed": self.completed,
+                "utilization": round(self.active / self.size, 3) if self.size else 0.0,
+            }
+
+
+class InstrumentedProcessPoolExecutor(ProcessPoolExecutor):
+    """ProcessPoolExecutor that tracks in-flight/completed jobs for the dashboard."""
+
+    def __init__(self, max_workers: int) -> None:
+        super().__init__(max_workers=max_workers)
+        self.size = max_workers
+        self.in_flight = 0
+        self.completed = 0
+        self._stats_lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future = super().submit(fn, *args, **kwargs)
+        with self._stats_lock:
+            self.in_flight += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _on_done(self, _future: Future) -> None:
+        with self._stats_lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "size": self.size,
+                "active": min(self.in_flight, self.size),
+                "queued": max(0, self.in_flight - self.size),
+                "completed": self.completed,
+                "utilization": round(min(self.in_flight, self.size) / self.size, 3) if self.size else 0.0,
+            }
+
+
+def compute_metric_sync(
+    metric: Union[MetricPlan, Callable], output: Any, expected: Any, input_data: Any
+) -> Any:
+    """Call a sync metric through its plan (compiled here if given a bare callable).
+
+    Errors become ``{"score": 0, "error": ..., "traceback": ...}``.
+    """
+    plan = metric if isinstance(metric, MetricPlan) else compile_metric_plan("", metric)
+    try:
+        return plan.call(output, expected, input_data)
+    except Exception as e:
+        error_tb = traceback.format_exc()
+        logger.error(f"Metric {plan.name or getattr(plan.func, '__name__', 'unknown')} failed: {error_tb}")
+        return {"score": 0, "error": str(e), "traceback": error_tb}
+
+
+def compute_metric_batch(
+    metrics: Dict[str, Union[MetricPlan, Callable]], output: Any, expected: Any, input_data: Any
+) -> Dict[str, Any]:
+    """Process-pool entry point: every CPU-bound metric of one item.
+
+    Sending all of an item's CPU-bound metrics in one job pickles the
+    (possibly large) output/expected/input once per item, not once per metric.
+    """
+    return {
+        name: compute_metric_sync(metric, output, expected, input_data)
+        for name, metric in metrics.items()
+    }
+
+
+class CpuProfiler:
+    """Detect CPU-bound sync metrics from the CPU time they burn in worker threads.
+
+    A metric is considered CPU-bound after ``min_samples`` calls whose average
+    thread CPU time is at least ``min_cpu_seconds`` and at least
+    ``min_cpu_ratio`` of their wall time (i.e. mostly computing, not waiting on
+    I/O; GIL contention lowers the ratio, hence the lenient default).
+    """
+
+    def __init__(
+        self,
+        *,
+        min_samples: int = 3,
+        min_cpu_seconds: float = 0.005,
+        min_cpu_ratio: float = 0.5,
+    ) -> None:
+        self.min_samples = min_samples
+        self.min_cpu_seconds = min_cpu_seconds
+        self.min_cpu_ratio = min_cpu_ratio
+        self._samples: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def measure(self, name: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` in the current (worker) thread and record its CPU time."""
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            cpu = time.thread_time() - cpu_start
+            wall = time.perf_counter() - wall_start
+            with self._lock:
+                totals = self._samples.setdefault(name, [0, 0.0, 0.0])
+                totals[0] += 1
+                totals[1] += cpu
+                totals[2] += wall
+
+    def is_decided(self, name: str) -> bool:
+        with self._lock:
+            totals = self._samples.get(name)
+            return bool(totals and totals[0] >= self.min_samples)
+
+    def is_cpu_bound(self, name: str) -> bool:
+        with self._lock:
+            totals = list(self._samples.get(name) or [0, 0.0, 0.0])
+        count, cpu, wall = totals
+        if count < self.min_samples:
+            return False
+        return cpu / count >= self.min_cpu_seconds and cpu >= self.min_cpu_ratio * wall
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        import resource
+
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except (OSError, ImportError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return int(peak if sys.platform == "darwin" else peak * 1024)
+    except (ImportError, OSError):
+        return 0
+
+
+def _task_worker_main(conn: Any, task_ref: Tuple[str, Any]) -> None:
+    """Task subprocess: answer pickled ``(args, kwargs)`` requests until an empty one.
+
+    Replies are pickled ``(ok, payload, rss_bytes, detail, status_code)``. The
+    output or exception is pickled separately into ``payload``, so the parent
+    can still read the reply when it cannot load the value; ``detail`` (the
+    exception's repr) and ``status_code`` describe a failure for that case.
+    """
+    from .sharding import _resolve
+
+    # The parent decides when work stops (Ctrl+C, deadlines, recycling).
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    task = _resolve(task_ref)
+    while True:
+        try:
+            request = conn.recv_bytes()
+        except (EOFError, OSError):
+            return
+        if not request:
+            return
+        try:
+            args, kwargs = pickle.loads(request)
+            reply: Tuple[bool, Any] = (True, task(*args, **kwargs))
+        except Exception as e:
+            reply = (False, e)
+        ok, value = reply
+        detail = type(value).__name__ if ok else repr(value)
+        status = None if ok else status_code_of(value)
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # Unpicklable output or exception: send its description instead.
+            what = "output" if ok else "error"
+            ok = False
+            payload = pickle.dumps(
+                f"Task {what} cannot be sent back from the worker process ({e}); {detail}",
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        conn.send_bytes(
+            pickle.dumps((ok, payload, _rss_bytes(), detail, status), protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+
+def _load_reply(reply: bytes) -> Tuple[bool, Any, int]:
+    """Decode a worker reply into ``(ok, output_or_error, rss_bytes)``.
+
+    Values that do not load in the parent (e.g. provider exceptions with
+    keyword-only ``__init__`` arguments) become a :class:`TaskExecutionError`
+    carrying the child's description and status code, so the failure is
+    still classified for retries, AIMD and the circuit breaker.
+    """
+    ok, payload, rss, detail, status = pickle.loads(reply)
+    try:
+        value = pickle.loads(payload)
+    except Exception as e:
+        what = "output" if ok else "error"
+        value = f"Task {what} cannot be loaded from the worker process ({type(e).__name__}: {e}); {detail}"
+        ok = False
+    if not ok and not isinstance(value, BaseException):
+        error = TaskExecutionError(value)
+        if status is not None:
+            error.status_code = status
+        value = error
+    return ok, value, rss
+
+
+class _TaskWorker:
+    def __init__(self, ctx: Any, task_ref: Tuple[str, Any]) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_task_worker_main, args=(child_conn, task_ref), name="qym-task-worker", daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+
+    def call(self, request: bytes) -> bytes:
+        """Blocking round trip; raises EOFError once the process is gone."""
+        try:
+            self.conn.send_bytes(request)
+            return self.conn.recv_bytes()
+        except BaseException:
+            self.conn.close()
+            raise
+
+    def stop(self) -> None:
+        try:
+            self.conn.send_bytes(b"")
+        except (OSError, ValueError):
+            pass
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+
+
+class IsolatedTaskPool:
+    """Run a sync task function in worker subprocesses that can be killed.
+
+    Each worker handles one call at a time over a pipe (pickled arguments in,
+    pickled output or exception out). A call cancelled by the item deadline
+    kills its worker, so a wedged C extension or a socket read without a
+    timeout cannot hold on to a thread for the rest of the run. Workers are
+    started on demand, up to ``size``, and replaced after ``max_items`` calls
+    or once their RSS exceeds ``max_rss_mb``. Exceptions raised by the task
+    are re-raised in the parent (as :class:`TaskExecutionError` with the
+    child's description when they cannot be unpickled); a worker that dies
+    mid-call raises :class:`TaskExecutionError`.
+    """
+
+    def __init__(
+        self,
+        task: Callable[..., Any],
+        *,
+        size: int,
+        max_items: Optional[int] = None,
+        max_rss_mb: Optional[float] = None,
+    ) -> None:
+        from .sharding import _portable
+
+        self._task_ref = _portable(task)
+        self.size = max(1, int(size))
+        self.max_items = max_items
+        self.max_rss_bytes = int(max_rss_mb * 1024 * 1024) if max_rss_mb else None
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: List[_TaskWorker] = []
+        self._workers: List[_TaskWorker] = []
+        self._slots = asyncio.Semaphore(self.size)
+        # Round trips block on the pipe; a killed worker unblocks its thread.
+        self._threads = ThreadPoolExecutor(self.size, thread_name_prefix="qym-task-ipc")
+        self.active = 0
+        self.completed = 0
+        self.started = 0
+        self.recycled = 0
+        self.killed = 0
+        self.crashed = 0
+
+    async def call(self, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        request = pickle.dumps((args, kwargs), protocol=pickle.HIGHEST_PROTOCOL)
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else await loop.run_in_executor(self._threads, self._start)
+            self.active += 1
+            try:
+                reply = await loop.run_in_executor(self._threads, worker.call, request)
+            except asyncio.CancelledError:
+                self._retire(worker, kill=True)
+                self.killed += 1
+                raise
+            except (EOFError, OSError):
+                self._retire(worker, kill=True)
+                worker.process.join(1.0)  # already gone; collect the exit code
+                self.crashed += 1
+                raise TaskExecutionError(
+                    f"Task worker process died (exit code {worker.process.exitcode})"
+                ) from None
+            finally:
+                self.active -= 1
+            rss = 0
+            try:
+                ok, value, rss = _load_reply(reply)
+            finally:
+                # The round trip finished, so the worker is free whatever the reply held.
+                self.completed += 1
+                worker.calls += 1
+                if (self.max_items and worker.calls >= self.max_items) or (
+                    self.max_rss_bytes and rss > self.max_rss_bytes
+                ):
+                    self._retire(worker)
+                    self.recycled += 1
+                else:
+                    self._idle.append(worker)
+        if ok:
+            return value
+        raise value
+
+    def _start(self) -> _TaskWorker:
+        worker = _TaskWorker(self._ctx, self._task_ref)
+        self._workers.append(worker)
+        self.started += 1
+        return worker
+
+    def _retire(self, worker: _TaskWorker, *, kill: bool = False) -> None:
+        if kill:
+            worker.kill()
+        else:
+            worker.stop()
+        # Reap exited workers so they do not linger as zombies.
+        for done in [w for w in self._workers if w is not worker and not w.process.is_alive()]:
+            done.process.join(0)
+            self._workers.remove(done)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Stop idle workers, kill the rest after ``timeout`` seconds."""
+        for worker in self._idle:
+            worker.stop()
+        self._idle.clear()
+        deadline = time.monotonic() + timeout
+        for worker in self._workers:
+            worker.process.join(max(0.0, deadline - time.monotonic()))
+            worker.kill()
+            worker.process.join(0.1)
+        self._workers.clear()
+        self._threads.shutdown(wait=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "active": self.active,
+            "workers": sum(1 for w in self._workers if w.process.is_alive()),
+            "completed": self.completed,
+            "started": self.started,
+            "recycled": self.recycled,
+            "killed": self.killed,
+            "crashed": self.crashed,
+        }
@@ -0,0 +1,171 @@
+"""Global concurrency budget shared fairly by the runs of a MultiModelRunner."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+
+class _Flow:
+    """Weighted share of the budget (one per run, one per model)."""
+
+    def __init__(self, weight: float) -> None:
+        self.weight = max(float(weight), 1e-6)
+        self.vtime = 0.0
+        self.in_flight = 0
+        self.granted = 0
+
+    def charge(self) -> None:
+        self.vtime += 1.0 / self.weight
+        self.granted += 1
+
+
+class FairShareScheduler:
+    """Hand out ``capacity`` task slots across runs with weighted fair queuing.
+
+    When slots are contended the next one goes first to the model with the
+    least weighted service so far, then to that model's run with the least
+    weighted service, so a model with weight 2 gets twice the slots of a model
+    with weight 1 and runs of one model split its share by their own weights.
+    A flow that was idle rejoins at the current virtual time of the busy ones
+    instead of cashing in saved-up credit. Runs only compete while they have
+    calls waiting, so when a run finishes (or is between items) its share goes
+    to the runs still working.
+    """
+
+    def __init__(self, capacity: int, *, model_weights: Optional[Dict[str, float]] = None) -> None:
+        self.capacity = max(1, int(capacity))
+        self.model_weights = dict(model_weights or {})
+        self.in_flight = 0
+        self._runs: Dict[str, _Flow] = {}
+        self._models: Dict[str, _Flow] = {}
+        self._run_model: Dict[str, str] = {}
+        self._waiters: Dict[str, Deque["asyncio.Future"]] = {}
+
+    def register(self, run_id: str, *, model: Optional[str] = None, weight: float = 1.0) -> "FairShareFlow":
+        """Add a run (weighted by ``weight``) under ``model``; returns its handle.
+
+        Runs without a model share one group, so only their own weights count.
+        """
+        model_key = model or ""
+        self._runs[run_id] = _Flow(weight)
+        self._run_model[run_id] = model_key
+        self._waiters[run_id] = deque()
+        if model_key not in self._models:
+            self._models[model_key] = _Flow(self.model_weights.get(model_key, 1.0))
+        return FairShareFlow(self, run_id)
+
+    def unregister(self, run_id: str) -> None:
+        for future in self._waiters.pop(run_id, ()):
+            future.cancel()
+        self._runs.pop(run_id, None)
+        model_key = self._run_model.pop(run_id, None)
+        if model_key is not None and model_key not in self._run_model.values():
+            self._models.pop(model_key, None)
+        self._dispatch()
+
+    def _waiting(self, run_id: str) -> bool:
+        return any(not f.done() for f in self._waiters.get(run_id, ()))
+
+    def _model_waiting(self, model_key: str) -> bool:
+        return any(self._waiting(r) for r, m in self._run_model.items() if m == model_key)
+
+    def _activate(self, flow: _Flow, busy: List[_Flow]) -> None:
+        if busy:
+            flow.vtime = max(flow.vtime, min(peer.vtime for peer in busy))
+
+    async def acquire(self, run_id: str) -> None:
+        waiting_runs = [r for r in self._runs if self._waiting(r)]
+        if self.in_flight < self.capacity and not waiting_runs:
+            self._grant(run_id)
+            return
+        model_key = self._run_model[run_id]
+        if run_id not in waiting_runs:
+            self._activate(
+                self._runs[run_id],
+                [self._runs[r] for r in waiting_runs if self._run_model[r] == model_key],
+            )
+            if not self._model_waiting(model_key):
+                busy_models = {self._run_model[r] for r in waiting_runs}
+                self._activate(self._models[model_key], [self._models[m] for m in busy_models])
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[run_id].append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller was cancelled: hand the slot back.
+                self.release(run_id)
+            raise
+
+    def release(self, run_id: str) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        run = self._runs.get(run_id)
+        if run is not None:
+            run.in_flight = max(0, run.in_flight - 1)
+            self._models[self._run_model[run_id]].in_flight -= 1
+        self._dispatch()
+
+    def _grant(self, run_id: str) -> None:
+        self.in_flight += 1
+        run = self._runs[run_id]
+        model = self._models[self._run_model[run_id]]
+        run.in_flight += 1
+        model.in_flight += 1
+        run.charge()
+        model.charge()
+
+    def _dispatch(self) -> None:
+        while self.in_flight < self.capacity:
+            waiting_runs = [r for r in self._runs if self._waiting(r)]
+            if not waiting_runs:
+                return
+            model_key = min(
+                {self._run_model[r] for r in waiting_runs},
+                key=lambda m: self._models[m].vtime,
+            )
+            run_id = min(
+                (r for r in waiting_runs if self._run_model[r] == model_key),
+                key=lambda r: self._runs[r].vtime,
+            )
+            queue = self._waiters[run_id]
+            while queue and queue[0].done():
+                queue.popleft()
+            future = queue.popleft()
+            self._grant(run_id)
+            future.set_result(None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "runs": {
+                run_id: {
+                    "weight": flow.weight,
+                    "model": self._run_model[run_id],
+                    "in_flight": flow.in_flight,
+                    "granted": flow.granted,
+                    "waiting": sum(1 for f in self._waiters[run_id] if not f.done()),
+                }
+                for run_id, flow in self._runs.items()
+            },
+            "models": {
+                model_key: {"weight": flow.weight, "in_flight": flow.in_flight, "granted": flow.granted}
+                for model_key, flow in self._models.items()
+            },
+        }
+
+
+class FairShareFlow:
+    """One run's handle on a :class:`FairShareScheduler`."""
+
+    def __init__(self, scheduler: FairShareScheduler, run_id: str) -> None:
+        self.scheduler = scheduler
+        self.run_id = run_id
+
+    async def acquire(self) -> None:
+        await self.scheduler.acquire(self.run_id)
+
+    def release(self) -> None:
+        self.scheduler.release(self.run_id)
@@ -0,0 +1,99 @@
+"""Hedged task calls: race a duplicate against a straggler."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+
+class Hedger:
+    """Decides when to hedge and caps the extra load hedges add.
+
+    A hedge fires once a call has been running longer than ``percentile`` of
+    the task latencies seen so far in the run (after ``min_samples``
+    successes). At most ``max_extra`` hedges are started per primary call,
+    e.g. 0.05 = at most 5% extra requests.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        *,
+        max_extra: float = 0.05,
+        min_samples: int = 20,
+        window: int = 1000,
+    ) -> None:
+        self.percentile = percentile
+        self.max_extra = max_extra
+        self.min_samples = min_samples
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def record_latency(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None while there is too little history."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        rank = max(0, min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1))
+        return ordered[rank]
+
+    def try_spend(self) -> bool:
+        if self.hedges + 1 > self.max_extra * self.calls:
+            return False
+        self.hedges += 1
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        threshold = self.delay()
+        return {
+            "threshold_s": round(threshold, 3) if threshold is not None else None,
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+async def call_hedged(
+    make_call: Callable[[], Awaitable[Any]],
+    hedger: Hedger,
+) -> Tuple[Any, bool]:
+    """Await ``make_call()``, racing a duplicate if it outlives the hedge delay.
+
+    Returns ``(result, from_hedge)``. The first successful call wins and the
+    other is cancelled; if both fail, the primary's error is raised.
+    """
+    hedger.calls += 1
+    primary = asyncio.ensure_future(make_call())
+    delay = hedger.delay()
+    try:
+        if delay is None:
+            return await primary, False
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not hedger.try_spend():
+            return await primary, False
+
+        backup = asyncio.ensure_future(make_call())
+        try:
+            pending = {primary, backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for winner in (primary, backup):
+                    if winner in done and not winner.cancelled() and winner.exception() is None:
+                        from_hedge = winner is backup
+                        if from_hedge:
+                            hedger.hedge_wins += 1
+                        return winner.result(), from_hedge
+            return await primary, False
+        finally:
+            if not backup.done():
+                backup.cancel()
+    finally:
+        if not primary.done():
+            primary.cancel()
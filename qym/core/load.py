@@ -0,0 +1,210 @@
+"""Open-loop load generation: send items at a target rate and track the timeline."""
+
+from __future__ import annotations
+
+import math
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+def arrival_offsets(
+    rate: float,
+    *,
+    pattern: str = "constant",
+    ramp_from: float = 0.0,
+    ramp_seconds: float = 60.0,
+    seed: Optional[int] = None,
+) -> Iterator[float]:
+    """Send times (seconds from the start) of successive items.
+
+    ``constant`` spaces items 1/rate apart, ``poisson`` draws exponential
+    gaps with mean 1/rate, and ``ramp`` raises the rate linearly from
+    ``ramp_from`` to ``rate`` over ``ramp_seconds``, then holds it.
+    """
+    if pattern == "poisson":
+        rng = random.Random(seed)
+        t = 0.0
+        while True:
+            yield t
+            t += rng.expovariate(rate)
+    elif pattern == "ramp":
+        r0, r1, span = float(ramp_from), float(rate), float(ramp_seconds)
+        ramp_items = (r0 + r1) * span / 2  # items sent during the ramp
+        i = 0
+        while True:
+            if span > 0 and i < ramp_items:
+                # Solve r0*t + (r1 - r0)*t^2 / (2*span) = i for t.
+                a = (r1 - r0) / (2 * span)
+                yield i / r0 if a == 0 else (-r0 + math.sqrt(r0 * r0 + 4 * a * i)) / (2 * a)
+            else:
+                yield span + (i - ramp_items) / r1
+            i += 1
+    else:
+        i = 0
+        while True:
+            yield i / rate
+            i += 1
+
+
+def target_rate_at(
+    t: float, rate: float, *, pattern: str = "constant", ramp_from: float = 0.0, ramp_seconds: float = 60.0
+) -> float:
+    if pattern == "ramp" and ramp_seconds > 0 and t < ramp_seconds:
+        return ramp_from + (rate - ramp_from) * t / ramp_seconds
+    return rate
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 4)
+
+
+class LoadTimeline:
+    """Per-second send/completion counts and latencies of an open-loop run.
+
+    Latency runs from an item's *scheduled* send time to the return of its
+    task call, so time spent waiting for an in-flight slot counts against the
+    system instead of silently lowering the offered load; metric scoring is
+    not part of it. Items scheduled during the first ``warmup_seconds`` are
+    kept in the timeline but left out of the summary. Times are seconds since
+    :meth:`start`.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        pattern: str = "constant",
+        ramp_from: float = 0.0,
+        ramp_seconds: float = 60.0,
+        warmup_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.pattern = pattern
+        self.ramp_from = ramp_from
+        self.ramp_seconds = ramp_seconds
+        self.warmup_seconds = warmup_seconds
+        self.clock = clock
+        self.started_at = clock()
+        self.sent = 0
+        self.capped = 0  # sent while every in-flight slot was taken
+        self.in_flight = 0
+        self.elapsed = 0.0
+        self._seconds: Dict[int, Dict[str, Any]] = {}
+        self._latencies: List[float] = []
+        self._errors = 0
+        self._completed = 0
+        self._measured_from: Optional[float] = None
+        self._measured_sent = 0
+        self._last_send = 0.0
+
+    def start(self) -> None:
+        self.started_at = self.clock()
+
+    def now(self) -> float:
+        return self.clock() - self.started_at
+
+    def _bucket(self, t: float) -> Dict[str, Any]:
+        second = int(t)
+        bucket = self._seconds.get(second)
+        if bucket is None:
+            bucket = self._seconds[second] = {"sent": 0, "completed": 0, "errors": 0, "latencies": []}
+        return bucket
+
+    def target_rate(self, t: float) -> float:
+        return target_rate_at(
+            t, self.rate, pattern=self.pattern, ramp_from=self.ramp_from, ramp_seconds=self.ramp_seconds
+        )
+
+    def record_send(self, scheduled: float, *, capped: bool = False) -> None:
+        actual = self.now()
+        self.sent += 1
+        self.in_flight += 1
+        self.elapsed = max(self.elapsed, actual)
+        self.capped += int(capped)
+        self._bucket(actual)["sent"] += 1
+        self._last_send = actual
+        if scheduled >= self.warmup_seconds:
+            if self._measured_from is None:
+                self._measured_from = actual
+            self._measured_sent += 1
+
+    def record_done(self, scheduled: float, *, error: bool = False) -> None:
+        finished = self.now()
+        self.in_flight = max(0, self.in_flight - 1)
+        self.elapsed = max(self.elapsed, finished)
+        latency = finished - scheduled
+        bucket = self._bucket(finished)
+        bucket["completed"] += 1
+        bucket["latencies"].append(latency)
+        if error:
+            bucket["errors"] += 1
+        if scheduled >= self.warmup_seconds:
+            self._completed += 1
+            self._latencies.append(latency)
+            self._errors += int(error)
+
+    def achieved_rate(self, now: Optional[float] = None) -> float:
+        """Send rate since warm-up ended (or over the last second while warming up)."""
+        now = self.now() if now is None else now
+        if self._measured_from is not None and now > self._measured_from:
+            return self._measured_sent / (now - self._measured_from)
+        return float(self._seconds.get(int(now) - 1, {}).get("sent", 0))
+
+    def _send_rate(self) -> float:
+        """Measured sends per second over the window they were sent in."""
+        if self._measured_from is None or self._measured_sent < 2 or self._last_send <= self._measured_from:
+            return 0.0
+        return (self._measured_sent - 1) / (self._last_send - self._measured_from)
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = self.now()
+        return {
+            "pattern": self.pattern,
+            "target_rate": round(self.target_rate(now), 3),
+            "achieved_rate": round(self.achieved_rate(now), 3),
+            "sent": self.sent,
+            "in_flight": self.in_flight,
+            "capped": self.capped,
+            "warming_up": now < self.warmup_seconds,
+        }
+
+    def timeline(self) -> List[Dict[str, Any]]:
+        rows = []
+        for second in range(int(self.elapsed) + 1):
+            bucket = self._seconds.get(second, {"sent": 0, "completed": 0, "errors": 0, "latencies": []})
+            latencies = bucket["latencies"]
+            rows.append({
+                "second": second,
+                "target_rate": round(self.target_rate(second), 3),
+                "sent": bucket["sent"],
+                "completed": bucket["completed"],
+                "errors": bucket["errors"],
+                "latency_mean": round(statistics.fmean(latencies), 4) if latencies else None,
+                "latency_p50": _percentile(latencies, 0.5),
+                "latency_p95": _percentile(latencies, 0.95),
+                "warmup": second < self.warmup_seconds,
+            })
+        return rows
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = self._latencies
+        return {
+            "pattern": self.pattern,
+            "target_rate": self.rate,
+            "achieved_rate": round(self._send_rate(), 3),
+            "warmup_seconds": self.warmup_seconds,
+            "sent": self.sent,
+            "measured": self._completed,
+            "capped": self.capped,
+            "error_rate": round(self._errors / self._completed, 4) if self._completed else None,
+            "latency_mean": round(statistics.fmean(latencies), 4) if latencies else None,
+            "latency_p50": _percentile(latencies, 0.5),
+            "latency_p95": _percentile(latencies, 0.95),
+            "latency_p99": _percentile(latencies, 0.99),
+        }
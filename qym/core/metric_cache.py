@@ -0,0 +1,171 @@
+"""Persistent cache of metric scores for expensive (LLM-judge) metrics."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from .task_cache import canonical_json
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "metric_cache.sqlite"
+
+
+def metric_cache_key(
+    metric_name: str, fingerprint: str, output: Any, expected: Any, input_data: Any
+) -> str:
+    """Hash of the metric identity and the (output, expected, input) it scores."""
+    payload = canonical_json(
+        {
+            "metric": metric_name,
+            "version": fingerprint,
+            "output": output,
+            "expected": expected,
+            "input": input_data,
+        }
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MetricCache:
+    """SQLite store of metric scores with LRU (``max_entries``) and TTL eviction.
+
+    Hits and misses are counted per metric for the run summary. Like
+    :class:`~qym.core.task_cache.TaskCache`, the evaluator uses
+    :meth:`aget`/:meth:`aput` (one cache thread) and hits do not commit.
+    """
+
+    _PRUNE_EVERY = 100
+    _TOUCH_BATCH = 100
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stats: Dict[str, Dict[str, int]] = {}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Shards (workers > 1) share the file: wait for each other's writes.
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            pass
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS metric_cache ("
+            " key TEXT PRIMARY KEY,"
+            " metric TEXT NOT NULL,"
+            " score TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS metric_cache_used ON metric_cache (used_at)")
+        self._conn.commit()
+        self._writes_since_prune = 0
+        self._touched: Dict[str, float] = {}
+        self._io = ThreadPoolExecutor(1, thread_name_prefix="qym-metric-cache")
+        self.prune()
+
+    async def aget(self, metric: str, key: str) -> Tuple[bool, Any]:
+        """:meth:`get` on the cache thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._io, self.get, metric, key)
+
+    async def aput(self, metric: str, key: str, score: Any) -> None:
+        """:meth:`put` on the cache thread."""
+        await asyncio.get_running_loop().run_in_executor(self._io, self.put, metric, key, score)
+
+    def _count(self, metric: str, field: str) -> None:
+        counts = self.stats.setdefault(metric, {"hits": 0, "misses": 0})
+        counts[field] += 1
+
+    def get(self, metric: str, key: str) -> Tuple[bool, Any]:
+        """Return ``(True, score)`` on a hit, ``(False, None)`` otherwise."""
+        row = self._conn.execute(
+            "SELECT score, created_at FROM metric_cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.ttl is not None and now - row[1] > self.ttl):
+            self._count(metric, "misses")
+            return False, None
+        self._touched[key] = now
+        if len(self._touched) >= self._TOUCH_BATCH:
+            self._flush_touched()
+            self._conn.commit()
+        self._count(metric, "hits")
+        return True, json.loads(row[0])
+
+    def put(self, metric: str, key: str, score: Any) -> None:
+        """Store a score; scores that are not JSON-serializable are skipped."""
+        try:
+            encoded = json.dumps(score, ensure_ascii=False)
+        except (TypeError, ValueError):
+            logger.debug(f"Score of metric {metric} is not JSON-serializable; not cached")
+            return
+        now = time.time()
+        self._touched.pop(key, None)
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metric_cache (key, metric, score, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, metric, encoded, now, now),
+            )
+            self._flush_touched()
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.rollback()
+            raise
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= self._PRUNE_EVERY:
+            self.prune()
+
+    def _flush_touched(self) -> None:
+        """Write the recency of hits since the last flush (the caller commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE metric_cache SET used_at = ? WHERE key = ?",
+                [(used_at, key) for key, used_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def prune(self) -> None:
+        """Drop expired entries, then the least recently used beyond ``max_entries``."""
+        self._writes_since_prune = 0
+        touched = bool(self._touched)
+        self._flush_touched()
+        removed = 0
+        if self.ttl is not None:
+            removed += self._conn.execute(
+                "DELETE FROM metric_cache WHERE created_at < ?", (time.time() - self.ttl,)
+            ).rowcount
+        if self.max_entries is not None:
+            removed += self._conn.execute(
+                "DELETE FROM metric_cache WHERE key IN ("
+                " SELECT key FROM metric_cache ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if removed or touched:
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._io.shutdown(wait=True)
+        try:
+            self.prune()
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {metric: dict(counts) for metric, counts in self.stats.items()}
@@ -0,0 +1,83 @@
+"""Precompiled metric invocation plans."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+from ..metrics.markers import is_batch_metric, is_cpu_bound
+
+# The values a metric can receive, in positional order.
+_METRIC_ARGS = ("output", "expected", "input_data")
+
+
+@dataclass(frozen=True)
+class MetricPlan:
+    """How to call one metric, decided once in ``Evaluator._prepare_metrics``.
+
+    ``positional`` is how many of (output, expected, input_data) are passed by
+    position; metrics with more than three parameters that declare all three
+    standard names get them as keywords instead (``kwarg_names``), others get
+    the first three by position. ``executor`` is where the
+    call runs: ``"async"`` (event loop), ``"thread"``, ``"process"`` (marked
+    CPU-bound; used when the evaluator has a metric process pool) or
+    ``"batch"`` (vectorized metric called with lists via a micro-batcher).
+    """
+
+    name: str
+    func: Callable
+    positional: int
+    kwarg_names: Tuple[str, ...]
+    is_async: bool
+    executor: str
+    is_batch: bool = False
+
+    def _bind(self, output: Any, expected: Any, input_data: Any) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+        values = (output, expected, input_data)
+        if self.kwarg_names:
+            return (), {name: values[_METRIC_ARGS.index(name)] for name in self.kwarg_names}
+        return values[: self.positional], {}
+
+    def call(self, output: Any, expected: Any, input_data: Any) -> Any:
+        """Call the metric (returns a coroutine for async metrics)."""
+        args, kwargs = self._bind(output, expected, input_data)
+        return self.func(*args, **kwargs)
+
+
+def compile_metric_plan(name: str, func: Callable) -> MetricPlan:
+    """Inspect ``func`` once and build its :class:`MetricPlan`."""
+    is_async = asyncio.iscoroutinefunction(func) or asyncio.iscoroutinefunction(
+        getattr(func, "__call__", None)
+    )
+    try:
+        params = list(inspect.signature(func).parameters)
+    except (TypeError, ValueError):
+        # Builtins / C callables without a signature: the common (output, expected).
+        params = list(_METRIC_ARGS[:2])
+
+    kwarg_names: Tuple[str, ...] = ()
+    positional = min(len(params), len(_METRIC_ARGS))
+    if len(params) > len(_METRIC_ARGS) and all(name in params for name in _METRIC_ARGS):
+        # Standard names in any order, plus extra (defaulted) parameters.
+        kwarg_names = _METRIC_ARGS
+
+    is_batch = is_batch_metric(func)
+    if is_batch:
+        executor = "batch"
+    elif is_async:
+        executor = "async"
+    elif is_cpu_bound(func):
+        executor = "process"
+    else:
+        executor = "thread"
+    return MetricPlan(
+        name=name,
+        func=func,
+        positional=positional,
+        kwarg_names=kwarg_names,
+        is_async=is_async,
+        executor=executor,
+        is_batch=is_batch,
+    )
@@ -11,6 +11,8 @@ from rich.table import Table
 
 from .dashboard import RunDashboard, console_supports_live
 from .evaluator import Evaluator
+from .fair_share import FairShareScheduler
+from .circuit_breaker import CircuitBreakerRegistry
 from .results import EvaluationResult, render_results_summary, summary_display_enabled
 from .config import RunSpec, EvaluatorConfig
 
@@ -123,7 +125,17 @@ class MultiModelRunner:
         auto_save: bool = True,
         save_format: str = "csv",
         max_parallel_runs: Optional[int] = None,
+        global_concurrency: Optional[int] = None,
+        model_weights: Optional[Dict[str, float]] = None,
     ) -> List[EvaluationResult]:
+        """Run every spec concurrently behind one shared dashboard.
+
+        ``global_concurrency`` caps in-flight task calls across all runs; slots
+        are shared by weighted fair queuing over models (``model_weights``,
+        default 1) and, within a model, runs (``config.fair_share_weight``).
+        Runs that do not set ``max_concurrency`` themselves get enough workers
+        to use the whole budget once the others have finished.
+        """
         # 1. Pre-load unique datasets to avoid redundant downloads
         from .dataset import LangfuseDataset
         from langfuse import Langfuse
@@ -196,6 +208,14 @@ class MultiModelRunner:
 
         # Create semaphore if max_parallel_runs is set
         semaphore = asyncio.Semaphore(max_parallel_runs) if max_parallel_runs else None
+        fair_share = (
+            FairShareScheduler(global_concurrency, model_weights=model_weights)
+            if global_concurrency
+            else None
+        )
+
+        # One breaker per model, so runs of a failing model back off together.
+        circuit_breakers = CircuitBreakerRegistry()
 
         async def _run_spec(spec: RunSpec):
             # Acquire semaphore if limiting parallel runs
@@ -207,6 +227,8 @@ class MultiModelRunner:
 
         async def _run_spec_inner(spec: RunSpec):
             observer = dashboard.create_observer(spec.name)
+            if fair_share is not None and "max_concurrency" not in spec.config.model_fields_set:
+                spec.config.max_concurrency = fair_share.capacity
             # Pass config object directly
             evaluator = Evaluator(
                 task=spec.task,
@@ -215,6 +237,13 @@ class MultiModelRunner:
                 config=spec.config,
                 observer=observer,
             )
+            evaluator.circuit_breakers = circuit_breakers
+            if fair_share is not None:
+                evaluator.fair_share = fair_share.register(
+                    spec.name,
+                    model=spec.config.model or spec.config.run_metadata.get("model"),
+                    weight=spec.config.fair_share_weight,
+                )
             try:
                 result = await evaluator.arun(
                     show_tui=False,
@@ -225,6 +254,9 @@ class MultiModelRunner:
             except Exception as exc:
                 dashboard.mark_run_exception(spec.name, str(exc))
                 raise
+            finally:
+                if fair_share is not None:
+                    fair_share.unregister(spec.name)
 
         tasks = [asyncio.create_task(_run_spec(spec)) for spec in self.specs]
 
@@ -51,6 +51,13 @@ class EvaluationObserver:
     ) -> None:
         """Called when an item fails."""
 
+    def on_run_stats(
+        self,
+        run_id: str,
+        stats: Dict[str, Any],
+    ) -> None:
+        """Called periodically with live scheduling stats (queue depths, backpressure)."""
+
     def on_run_complete(
         self,
         run_id: str,
@@ -103,5 +110,8 @@ class CompositeEvaluationObserver(EvaluationObserver):
     def on_item_error(self, **kwargs: Any) -> None:
         self._call("on_item_error", **kwargs)
 
+    def on_run_stats(self, **kwargs: Any) -> None:
+        self._call("on_run_stats", **kwargs)
+
     def on_run_complete(self, **kwargs: Any) -> None:
         self._call("on_run_complete", **kwargs)
@@ -0,0 +1,52 @@
+"""Live counters for the evaluator's worker stages."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class StageStats:
+    """Queue depth, occupancy and backpressure for one worker stage.
+
+    ``blocked_seconds`` accumulates the time workers of this stage spent
+    waiting to hand work to the next (bounded) stage, i.e. backpressure.
+    """
+
+    name: str
+    workers: int
+    queue: Optional[asyncio.Queue] = None
+    busy: int = 0
+    processed: int = 0
+    blocked_seconds: float = 0.0
+
+    def start(self) -> None:
+        self.busy += 1
+
+    def finish(self) -> None:
+        self.busy = max(0, self.busy - 1)
+        self.processed += 1
+
+    async def hand_off(self, queue: asyncio.Queue, entry: Any) -> None:
+        """Put ``entry`` on a downstream queue, accounting any wait as backpressure."""
+        if not queue.full():
+            queue.put_nowait(entry)
+            return
+        started = time.perf_counter()
+        await queue.put(entry)
+        self.blocked_seconds += time.perf_counter() - started
+
+    def snapshot(self) -> Dict[str, Any]:
+        depth = self.queue.qsize() if self.queue is not None else 0
+        capacity = self.queue.maxsize if self.queue is not None else 0
+        return {
+            "workers": self.workers,
+            "busy": self.busy,
+            "processed": self.processed,
+            "queue_depth": depth,
+            "queue_capacity": capacity or None,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }
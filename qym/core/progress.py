@@ -1,8 +1,9 @@
 """Progress tracking and UI state management for evaluations."""
 
 import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+from typing import Any, Deque, Dict, List, Optional, Protocol, runtime_checkable
 
 @runtime_checkable
 class ProgressObserver(Protocol):
@@ -30,33 +31,68 @@ class ProgressObserver(Protocol):
 
 
 class ProgressTracker(ProgressObserver):
-    """Tracks the progress and state of evaluation items for the UI."""
+    """Tracks the progress and state of evaluation items for the UI.
 
-    def __init__(self, items: List[Any], metrics: List[str]):
+    With ``items=None`` (streaming runs) statuses are created lazily by
+    ``add_item`` and only the last ``keep_finished`` finished items are kept;
+    older ones are folded into counters so memory follows in-flight work.
+    """
+
+    def __init__(
+        self,
+        items: Optional[List[Any]],
+        metrics: List[str],
+        *,
+        keep_finished: Optional[int] = None,
+    ):
         self.items = items
         self.metrics = metrics
         self.item_statuses: Dict[int, Dict[str, Any]] = {}
+        self.total: Optional[int] = len(items) if items is not None else None
+        self.keep_finished = keep_finished
+        self._finished: Deque[int] = deque()
+        self._evicted = {'completed': 0, 'error': 0}
         self._init_statuses()
 
     def _init_statuses(self):
         """Initialize status dictionaries for all items."""
-        for idx, item in enumerate(self.items):
-            input_text = str(item.input)
-            expected_text = str(getattr(item, 'expected_output', 'N/A'))
-        
-            self.item_statuses[idx] = {
-                'input': input_text,
-                'output': '[dim]pending[/dim]',
-                'expected': expected_text,
-                'metrics': {metric: '[dim]pending[/dim]' for metric in self.metrics},
-                'metric_meta': {metric: {} for metric in self.metrics},
-                'status': 'pending',
-                'time': '[dim]pending[/dim]',
-                'start_time': None,
-                'end_time': None,
-                'trace_id': None,
-                'trace_url': None
-            }
+        for idx, item in enumerate(self.items or []):
+            self.add_item(idx, item)
+
+    def add_item(self, index: int, item: Any) -> None:
+        """Create the pending status for an item (no-op if it already exists)."""
+        if index in self.item_statuses:
+            return
+        input_text = str(item.input)
+        expected_text = str(getattr(item, 'expected_output', 'N/A'))
+
+        self.item_statuses[index] = {
+            'input': input_text,
+            'output': '[dim]pending[/dim]',
+            'expected': expected_text,
+            'metrics': {metric: '[dim]pending[/dim]' for metric in self.metrics},
+            'metric_meta': {metric: {} for metric in self.metrics},
+            'status': 'pending',
+            'time': '[dim]pending[/dim]',
+            'start_time': None,
+            'end_time': None,
+            'trace_id': None,
+            'trace_url': None
+        }
+
+    def set_total(self, total: int) -> None:
+        """Record the item count once a streamed dataset is exhausted."""
+        self.total = total
+
+    def _finish(self, index: int) -> None:
+        """Evict the oldest finished statuses beyond ``keep_finished``."""
+        if self.keep_finished is None:
+            return
+        self._finished.append(index)
+        while len(self._finished) > self.keep_finished:
+            old = self.item_statuses.pop(self._finished.popleft(), None)
+            if old is not None and old['status'] in self._evicted:
+                self._evicted[old['status']] += 1
 
     def start_item(self, index: int):
         """Mark an item as started."""
@@ -116,6 +152,7 @@ class ProgressTracker(ProgressObserver):
         self.item_statuses[index]['end_time'] = end_time
         self.item_statuses[index]['status'] = 'completed'
         self.item_statuses[index]['time'] = f"{int(elapsed)}s"
+        self._finish(index)
 
     def fail_item(self, index: int, error: str):
         """Mark an item as failed."""
@@ -129,6 +166,7 @@ class ProgressTracker(ProgressObserver):
         
         for metric in self.metrics:
             self.item_statuses[index]['metrics'][metric] = '[red]N/A[/red]'
+        self._finish(index)
 
     def fail_item_timeout(self, index: int, timeout: float):
         """Mark an item as failed due to timeout."""
@@ -142,18 +180,24 @@ class ProgressTracker(ProgressObserver):
         
         for metric in self.metrics:
             self.item_statuses[index]['metrics'][metric] = '[red]N/A[/red]'
+        self._finish(index)
 
     def get_snapshot(self) -> Dict[str, Any]:
         """Generate a snapshot of the current state for the UI."""
-        total_items = len(self.items)
-        completed = sum(1 for s in self.item_statuses.values() if s['status'] == 'completed')
+        completed = self._evicted['completed'] + sum(1 for s in self.item_statuses.values() if s['status'] == 'completed')
         in_progress = sum(1 for s in self.item_statuses.values() if s['status'] == 'in_progress')
-        failed = sum(1 for s in self.item_statuses.values() if s['status'] == 'error')
-        pending = total_items - completed - in_progress - failed
+        failed = self._evicted['error'] + sum(1 for s in self.item_statuses.values() if s['status'] == 'error')
+        if self.total is not None:
+            total_items = self.total
+            pending = total_items - completed - in_progress - failed
+        else:
+            # Streaming and not exhausted yet: only queued items are known.
+            pending = sum(1 for s in self.item_statuses.values() if s['status'] == 'pending')
+            total_items = completed + in_progress + failed + pending
         success_rate = (completed / total_items * 100) if total_items > 0 else 0
 
         rows = []
-        for idx in range(total_items):
+        for idx in sorted(self.item_statuses):
             s = self.item_statuses[idx]
             rows.append(self._generate_row(idx, s))
 
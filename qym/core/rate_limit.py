@@ -0,0 +1,210 @@
+"""Process-wide token-bucket rate limiting per model / provider."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count for rate limiting (~4 characters per token)."""
+    if value is None:
+        return 0
+    text = value if isinstance(value, str) else str(value)
+    return max(1, math.ceil(len(text) / 4))
+
+
+class TokenBucket:
+    """A reservation-based token bucket refilled continuously.
+
+    ``reserve`` takes tokens immediately (the balance may go negative) and
+    returns how long the caller must wait before using them, so waiters are
+    served in arrival order without any loop-bound primitives; one bucket can be
+    shared by every run in the process.
+    """
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = float(per_minute) / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take ``amount`` tokens; returns seconds to wait before they are available."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Requests larger than the bucket only have to wait for a full bucket.
+            amount = min(float(amount), self.capacity)
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def debit(self, amount: float) -> None:
+        """Charge tokens after the fact (e.g. completion tokens) without waiting."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= float(amount)
+
+    def set_rate(self, per_minute: float) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.capacity = float(per_minute)
+            self.rate = float(per_minute) / 60.0
+            self._tokens = min(self._tokens, self.capacity)
+
+
+def _retune(bucket: Optional[TokenBucket], per_minute: Optional[float]) -> Optional[TokenBucket]:
+    if not per_minute:
+        return None
+    if bucket is None:
+        return TokenBucket(per_minute)
+    if per_minute != bucket.capacity:
+        bucket.set_rate(per_minute)
+    return bucket
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one key."""
+
+    def __init__(self, key: str, rpm: Optional[float] = None, tpm: Optional[float] = None) -> None:
+        self.key = key
+        self.requests: Optional[TokenBucket] = TokenBucket(rpm) if rpm else None
+        self.tokens: Optional[TokenBucket] = TokenBucket(tpm) if tpm else None
+        self.acquired = 0
+        self.waited_seconds = 0.0
+        # (rpm, tpm) of every run currently using this limiter.
+        self._claims: List[Tuple[Optional[float], Optional[float]]] = []
+
+    @property
+    def rpm(self) -> Optional[float]:
+        return self.requests.capacity if self.requests else None
+
+    @property
+    def tpm(self) -> Optional[float]:
+        return self.tokens.capacity if self.tokens else None
+
+    def configure(self, rpm: Optional[float], tpm: Optional[float]) -> None:
+        """Add a run's limits; the stricter value of the runs still active wins."""
+        self._claims.append((rpm or None, tpm or None))
+        self._apply()
+
+    def release(self, rpm: Optional[float], tpm: Optional[float]) -> None:
+        """Drop a finished run's limits so they stop constraining later runs."""
+        try:
+            self._claims.remove((rpm or None, tpm or None))
+        except ValueError:
+            return
+        if self._claims:
+            self._apply()
+
+    def _apply(self) -> None:
+        rpm = min((claim[0] for claim in self._claims if claim[0]), default=None)
+        tpm = min((claim[1] for claim in self._claims if claim[1]), default=None)
+        self.requests = _retune(self.requests, rpm)
+        self.tokens = _retune(self.tokens, tpm)
+
+    def reserve(self, tokens: int = 0) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        self.acquired += 1
+        self.waited_seconds += wait
+        return wait
+
+    def record_tokens(self, tokens: int) -> None:
+        if self.tokens is not None and tokens:
+            self.tokens.debit(tokens)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "acquired": self.acquired,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+class RateLimiterRegistry:
+    """Limiters shared by every Evaluator in the process, keyed by model or provider."""
+
+    def __init__(self) -> None:
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str, rpm: Optional[float] = None, tpm: Optional[float] = None) -> RateLimiter:
+        with self._lock:
+            limiter = self._limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(key)
+                self._limiters[key] = limiter
+            limiter.configure(rpm, tpm)
+            return limiter
+
+    def resolve(self, model: Optional[str], limits: Mapping[str, Mapping[str, Any]]) -> List[RateLimiter]:
+        """Limiters that apply to ``model`` given configured ``limits``.
+
+        Keys may name the full model (``openai/gpt-4o``), the provider prefix
+        (``openai``) or the bare model (``gpt-4o``); a call must pass every
+        matching bucket. Pair with ``release`` once the run ends.
+        """
+        return [
+            self.get(key, rpm=spec.get("rpm"), tpm=spec.get("tpm"))
+            for key, spec in _matching_limits(model, limits)
+        ]
+
+    def release(self, model: Optional[str], limits: Mapping[str, Mapping[str, Any]]) -> None:
+        """Undo a ``resolve``: the run's limits no longer apply to later runs."""
+        with self._lock:
+            for key, spec in _matching_limits(model, limits):
+                limiter = self._limiters.get(key)
+                if limiter is not None:
+                    limiter.release(spec.get("rpm"), spec.get("tpm"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._limiters.clear()
+
+
+def _matching_limits(
+    model: Optional[str], limits: Mapping[str, Mapping[str, Any]]
+) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+    if not model or not limits:
+        return
+    candidates = [model]
+    slash_idx = model.find("/")
+    if slash_idx > 0:
+        candidates.extend([model[:slash_idx], model[slash_idx + 1:]])
+    for key in candidates:
+        spec = limits.get(key)
+        if spec:
+            yield key, spec
+
+
+_registry = RateLimiterRegistry()
+
+
+def get_rate_limiter_registry() -> RateLimiterRegistry:
+    """Return the process-wide rate limiter registry."""
+    return _registry
+
+
+async def acquire_rate_limits(limiters: List[RateLimiter], tokens: int = 0) -> float:
+    """Reserve one request (and ``tokens``) from each limiter and wait; returns seconds waited."""
+    if not limiters:
+        return 0.0
+    wait = max(limiter.reserve(tokens) for limiter in limiters)
+    if wait > 0:
+        await asyncio.sleep(wait)
+    return wait
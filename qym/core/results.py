@@ -50,6 +50,11 @@ class EvaluationResult:
         self.metadatas = {}  # item_id -> metadata dict
         self.results = {}  # item_id -> result dict
         self.errors = {}   # item_id -> {"error": str, "trace_id": Optional[str], "task_started_at_ms": Optional[int]}
+        self.metric_cache_stats: Dict[str, Dict[str, int]] = {}  # metric -> {"hits", "misses"}
+        self.coalesced_calls = 0  # task calls saved by sharing duplicate inputs
+        self.early_stopped = False
+        self.early_stop: Dict[str, Any] = {}  # sample_size, reason, per-metric mean/CI when early-stopped
+        self.load_test: Dict[str, Any] = {}  # open-loop load summary + per-second timeline
 
     def add_input(self, item_id: str, task_input: Any):
         """Add input data for an item."""
@@ -69,6 +74,7 @@ class EvaluationResult:
         error: str,
         trace_id: Optional[str] = None,
         task_started_at_ms: Optional[int] = None,
+        execution_meta: Optional[Dict[str, Any]] = None,
     ):
         """Add an evaluation error."""
         self.errors[item_id] = {
@@ -76,6 +82,8 @@ class EvaluationResult:
             "trace_id": trace_id,
             "task_started_at_ms": task_started_at_ms,
         }
+        if execution_meta:
+            self.errors[item_id]["execution_meta"] = execution_meta
     
     def finish(self):
         """Mark evaluation as finished."""
@@ -150,6 +158,9 @@ class EvaluationResult:
         times = []
         
         for result in self.results.values():
+            # Outputs served from the task cache did not call the model.
+            if (result.get('execution_meta') or {}).get('cached'):
+                continue
             if 'time' in result and isinstance(result['time'], (int, float)):
                 times.append(float(result['time']))
         
@@ -189,6 +200,37 @@ class EvaluationResult:
             lines.append(f"    Std:  {stats['std']:.3f}")
             lines.append(f"    Range: [{stats['min']:.3f}, {stats['max']:.3f}]")
         
+        if self.metric_cache_stats:
+            lines.append("\nMetric Cache:")
+            for metric, counts in self.metric_cache_stats.items():
+                lines.append(f"  {metric}: {counts.get('hits', 0)} hits, {counts.get('misses', 0)} misses")
+        
+        if self.early_stopped:
+            lines.append(
+                f"\nEarly Stopped: after {self.early_stop.get('sample_size')} items "
+                f"({self.early_stop.get('reason')})"
+            )
+            for metric, est in (self.early_stop.get("metrics") or {}).items():
+                if est.get("ci_half_width") is not None:
+                    lines.append(f"  {metric}: {est['mean']:.3f} ± {est['ci_half_width']:.3f} (n={est['n']})")
+
+        if self.coalesced_calls:
+            lines.append(f"\nCoalesced: {self.coalesced_calls} task calls saved (duplicate inputs)")
+
+        if self.load_test:
+            load = self.load_test
+            lines.append(
+                f"\nLoad Test: {load.get('achieved_rate')}/{load.get('target_rate')} items/s "
+                f"({load.get('pattern')}, {load.get('warmup_seconds')}s warm-up excluded)"
+            )
+            if load.get("latency_p50") is not None:
+                lines.append(
+                    f"  Latency p50 {load['latency_p50']:.3f}s, p95 {load['latency_p95']:.3f}s, "
+                    f"p99 {load['latency_p99']:.3f}s; error rate {load.get('error_rate', 0):.1%}"
+                )
+            if load.get("capped"):
+                lines.append(f"  {load['capped']} items sent while max_concurrency items were in flight")
+
         if self.errors:
             lines.append(f"\nErrors: {len(self.errors)} items failed")
             # Show all errors
@@ -233,6 +275,11 @@ class EvaluationResult:
             'success_rate': self.success_rate,
             'metrics': self.metrics,
             'metric_stats': metric_stats,
+            'metric_cache_stats': self.metric_cache_stats,
+            'coalesced_calls': self.coalesced_calls,
+            'early_stopped': self.early_stopped,
+            'early_stop': self.early_stop,
+            'load_test': self.load_test,
             'langfuse_url': self.langfuse_url,
             'inputs': self.inputs,
             'metadatas': self.metadatas,
@@ -317,7 +364,7 @@ class EvaluationResult:
         base_fields = [
             'dataset_name', 'run_name', 'run_metadata', 'run_config',
             'trace_id', 'item_id', 'input', 'item_metadata', 'output', 'expected_output', 'time',
-            'task_started_at_ms',
+            'task_started_at_ms', 'execution_meta',
         ]
         metric_fields: List[str] = []
         for m in self.metrics:
@@ -357,6 +404,7 @@ class EvaluationResult:
                 'expected_output': result.get('expected', ''),
                 'time': result.get('time', 0.0),
                 'task_started_at_ms': result.get('task_started_at_ms', ''),
+                'execution_meta': _execution_meta_json(result.get('execution_meta')),
             }
             scores = result.get('scores', {})
             for m in self.metrics:
@@ -377,10 +425,12 @@ class EvaluationResult:
                 error_msg = error_info.get("error", str(error_info))
                 error_trace_id = error_info.get("trace_id", "")
                 error_task_started_at_ms = error_info.get("task_started_at_ms", "")
+                error_execution_meta = error_info.get("execution_meta")
             else:
                 error_msg = str(error_info)
                 error_trace_id = ""
                 error_task_started_at_ms = ""
+                error_execution_meta = None
 
             # Get input and metadata for failed items
             task_input = self.inputs.get(item_id, '')
@@ -404,6 +454,7 @@ class EvaluationResult:
                 'expected_output': '',
                 'time': 0.0,
                 'task_started_at_ms': error_task_started_at_ms,
+                'execution_meta': _execution_meta_json(error_execution_meta),
             }
             for m in self.metrics:
                 row[f'{m}_score'] = 'N/A'
@@ -679,7 +730,22 @@ def render_results_summary(
     total_success = sum(len(r.results) for r in results)
     overview_ratio = (total_success / total_items * 100.0) if total_items else 0.0
 
-    header_text = Text(f"{run_count} run{'s' if run_count != 1 else ''} • {total_items} items • {overview_ratio:.1f}% success")
+    header = f"{run_count} run{'s' if run_count != 1 else ''} • {total_items} items • {overview_ratio:.1f}% success"
+    cache_hits = sum(c.get("hits", 0) for r in results for c in r.metric_cache_stats.values())
+    cache_misses = sum(c.get("misses", 0) for r in results for c in r.metric_cache_stats.values())
+    if cache_hits or cache_misses:
+        header += f" • metric cache {cache_hits} hits / {cache_misses} misses"
+    early_stopped = [r for r in results if r.early_stopped]
+    if early_stopped:
+        sizes = ", ".join(str(r.early_stop.get("sample_size")) for r in early_stopped)
+        header += f" • early-stopped at {sizes} items"
+    coalesced = sum(r.coalesced_calls for r in results)
+    if coalesced:
+        header += f" • {coalesced} task calls coalesced"
+    for r in results:
+        if r.load_test:
+            header += f" • load {r.load_test.get('achieved_rate')}/{r.load_test.get('target_rate')} items/s"
+    header_text = Text(header)
     header_text.stylize("dim")
 
     summary_table = _build_run_summary_table(results)
@@ -850,6 +916,13 @@ def summary_display_enabled() -> bool:
 _RUN_ID_RE = re.compile(r"^(?P<base>.+)-(?P<model>.+)-(?P<ts>\d{6}-\d{4})$")
 
 
+def _execution_meta_json(meta: Any) -> str:
+    """Serialize per-item execution metadata (retries, backoff, ...) for CSV."""
+    if not meta:
+        return ""
+    return json.dumps(meta, ensure_ascii=False)
+
+
 def _strip_run_suffix(name: str) -> str:
     """Strip timestamp/model suffix to recover base run name."""
     if not name:
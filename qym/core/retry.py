@@ -0,0 +1,125 @@
+"""Retries with exponential backoff, jitter and a run-level retry budget."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..utils.errors import classify_error
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient failures (throttling, timeouts, provider 5xx) are retried; everything else is fatal."""
+    return classify_error(exc) is not None
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Server-suggested delay from ``exc.retry_after`` or a ``Retry-After`` response header."""
+    value: Any = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+        if headers is not None:
+            try:
+                millis = headers.get("retry-after-ms")
+                if millis is not None:
+                    return max(0.0, float(millis) / 1000.0)
+                value = headers.get("retry-after")
+            except Exception:
+                value = None
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+@dataclass
+class RetryPolicy:
+    """How many times and how long to wait before retrying a failed call.
+
+    Delays use "full jitter": a uniform draw in ``[0, min(max_delay,
+    base_delay * 2**attempt)]``. A ``Retry-After`` hint replaces the draw but
+    is still capped at ``max_delay``.
+    """
+
+    max_retries: int = 0
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def delay(self, attempt: int, exc: Optional[BaseException] = None) -> float:
+        hinted = retry_after_seconds(exc) if exc is not None else None
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0.0, ceiling)
+
+
+class RetryBudget:
+    """Run-level cap on retries so a dead endpoint cannot multiply the load.
+
+    Retries are allowed while ``retries <= min_retries + ratio * calls``: with
+    the default ratio of 0.2 at most one extra call per five first attempts,
+    plus a small floor so the first failures of a run can still be retried.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10) -> None:
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.calls = 0
+        self.retries = 0
+        self.exhausted = 0
+
+    def record_call(self) -> None:
+        self.calls += 1
+
+    def try_spend(self) -> bool:
+        if self.retries + 1 > self.min_retries + self.ratio * self.calls:
+            self.exhausted += 1
+            return False
+        self.retries += 1
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"calls": self.calls, "retries": self.retries, "exhausted": self.exhausted}
+
+
+async def call_with_retry(
+    make_call: Callable[[], Awaitable[Any]],
+    *,
+    policy: RetryPolicy,
+    budget: Optional[RetryBudget] = None,
+    stats: Optional[Dict[str, Any]] = None,
+    kind: str = "task",
+) -> Any:
+    """Await ``make_call()`` and retry transient failures per ``policy``.
+
+    ``stats`` (the item's execution metadata) accumulates ``<kind>_retries``
+    and ``backoff_seconds``.
+    """
+    if budget is not None:
+        budget.record_call()
+    attempt = 0
+    while True:
+        try:
+            return await make_call()
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                raise
+            if budget is not None and not budget.try_spend():
+                raise
+            delay = policy.delay(attempt, e)
+            if stats is not None:
+                key = f"{kind}_retries"
+                stats[key] = stats.get(key, 0) + 1
+                stats["backoff_seconds"] = round(stats.get("backoff_seconds", 0.0) + delay, 3)
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -5,6 +5,7 @@ import json
 import os
 import logging
 import re
+import statistics
 import sys
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -128,6 +129,17 @@ def is_error_row(row: Dict[str, Any], metrics: List[str]) -> bool:
     return False
 
 
+def is_cached_row(row: Dict[str, Any]) -> bool:
+    """Whether the row's task output was served from the task cache."""
+    meta = row.get("execution_meta")
+    if isinstance(meta, str):
+        try:
+            meta = json.loads(meta) if meta else None
+        except ValueError:
+            return False
+    return isinstance(meta, dict) and bool(meta.get("cached"))
+
+
 @dataclass
 class RunInfo:
     """Metadata for a single evaluation run."""
@@ -257,6 +269,43 @@ class RunDiscovery:
         self._cache_time = time.time()
         return index
 
+    def item_latencies(
+        self,
+        task_name: str,
+        dataset_name: str,
+        model_name: Optional[str] = None,
+        max_runs: int = 5,
+    ) -> Dict[str, float]:
+        """Median task latency (seconds) per item_id from past runs of a task/dataset.
+
+        Uses the newest ``max_runs`` CSV runs of the same model, or of any model
+        when that one has no history. Error rows and cache hits are skipped.
+        """
+        models = self.scan().tasks.get(task_name, {})
+        runs = [r for r in models.get(model_name or "", []) if r.dataset_name == dataset_name]
+        if not runs:
+            runs = [r for model_runs in models.values() for r in model_runs if r.dataset_name == dataset_name]
+        runs.sort(key=lambda r: r.timestamp, reverse=True)
+
+        samples: Dict[str, List[float]] = {}
+        for run in runs[:max_runs]:
+            if not run.file_path.lower().endswith(".csv"):
+                continue
+            try:
+                with open(run.file_path, "r", encoding="utf-8") as f:
+                    for row in csv.DictReader(f):
+                        item_id = row.get("item_id")
+                        if not item_id or is_error_row(row, run.metrics) or is_cached_row(row):
+                            continue
+                        try:
+                            latency = float(row.get("time") or "")
+                        except ValueError:
+                            continue
+                        samples.setdefault(item_id, []).append(latency)
+            except (OSError, csv.Error, UnicodeDecodeError) as e:
+                logger.debug(f"[RunDiscovery] Skipping latency history of '{run.file_path}': {e}")
+        return {item_id: statistics.median(values) for item_id, values in samples.items()}
+
     def _parse_result_file(
         self, file_path: Path, task_name: str, model_name: str
     ) -> Optional[RunInfo]:
@@ -331,8 +380,10 @@ class RunDiscovery:
                                 metric_sums[m] += score
                                 metric_counts[m] += 1
 
-                    # Accumulate latency (time column is in seconds)
+                    # Accumulate latency (time column is in seconds); cache hits excluded
                     time_str = row.get("time", "")
+                    if is_cached_row(row):
+                        continue
                     try:
                         latency_sec = float(time_str)
                         latency_sum += latency_sec * 1000  # Convert to ms
@@ -469,8 +520,10 @@ class RunDiscovery:
                         except (ValueError, TypeError):
                             pass
 
-                # Accumulate latency
+                # Accumulate latency (cache hits excluded)
                 time_val = row.get("time")
+                if is_cached_row(row):
+                    continue
                 try:
                     latency_sec = float(time_val) if time_val is not None else None
                     if latency_sec is not None:
@@ -0,0 +1,47 @@
+"""Longest-expected-first ordering of dataset items."""
+
+from __future__ import annotations
+
+import statistics
+from typing import Any, Dict, List, Sequence, Tuple
+
+from .rate_limit import estimate_tokens
+
+
+def history_item_ids(idx: int, item: Any) -> Tuple[str, ...]:
+    """IDs an item may have in past run files (dataset id, then positional fallback)."""
+    primary = getattr(item, "id", None)
+    fallback = f"item_{idx}"
+    return (str(primary), fallback) if primary is not None else (fallback,)
+
+
+def predict_latencies(items: Sequence[Any], history: Dict[str, float]) -> Tuple[List[float], int]:
+    """Predicted task latency per item, and how many came from history.
+
+    Items seen in earlier runs use their historical median latency. The rest
+    are estimated from input size, scaled by the seconds-per-token observed on
+    items that do have history (so both kinds sort on one scale); without any
+    history the estimate is the input size alone.
+    """
+    known: List[Tuple[int, float]] = []
+    for idx, item in enumerate(items):
+        for item_id in history_item_ids(idx, item):
+            if item_id in history:
+                known.append((idx, history[item_id]))
+                break
+    known_latency = dict(known)
+    sizes = [estimate_tokens(getattr(item, "input", None)) for item in items]
+    rates = [latency / sizes[idx] for idx, latency in known if sizes[idx]]
+    per_token = statistics.median(rates) if rates else 1.0
+    predicted = [
+        known_latency[idx] if idx in known_latency else sizes[idx] * per_token
+        for idx in range(len(items))
+    ]
+    return predicted, len(known)
+
+
+def longest_first_order(items: Sequence[Any], history: Dict[str, float]) -> Tuple[List[int], int]:
+    """Item indices sorted by predicted latency, slowest first (ties keep dataset order)."""
+    predicted, from_history = predict_latencies(items, history)
+    order = sorted(range(len(items)), key=lambda idx: -predicted[idx])
+    return order, from_history
@@ -0,0 +1,553 @@
+"""Multi-process sharded execution of one run (``workers > 1``)."""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import glob
+import importlib.util
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import re
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from rich.console import Console
+from rich.live import Live
+
+from .checkpoint import (
+    build_checkpoint_header,
+    is_retryable_row,
+    iter_checkpoint_rows,
+    load_checkpoint_state,
+    parse_checkpoint_row,
+)
+from .dashboard import RunDashboard, console_supports_live
+from .observers import EvaluationObserver
+from .progress import ProgressTracker
+from .results import EvaluationResult
+from ..server.app import UIServer
+
+if TYPE_CHECKING:
+    from .evaluator import Evaluator
+
+logger = logging.getLogger(__name__)
+console = Console()
+
+_SHARD_RE = re.compile(r"\.shard(\d+)of(\d+)\.csv$")
+
+
+@dataclass(frozen=True)
+class ShardItem:
+    """Dataset item sent to a shard process, with its run-wide id fixed."""
+
+    id: str
+    input: Any
+    expected_output: Any = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class ShardDataset:
+    """Picklable slice of a dataset evaluated by one shard process."""
+
+    # Item ids are the parent's, not positions in this slice.
+    fixed_item_ids = True
+
+    def __init__(self, name: str, items: List[ShardItem], dataset_id: Optional[str] = None) -> None:
+        self.name = name
+        self.dataset_name = name
+        self.id = dataset_id
+        self._items = items
+
+    def get_items(self) -> List[ShardItem]:
+        return self._items
+
+    def iter_items(self) -> Iterator[ShardItem]:
+        return iter(self._items)
+
+    @property
+    def size(self) -> int:
+        return len(self._items)
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def run_item_id(idx: int, item: Any) -> str:
+    """The id a run records for an item: its dataset id, else ``item_<index>``."""
+    item_id = getattr(item, "id", None)
+    return str(item_id) if item_id is not None else f"item_{idx}"
+
+
+def shard_checkpoint_path(run_path: str, shard: int, workers: int) -> str:
+    """Checkpoint of one shard, next to the merged run file."""
+    stem, _ = os.path.splitext(run_path)
+    return f"{stem}.shard{shard + 1}of{workers}.csv"
+
+
+def existing_shard_files(run_path: str) -> Dict[str, int]:
+    """Shard checkpoints already next to ``run_path``, mapped to their worker count."""
+    stem, _ = os.path.splitext(run_path)
+    found = {}
+    for path in glob.glob(f"{glob.escape(stem)}.shard*of*.csv"):
+        match = _SHARD_RE.search(path)
+        if match:
+            found[path] = int(match.group(2))
+    return found
+
+
+def _portable(obj: Any) -> Tuple[str, Any]:
+    """``obj`` itself if it pickles, else a reference to reload it from its source file.
+
+    Functions loaded with the CLI's ``--task-file`` live in a module that is not
+    importable by name, so they cannot be pickled but can be reloaded.
+    """
+    if isinstance(obj, str):
+        return ("object", obj)
+    try:
+        pickle.dumps(obj)
+        return ("object", obj)
+    except Exception:
+        pass
+    try:
+        source = inspect.getsourcefile(obj)
+    except TypeError:
+        source = None
+    name = getattr(obj, "__name__", None)
+    if not source or not name or getattr(obj, "__qualname__", name) != name:
+        raise ValueError(
+            f"{obj!r} cannot be sent to worker processes; define it at module level"
+        )
+    return ("file", (source, name))
+
+
+def _resolve(ref: Tuple[str, Any]) -> Any:
+    kind, value = ref
+    if kind == "object":
+        return value
+    path, name = value
+    spec = importlib.util.spec_from_file_location("qym_shard_module", path)
+    if spec is None or spec.loader is None:
+        raise ValueError(f"Cannot load module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, name)
+
+
+def _send(events: Any, message: Tuple[Any, ...]) -> None:
+    # Pickle up front: a failure inside the queue's feeder thread would be lost.
+    try:
+        pickle.dumps(message)
+    except Exception:
+        message = json.loads(json.dumps(message, default=str))
+        message = tuple(message)
+    events.put(message)
+
+
+class _ShardObserver(EvaluationObserver):
+    """Forwards a shard's item events to the parent, with run-wide item indexes."""
+
+    def __init__(self, events: Any, shard: int, index_map: Sequence[int]) -> None:
+        self.events = events
+        self.shard = shard
+        self.index_map = list(index_map)
+
+    def _forward(self, method: str, item_index: int, **kwargs: Any) -> None:
+        kwargs["item_index"] = self.index_map[item_index]
+        _send(self.events, ("event", self.shard, method, kwargs))
+
+    def on_item_start(self, run_id, item_index, payload=None):
+        self._forward("on_item_start", item_index, payload=payload)
+
+    def on_metric_result(self, run_id, item_index, metric_name, score, metadata=None):
+        self._forward("on_metric_result", item_index, metric_name=metric_name, score=score)
+
+    def on_item_complete(self, run_id, item_index, result):
+        self._forward("on_item_complete", item_index, result=result)
+
+    def on_item_error(self, run_id, item_index, error):
+        self._forward("on_item_error", item_index, error=error)
+
+
+def split_config(config: Dict[str, Any], shards: int) -> Dict[str, Any]:
+    """Per-shard share of a run's config: ``max_concurrency`` and ``rate_limits`` are run totals.
+
+    Each shard has its own process-wide rate limiter registry, so the limits
+    are divided across shards (rounded down, so the shards never exceed the
+    configured totals; at least one slot each).
+    """
+    if shards <= 1:
+        return dict(config)
+    max_concurrency = max(1, int(config["max_concurrency"]) // shards)
+    return {
+        **config,
+        "max_concurrency": max_concurrency,
+        "min_concurrency": min(int(config.get("min_concurrency") or 1), max_concurrency),
+        "rate_limits": {
+            key: {name: value / shards for name, value in spec.items()}
+            for key, spec in (config.get("rate_limits") or {}).items()
+        },
+    }
+
+
+def _result_payload(result: EvaluationResult) -> Dict[str, Any]:
+    return {
+        "inputs": result.inputs,
+        "metadatas": result.metadatas,
+        "results": result.results,
+        "errors": result.errors,
+        "metric_cache_stats": result.metric_cache_stats,
+        "coalesced_calls": result.coalesced_calls,
+        "interrupted": bool(getattr(result, "interrupted", False)),
+    }
+
+
+def _run_shard(payload: Dict[str, Any], events: Any) -> None:
+    """Shard process entry point: evaluate one slice with its own event loop."""
+    from .evaluator import Evaluator
+
+    shard = payload["shard"]
+    try:
+        evaluator = Evaluator(
+            task=_resolve(payload["task"]),
+            dataset=payload["dataset"],
+            metrics=[_resolve(ref) for ref in payload["metrics"]],
+            config=payload["config"],
+            observer=_ShardObserver(events, shard, payload["index_map"]),
+        )
+        result = asyncio.run(evaluator.arun(show_tui=False))
+        _send(events, ("result", shard, _result_payload(result)))
+    except KeyboardInterrupt:
+        _send(events, ("error", shard, "interrupted"))
+    except BaseException as e:
+        _send(events, ("error", shard, f"{type(e).__name__}: {e}"))
+
+
+def _next_event(events: Any, timeout: float) -> Optional[Tuple[Any, ...]]:
+    try:
+        return events.get(timeout=timeout)
+    except queue.Empty:
+        return None
+
+
+def _merge_payload(result: EvaluationResult, payload: Dict[str, Any]) -> None:
+    result.inputs.update(payload["inputs"])
+    result.metadatas.update(payload["metadatas"])
+    result.results.update(payload["results"])
+    result.errors.update(payload["errors"])
+    for metric, counts in payload["metric_cache_stats"].items():
+        merged = result.metric_cache_stats.setdefault(metric, {"hits": 0, "misses": 0})
+        for key, value in counts.items():
+            merged[key] = merged.get(key, 0) + value
+    result.coalesced_calls += payload["coalesced_calls"]
+
+
+def _write_merged_file(path: str, metrics: List[str], carried: List[Dict[str, Any]], shard_paths: List[str]) -> None:
+    """Rewrite the run file from rows carried over from it plus every shard checkpoint."""
+    tmp_path = f"{path}.merging"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=build_checkpoint_header(metrics), extrasaction="ignore")
+        writer.writeheader()
+        for row in carried:
+            writer.writerow(row)
+        for shard_path in shard_paths:
+            for row in iter_checkpoint_rows(shard_path):
+                writer.writerow(row)
+    os.replace(tmp_path, path)
+
+
+async def run_sharded(
+    evaluator: "Evaluator", *, show_tui: bool, auto_save: bool, save_format: str
+) -> EvaluationResult:
+    """Split the dataset across ``config.workers`` processes and merge what they produce.
+
+    Items go to shard ``index % workers``, so a resumed run sends each item
+    to the same shard. Every shard appends to its own checkpoint next to the
+    run file (``<run>.shardKofN.csv``) and resumes from it; the run file is
+    rebuilt from the shard checkpoints (plus any rows it already held for
+    other items) when the shards finish. Shard item events drive one progress
+    tracker, UI snapshot and dashboard in this process.
+    """
+    config = evaluator.config
+    workers = int(config.workers)
+    if config.stream_dataset or config.early_stop or config.schedule != "dataset":
+        raise ValueError(
+            "workers > 1 shards the full item list in dataset order; it cannot be "
+            "combined with stream_dataset, early_stop or schedule."
+        )
+    if config.load_rate:
+        # Each shard would send at the full rate: N times the target load.
+        raise ValueError(
+            "workers > 1 cannot be combined with load_rate; a load test runs in one "
+            "process (raise max_concurrency for more items in flight)."
+        )
+
+    if config.resume_from:
+        state = load_checkpoint_state(config.resume_from)
+        if state and state.run_name:
+            evaluator.run_name = state.run_name
+            evaluator.display_name = state.run_name
+            config.run_name = state.run_name
+
+    metric_names = list(evaluator.metrics.keys())
+    result = EvaluationResult(
+        dataset_name=evaluator.dataset_name,
+        run_name=evaluator.run_name,
+        metrics=metric_names,
+        run_metadata=evaluator.run_metadata.copy(),
+        run_config={
+            "max_concurrency": evaluator.max_concurrency,
+            "timeout": evaluator.timeout,
+            "workers": workers,
+            "user_provided_run_name": bool(config.run_name),
+        },
+    )
+    items = evaluator.dataset.get_items()
+    if not items:
+        console.print("[yellow]Warning: Dataset is empty[/yellow]")
+        return result
+    evaluator.run_metadata["total_items"] = len(items)
+
+    run_path: Optional[str] = None
+    shard_paths: List[Optional[str]] = [None] * workers
+    carried: List[Dict[str, Any]] = []
+    done_ids: Set[str] = set()
+    if config.checkpoint_enabled:
+        run_path = config.resume_from or result._default_save_path("csv", output_dir=config.output_dir)
+        mismatched = sorted({n for n in existing_shard_files(run_path).values() if n != workers})
+        if mismatched:
+            raise ValueError(
+                f"{run_path} was sharded across {mismatched[0]} workers; resume it with that many workers."
+            )
+        shard_paths = [shard_checkpoint_path(run_path, i, workers) for i in range(workers)]
+        for path in shard_paths:
+            state = load_checkpoint_state(path)
+            if state:
+                done_ids |= state.completed_item_ids
+        merged_state = load_checkpoint_state(run_path)
+        if merged_state and sorted(merged_state.metrics) != sorted(metric_names):
+            raise ValueError(f"Resume metrics mismatch: {merged_state.metrics} != {metric_names}")
+        # Rows of the run file that no shard owns (e.g. resuming a single-process run).
+        for row in iter_checkpoint_rows(run_path):
+            item_id, row_result, is_error = parse_checkpoint_row(row, metric_names)
+            if not item_id or item_id in done_ids or is_retryable_row(row):
+                continue
+            carried.append(row)
+            if is_error:
+                error_msg = str(row_result.get("output", "") or "").replace("ERROR:", "").strip()
+                result.add_error(item_id, error_msg or "error", row_result.get("trace_id"))
+            else:
+                result.add_result(item_id, row_result)
+    carried_ids = {row.get("item_id") for row in carried}
+
+    shard_items: List[List[ShardItem]] = [[] for _ in range(workers)]
+    index_maps: List[List[int]] = [[] for _ in range(workers)]
+    for idx, item in enumerate(items):
+        item_id = run_item_id(idx, item)
+        if item_id in carried_ids:
+            continue
+        shard = idx % workers
+        shard_items[shard].append(
+            ShardItem(
+                id=item_id,
+                input=item.input,
+                expected_output=getattr(item, "expected_output", None),
+                metadata=dict(getattr(item, "metadata", None) or {}),
+            )
+        )
+        index_maps[shard].append(idx)
+
+    base_config = split_config(
+        config.model_dump(exclude={"models", "workers", "resume_from", "run_name"}),
+        sum(1 for shard_list in shard_items if shard_list),
+    )
+    task_ref = _portable(evaluator.task)
+    metric_refs = [_portable(m) for m in evaluator._raw_metrics]
+    ctx = multiprocessing.get_context("spawn")
+    events = ctx.Queue()
+    processes: Dict[int, Any] = {}
+    for shard in range(workers):
+        if not shard_items[shard]:
+            continue
+        payload = {
+            "shard": shard,
+            "task": task_ref,
+            "metrics": metric_refs,
+            "dataset": ShardDataset(evaluator.dataset_name, shard_items[shard], evaluator._langfuse_dataset_id),
+            "index_map": index_maps[shard],
+            "config": {
+                **base_config,
+                "run_name": evaluator.run_name,
+                "run_metadata": evaluator.run_metadata,
+                "resume_from": shard_paths[shard],
+                "ui_port": 0,
+                "web_ui": False,
+            },
+        }
+        processes[shard] = ctx.Process(target=_run_shard, args=(payload, events), name=f"qym-shard-{shard + 1}")
+
+    tracker = ProgressTracker(items, metric_names)
+    ui_server = UIServer(host="127.0.0.1", port=int(config.ui_port or 0))
+    host, port = ui_server.start()
+    html_url = f"http://{host}:{port}/"
+    run_info = {**evaluator._build_run_info(result), "html_url": html_url, "workers": workers}
+    ui_server.run_state.set_run_info({
+        "dataset_name": evaluator.dataset_name,
+        "run_name": evaluator.run_name,
+        "config": {"max_concurrency": evaluator.max_concurrency, "timeout": evaluator.timeout, "workers": workers},
+        **run_info,
+    })
+
+    dashboard = None
+    live_context: Any = nullcontext()
+    live_tui = show_tui and console_supports_live(console)
+    if live_tui:
+        dashboard = RunDashboard(
+            [
+                {
+                    "run_id": evaluator.run_name,
+                    "display_name": evaluator.display_name,
+                    "dataset": evaluator.dataset_name,
+                    "model": evaluator.model_name,
+                    "config": {
+                        "max_concurrency": evaluator.max_concurrency,
+                        "timeout": evaluator.timeout,
+                        "run_metadata": evaluator.run_metadata,
+                    },
+                }
+            ],
+            enabled=True,
+            console=console,
+        )
+        evaluator._attach_observer(dashboard.create_observer(evaluator.run_name))
+        live_context = Live(
+            dashboard.render(), console=console, refresh_per_second=6, screen=False,
+            transient=True, vertical_overflow="crop",
+        )
+
+    evaluator._notify_observer(
+        "on_run_start", run_info=run_info, total_items=len(items), metrics=metric_names
+    )
+
+    payloads: Dict[int, Dict[str, Any]] = {}
+    failures: Dict[int, str] = {}
+    interrupted = False
+
+    def _stats() -> Dict[str, Any]:
+        return {
+            "shards": {
+                "workers": workers,
+                "running": len(set(processes) - set(payloads) - set(failures)),
+                "failed": len(failures),
+            }
+        }
+
+    def _publish() -> None:
+        snap = tracker.get_snapshot()
+        snap["run_stats"] = _stats()
+        ui_server.run_state.set_snapshot(snap)
+        evaluator._notify_observer("on_run_stats", stats=snap["run_stats"])
+
+    def _apply(method: str, kwargs: Dict[str, Any]) -> None:
+        index = kwargs["item_index"]
+        if method == "on_item_start":
+            tracker.start_item(index)
+        elif method == "on_metric_result":
+            tracker.update_metric(index, kwargs["metric_name"], kwargs["score"])
+        elif method == "on_item_complete":
+            tracker.update_output(index, (kwargs.get("result") or {}).get("output"))
+            tracker.complete_item(index)
+        elif method == "on_item_error":
+            tracker.fail_item(index, kwargs.get("error", "error"))
+        evaluator._notify_observer(method, **kwargs)
+
+    async def _collect(deadline: Optional[float] = None) -> None:
+        loop = asyncio.get_running_loop()
+        while set(processes) - set(payloads) - set(failures):
+            if deadline is not None and loop.time() > deadline:
+                return
+            message = await loop.run_in_executor(None, _next_event, events, 0.2)
+            if message is None:
+                for shard, proc in processes.items():
+                    if shard in payloads or shard in failures:
+                        continue
+                    if not proc.is_alive() and proc.exitcode not in (0, None):
+                        failures[shard] = f"shard process exited with code {proc.exitcode}"
+                _publish()
+                continue
+            kind, shard = message[0], message[1]
+            if kind == "event":
+                _apply(message[2], message[3])
+            elif kind == "result":
+                payloads[shard] = message[2]
+            else:
+                failures[shard] = message[2]
+
+    with live_context as live:
+        if dashboard and live:
+            dashboard.bind(live)
+        try:
+            for proc in processes.values():
+                proc.start()
+            await _collect()
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            interrupted = True
+            # Shards got the same interrupt; give them time to flush checkpoints.
+            loop = asyncio.get_running_loop()
+            await _collect(deadline=loop.time() + config.interrupt_grace_seconds + 5.0)
+        finally:
+            for proc in processes.values():
+                if proc.is_alive():
+                    proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+            _publish()
+        final_panel = dashboard.render() if live_tui and dashboard else None
+
+    if final_panel is not None:
+        console.print(final_panel)
+    if dashboard:
+        dashboard.shutdown()
+
+    for shard in sorted(payloads):
+        _merge_payload(result, payloads[shard])
+        interrupted = interrupted or payloads[shard]["interrupted"]
+    if interrupted:
+        result.interrupted = True
+
+    if run_path:
+        written = [p for p in shard_paths if p and os.path.exists(p)]
+        _write_merged_file(run_path, metric_names, carried, written)
+        result.last_saved_path = run_path
+        if not interrupted and not failures and len(payloads) == len(processes):
+            for path in written:
+                os.remove(path)
+    result.finish()
+    result.html_url = html_url
+
+    evaluator._notify_observer(
+        "on_run_complete",
+        result_summary={
+            "success_rate": result.success_rate,
+            "total_items": result.total_items,
+            "metrics": result.metrics,
+            "run_metadata": result.run_metadata,
+        },
+    )
+    if auto_save and not run_path:
+        try:
+            result.save(format=save_format, output_dir=config.output_dir)
+        except Exception as e:
+            console.print(f"[yellow]⚠️  Warning: Failed to auto-save results: {e}[/yellow]")
+
+    if failures and not interrupted:
+        summary = ", ".join(f"shard {shard + 1}: {error}" for shard, error in sorted(failures.items()))
+        raise RuntimeError(f"One or more shards failed: {summary}")
+    return result
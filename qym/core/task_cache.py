@@ -0,0 +1,246 @@
+"""Content-addressed on-disk cache of task outputs (SQLite)."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "task_cache.sqlite"
+
+
+def task_identity(task: Any) -> Optional[str]:
+    """Stable identity of a task: its qualified name plus a hash of its source.
+
+    Editing the task function changes the identity, so stale outputs are not
+    served after a prompt change. What configures a function is folded in
+    too: ``functools.partial`` arguments, defaults and scalar closure values. Objects
+    configured at construction (chain or client instances, callable class
+    instances, bound methods) have no derivable identity: two instances of
+    one class can use different prompts or models, so ``None`` is returned
+    and the caller must not cache them without an explicit key.
+    """
+    if isinstance(task, functools.partial):
+        inner = task_identity(task.func)
+        if inner is None:
+            return None
+        bound = canonical_json({"args": task.args, "keywords": task.keywords})
+        return f"{inner}+partial:{_digest(bound)}"
+    if inspect.isbuiltin(task):
+        owner = getattr(task, "__self__", None)
+        if owner is not None and not inspect.ismodule(owner):
+            return None
+    elif not (inspect.isfunction(task) or inspect.isclass(task)):
+        return None
+    name = f"{getattr(task, '__module__', '')}.{getattr(task, '__qualname__', repr(task))}"
+    try:
+        source = inspect.getsource(task)
+    except (OSError, TypeError):
+        source = None
+    config = ""
+    if inspect.isfunction(task):
+        # Scalar closure values (a prompt or model name from a task factory) are
+        # configuration; containers and objects are usually state (counters,
+        # clients) that would change the identity on every run.
+        closure = []
+        for cell in task.__closure__ or ():
+            try:
+                value = cell.cell_contents
+            except ValueError:  # empty cell
+                value = None
+            closure.append(value if isinstance(value, (str, int, float, bool, type(None))) else None)
+        config = canonical_json(
+            {"defaults": task.__defaults__, "kwdefaults": task.__kwdefaults__, "closure": closure}
+        )
+        if source is None:
+            # No source file (REPL, exec): the bytecode still tells tasks apart.
+            source = repr((task.__code__.co_code, task.__code__.co_consts))
+    if source is None:
+        return name
+    return f"{name}:{_digest(source + config)}"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def canonical_json(value: Any) -> str:
+    """JSON with sorted keys and no whitespace, for hashing."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def cache_key(task_id: str, model: Optional[str], task_input: Any) -> str:
+    payload = canonical_json({"task": task_id, "model": model or "", "input": task_input})
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TaskCache:
+    """SQLite cache of task outputs keyed by :func:`cache_key`.
+
+    Entries older than ``max_age`` seconds are ignored and pruned; once the
+    stored outputs exceed ``max_bytes`` the least recently used entries are
+    evicted. In ``refresh`` mode lookups always miss but new outputs are still
+    written, replacing what was cached.
+
+    The evaluator goes through :meth:`aget`/:meth:`aput`, which run on one
+    dedicated thread so SQLite never blocks the event loop. Hits do not
+    commit: their recency is batched into the next write or prune.
+    """
+
+    _PRUNE_EVERY = 100
+    _TOUCH_BATCH = 100
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        refresh: bool = False,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Shards (workers > 1) share the file: wait for each other's writes.
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        except sqlite3.Error:
+            pass
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS task_cache ("
+            " key TEXT PRIMARY KEY,"
+            " output TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS task_cache_used ON task_cache (used_at)")
+        self._conn.commit()
+        self._writes_since_prune = 0
+        self._touched: Dict[str, float] = {}
+        self._io = ThreadPoolExecutor(1, thread_name_prefix="qym-task-cache")
+        self.prune()
+
+    async def aget(self, key: str) -> Tuple[bool, Any]:
+        """:meth:`get` on the cache thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._io, self.get, key)
+
+    async def aput(self, key: str, output: Any) -> None:
+        """:meth:`put` on the cache thread."""
+        await asyncio.get_running_loop().run_in_executor(self._io, self.put, key, output)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return ``(True, output)`` on a hit, ``(False, None)`` otherwise."""
+        if self.refresh:
+            self.misses += 1
+            return False, None
+        row = self._conn.execute(
+            "SELECT output, created_at FROM task_cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+            self.misses += 1
+            return False, None
+        self._touched[key] = now
+        if len(self._touched) >= self._TOUCH_BATCH:
+            self._flush_touched()
+            self._conn.commit()
+        self.hits += 1
+        return True, json.loads(row[0])
+
+    def put(self, key: str, output: Any) -> None:
+        """Store a task output; outputs that are not JSON-serializable are skipped."""
+        try:
+            encoded = json.dumps(output, ensure_ascii=False)
+        except (TypeError, ValueError):
+            logger.debug("Task output is not JSON-serializable; not cached")
+            return
+        now = time.time()
+        self._touched.pop(key, None)
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO task_cache (key, output, size, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, len(encoded.encode("utf-8")), now, now),
+            )
+            self._flush_touched()
+            self._conn.commit()
+        except sqlite3.Error:
+            self._conn.rollback()
+            raise
+        self.writes += 1
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= self._PRUNE_EVERY:
+            self.prune()
+
+    def _flush_touched(self) -> None:
+        """Write the recency of hits since the last flush (the caller commits)."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE task_cache SET used_at = ? WHERE key = ?",
+                [(used_at, key) for key, used_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def prune(self) -> None:
+        """Drop expired entries, then least recently used ones over ``max_bytes``."""
+        self._writes_since_prune = 0
+        touched = bool(self._touched)
+        self._flush_touched()
+        removed = 0
+        if self.max_age is not None:
+            removed += self._conn.execute(
+                "DELETE FROM task_cache WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM task_cache").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                freed = 0
+                stale = []
+                for key, size in self._conn.execute(
+                    "SELECT key, size FROM task_cache ORDER BY used_at ASC"
+                ):
+                    if freed >= excess:
+                        break
+                    stale.append((key,))
+                    freed += size
+                self._conn.executemany("DELETE FROM task_cache WHERE key = ?", stale)
+                removed += len(stale)
+        if removed or touched:
+            self._conn.commit()
+        self.evictions += removed
+
+    def close(self) -> None:
+        self._io.shutdown(wait=True)
+        try:
+            self.prune()
+            self._conn.close()
+        except sqlite3.Error:
+            pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
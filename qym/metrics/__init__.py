@@ -1,5 +1,7 @@
 """Built-in metrics for LLM evaluation."""
 
+from .markers import batch_metric, cache_metric, cpu_bound, is_batch_metric, is_cpu_bound
+
 # Try to import DeepEval metrics, fall back to built-in only if not available
 try:
     from .deepeval_metrics import get_deepeval_metrics
@@ -55,4 +57,7 @@ def has_deepeval() -> bool:
     return _has_deepeval
 
 
-__all__ = ["builtin_metrics", "list_available_metrics", "has_deepeval"]
\ No newline at end of file
+__all__ = [
+    "builtin_metrics", "list_available_metrics", "has_deepeval",
+    "cpu_bound", "is_cpu_bound", "batch_metric", "is_batch_metric", "cache_metric",
+]
\ No newline at end of file
@@ -5,6 +5,8 @@ from difflib import SequenceMatcher
 import re
 import string
 
+from .markers import cpu_bound
+
 
 def exact_match(output: Any, expected: Any) -> Dict[str, Any]:
     """
@@ -39,6 +41,7 @@ def contains_expected(output: Any, expected: Any) -> float:
     return 1.0 if expected_str in output_str else 0.0
 
 
+@cpu_bound
 def fuzzy_match(output: Any, expected: Any, threshold: float = 0.8) -> float:
     """
     Fuzzy string matching using sequence similarity.
@@ -156,6 +159,7 @@ def _compute_f1(prediction: str, ground_truth: str) -> float:
     return f1
 
 
+@cpu_bound
 def correctness(output: Any, expected: Any) -> Dict[str, Any]:
     """
     Correctness metric using SQuAD-style F1 score.
@@ -195,6 +199,7 @@ def correctness(output: Any, expected: Any) -> Dict[str, Any]:
 # Lightweight heuristic measuring how much of the output is grounded in context
 # =============================================================================
 
+@cpu_bound
 def faithfulness(output: Any, expected: Any, input_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Faithfulness metric using token overlap.
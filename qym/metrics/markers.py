@@ -0,0 +1,67 @@
+"""Execution hints attached to metric functions."""
+
+from typing import Callable, Optional
+
+_CPU_BOUND_ATTR = "__qym_cpu_bound__"
+_BATCH_ATTR = "__qym_batch_metric__"
+_CACHE_ATTR = "__qym_cache_metric__"
+
+
+def cpu_bound(metric_func: Callable) -> Callable:
+    """Mark a sync metric as CPU-bound.
+
+    When the evaluator runs with ``metric_processes`` set, CPU-bound metrics are
+    computed in a process pool instead of a thread so they do not hold the GIL
+    while the event loop drives task requests. The metric (and its arguments)
+    must be picklable, i.e. defined at module level.
+    """
+    setattr(metric_func, _CPU_BOUND_ATTR, True)
+    return metric_func
+
+
+def is_cpu_bound(metric_func: Callable) -> bool:
+    """Whether ``metric_func`` was marked with :func:`cpu_bound`."""
+    return bool(getattr(metric_func, _CPU_BOUND_ATTR, False))
+
+
+def batch_metric(metric_func: Callable) -> Callable:
+    """Mark a metric as vectorized.
+
+    A batch metric takes lists instead of single values, e.g.
+    ``(outputs, expecteds, input_datas)`` (or a prefix of it, like per-item
+    metrics), and returns a list with one score per item, in order. The
+    evaluator groups items being scored at the same time into batches of up
+    to ``metric_batch_size`` (waiting at most ``metric_batch_wait`` seconds).
+    """
+    setattr(metric_func, _BATCH_ATTR, True)
+    return metric_func
+
+
+def is_batch_metric(metric_func: Callable) -> bool:
+    """Whether ``metric_func`` was marked with :func:`batch_metric`."""
+    return bool(getattr(metric_func, _BATCH_ATTR, False))
+
+
+def cache_metric(metric_func: Optional[Callable] = None, *, version: Optional[str] = None):
+    """Opt a deterministic metric into the persistent metric cache.
+
+    Scores are reused for identical (output, expected, input_data) across runs.
+    The key includes ``version`` when given, else a hash of the metric's
+    source, so changing the metric invalidates its entries. Use as
+    ``@cache_metric`` or ``@cache_metric(version="2")``.
+    """
+    def _mark(func: Callable) -> Callable:
+        setattr(func, _CACHE_ATTR, version or True)
+        return func
+
+    if metric_func is not None:
+        return _mark(metric_func)
+    return _mark
+
+
+def cache_version(metric_func: Callable) -> Optional[str]:
+    """The version given to :func:`cache_metric`, "" if marked without one, else None."""
+    marker = getattr(metric_func, _CACHE_ATTR, None)
+    if marker is None or marker is False:
+        return None
+    return "" if marker is True else str(marker)
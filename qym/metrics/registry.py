@@ -2,20 +2,45 @@
 
 from typing import Callable, Optional
 from . import builtin_metrics
+from .markers import batch_metric as mark_batch_metric
+from .markers import cache_metric as mark_cache_metric
+from .markers import cpu_bound as mark_cpu_bound
 
 
 # Global registry for custom metrics
 _custom_metrics = {}
 
 
-def register_metric(name: str, metric_func: Callable):
+def register_metric(
+    name: str,
+    metric_func: Callable,
+    *,
+    cpu_bound: bool = False,
+    batch: bool = False,
+    cache: bool = False,
+    cache_version: Optional[str] = None,
+):
     """
     Register a custom metric.
     
     Args:
         name: Name to register the metric under
         metric_func: Callable that computes the metric
+        cpu_bound: Run the metric in a process pool when the evaluator has
+            ``metric_processes`` set (see :func:`qym.metrics.cpu_bound`)
+        batch: The metric takes lists of outputs/expecteds/inputs and returns
+            a list of scores (see :func:`qym.metrics.batch_metric`)
+        cache: Reuse the metric's scores across runs from the persistent
+            metric cache (see :func:`qym.metrics.cache_metric`); only for
+            deterministic metrics
+        cache_version: Bump to invalidate cached scores of this metric
     """
+    if cpu_bound:
+        mark_cpu_bound(metric_func)
+    if batch:
+        mark_batch_metric(metric_func)
+    if cache or cache_version:
+        mark_cache_metric(metric_func, version=cache_version)
     _custom_metrics[name] = metric_func
 
 
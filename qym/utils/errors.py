@@ -2,6 +2,12 @@
 
 from __future__ import annotations
 
+import re
+
+# An HTTP status code quoted in an error message ("Error code: 429",
+# "HTTP 503", "status=502"); a bare number like "4290" or "503 tokens" is not one.
+_STATUS_IN_TEXT = re.compile(r"\b(?:status|http|error)\D{0,10}(429|50[234]|529)\b", re.IGNORECASE)
+
 
 class QymError(Exception):
     """Base exception for all قيِّم (qym) errors."""
@@ -50,4 +56,82 @@ class MetricError(QymError):
 
 class TaskExecutionError(QymError):
     """Raised when task execution fails."""
-    pass
\ No newline at end of file
+    pass
+
+
+class TaskTimeoutError(TaskExecutionError):
+    """Raised when a task exceeds its per-item deadline."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        super().__init__(f"Task timed out after {timeout:g}s")
+
+
+class CircuitOpenError(TaskExecutionError):
+    """Raised instead of calling a model whose circuit breaker has given up on it.
+
+    Items failed this way are marked retryable in the checkpoint, so resuming
+    the run sends them again.
+    """
+
+    def __init__(self, model: str, failed_probes: int = 0):
+        self.model = model
+        self.failed_probes = failed_probes
+        super().__init__(
+            f"Skipped: circuit breaker open for {model} after {failed_probes} failed probe(s)"
+        )
+
+
+class MetricTimeoutError(MetricError):
+    """Raised when a metric does not finish before the metric-phase deadline."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        super().__init__(f"Metric phase timed out after {timeout:g}s")
+
+
+def status_code_of(exc: BaseException) -> "int | None":
+    """HTTP status code of a provider error, from the exception or its response."""
+    status = getattr(exc, "status_code", None) or getattr(exc, "status", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: BaseException) -> "str | None":
+    """Classify a task failure as a load signal.
+
+    Returns ``"throttle"`` for rate limiting (HTTP 429), ``"timeout"`` for
+    deadlines, ``"server"`` for provider-side 5xx/overload errors, and ``None``
+    for everything else (bad input, bugs in the task, ...). Provider SDKs expose
+    the status code under different attributes; without one, the message is
+    checked for a status code in HTTP/status context and for known phrases.
+    """
+    import asyncio
+
+    if isinstance(exc, (TaskTimeoutError, asyncio.TimeoutError, TimeoutError)):
+        return "timeout"
+
+    status = status_code_of(exc)
+    if status == 429:
+        return "throttle"
+    if status is not None and 500 <= status < 600:
+        return "server"
+
+    # Replayed errors keep the class name of the recorded exception.
+    error_type = getattr(exc, "error_type", None)
+    name = (error_type if isinstance(error_type, str) else type(exc).__name__).lower()
+    text = str(exc).lower()
+    match = _STATUS_IN_TEXT.search(text) if status is None else None
+    code = match.group(1) if match else None
+    if "ratelimit" in name or "rate limit" in text or "rate_limit" in text or "too many requests" in text or code == "429":
+        return "throttle"
+    if "timeout" in name or "timed out" in text:
+        return "timeout"
+    if "overloaded" in text or "service unavailable" in text or code is not None:
+        return "server"
+    return None
@@ -0,0 +1,107 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from qym.adapters import batch_task
+from qym.adapters.base import FunctionAdapter, LangChainAdapter
+from qym.core.batching import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting():
+    calls = []
+
+    async def call_batch(values):
+        calls.append(list(values))
+        return [v * 10 for v in values]
+
+    batcher = MicroBatcher(call_batch, max_size=3, max_wait=60)
+    results = await asyncio.wait_for(
+        asyncio.gather(*(batcher.submit(i) for i in range(3))), timeout=1
+    )
+
+    assert results == [0, 10, 20]
+    assert calls == [[0, 1, 2]]
+    assert batcher.snapshot()["full_batches"] == 1
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_sent_after_max_wait():
+    calls = []
+
+    async def call_batch(values):
+        calls.append(list(values))
+        return values
+
+    batcher = MicroBatcher(call_batch, max_size=10, max_wait=0.01)
+    assert await asyncio.gather(batcher.submit("a"), batcher.submit("b")) == ["a", "b"]
+    assert calls == [["a", "b"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_errors_reach_every_caller():
+    async def short(values):
+        return values[:1]
+
+    batcher = MicroBatcher(short, max_size=2, max_wait=0.01)
+    results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_function_adapter_calls_batch_task_with_list():
+    @batch_task
+    def upper_all(questions, model=None):
+        return [f"{q.upper()}@{model}" for q in questions]
+
+    adapter = FunctionAdapter(upper_all, None)
+    traces = [MagicMock(), MagicMock()]
+
+    assert adapter.supports_batch
+    assert await adapter.arun_batch(["a", "b"], traces, model_name="m") == ["A@m", "B@m"]
+    traces[1].update.assert_called_with(output="B@m")
+
+
+@pytest.mark.asyncio
+async def test_langchain_adapter_uses_abatch():
+    class Chain:
+        input_keys = ["question"]
+
+        async def ainvoke(self, chain_input):
+            raise AssertionError("abatch should be used")
+
+        async def abatch(self, chain_inputs, return_exceptions=False):
+            return [{"output": c["question"] * 2} for c in chain_inputs]
+
+    adapter = LangChainAdapter(Chain(), None)
+    assert adapter.supports_batch
+    assert await adapter.arun_batch(["a", "b"], [MagicMock(), MagicMock()]) == ["aa", "bb"]
+
+
+@pytest.mark.asyncio
+async def test_langchain_batch_failures_stay_with_their_item():
+    class Chain:
+        input_keys = ["question"]
+
+        async def abatch(self, chain_inputs, return_exceptions=False):
+            assert return_exceptions
+            return [
+                ValueError("bad input") if c["question"] == "bad" else {"output": c["question"] * 2}
+                for c in chain_inputs
+            ]
+
+    adapter = LangChainAdapter(Chain(), None)
+    traces = {q: MagicMock() for q in ("a", "bad", "b")}
+
+    async def call_batch(entries):
+        return await adapter.arun_batch([q for q, _ in entries], [t for _, t in entries])
+
+    batcher = MicroBatcher(call_batch, max_size=3, max_wait=60)
+    results = await asyncio.gather(
+        *(batcher.submit((q, t)) for q, t in traces.items()), return_exceptions=True
+    )
+
+    assert results[0] == "aa" and results[2] == "bb"
+    assert isinstance(results[1], ValueError)
+    traces["bad"].update.assert_called_with(output={"error": "bad input"})
@@ -44,3 +44,53 @@ def test_checkpoint_round_trip(tmp_path):
     score = result["scores"]["m1"]
     assert isinstance(score, dict)
     assert score["score"] == 0.75
+
+
+def _row(item_id, **extra):
+    return serialize_checkpoint_row(
+        dataset_name="ds",
+        run_name="run",
+        run_metadata={},
+        run_config={},
+        trace_id="",
+        item_id=item_id,
+        item_input="input",
+        item_metadata={},
+        output="out",
+        expected_output="exp",
+        time_seconds=0.1,
+        task_started_at_ms=None,
+        scores={"m1": 1.0},
+        **extra,
+    )
+
+
+def test_execution_meta_round_trip(tmp_path):
+    path = tmp_path / "checkpoint.csv"
+    writer = CheckpointWriter(str(path), metrics=["m1"])
+    writer.open()
+    writer.append_row(_row("item_0", execution_meta={"task_retries": 2, "backoff_seconds": 1.5}))
+    writer.append_row(_row("item_1"))
+    writer.close()
+
+    rows = list(iter_checkpoint_rows(str(path)))
+    _, first, _ = parse_checkpoint_row(rows[0], ["m1"])
+    _, second, _ = parse_checkpoint_row(rows[1], ["m1"])
+    assert first["execution_meta"] == {"task_retries": 2, "backoff_seconds": 1.5}
+    assert second["execution_meta"] == {}
+
+
+def test_writer_appends_with_existing_header(tmp_path):
+    """Resuming a checkpoint written without newer columns keeps rows aligned."""
+    path = tmp_path / "checkpoint.csv"
+    old_header = "dataset_name,run_name,item_id,output,m1_score\n"
+    path.write_text(old_header + "ds,run,item_0,out,1.0\n", encoding="utf-8")
+
+    writer = CheckpointWriter(str(path), metrics=["m1"])
+    writer.open()
+    writer.append_row(_row("item_1", execution_meta={"task_retries": 1}))
+    writer.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == old_header.strip()
+    assert lines[2] == "ds,run,item_1,out,1.0"
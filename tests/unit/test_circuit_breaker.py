@@ -0,0 +1,118 @@
+import asyncio
+import csv
+
+import pytest
+
+from qym.core.checkpoint import load_checkpoint_state
+from qym.core.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, is_endpoint_failure
+from qym.core.dataset import CsvDataset
+from qym.core.evaluator import Evaluator
+from qym.utils.errors import CircuitOpenError, TaskTimeoutError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_endpoint_failures_are_told_apart_from_task_bugs():
+    assert is_endpoint_failure(RuntimeError("HTTP 503 Service Unavailable"))
+    assert is_endpoint_failure(TaskTimeoutError(5))
+    assert is_endpoint_failure(ConnectionResetError())
+    assert not is_endpoint_failure(KeyError("answer"))
+    assert not is_endpoint_failure(CircuitOpenError("m"))
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_pauses_then_closes_after_a_good_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker("m", failure_threshold=3, open_seconds=10, clock=clock)
+    for _ in range(3):
+        breaker.record(await breaker.acquire(), failed=True)
+    assert breaker.state == "open"
+
+    waiter = asyncio.create_task(breaker.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    clock.now = 10
+    assert await breaker.acquire() == "probe"
+    assert not waiter.done()  # one probe at a time
+    breaker.record("probe", failed=False)
+    assert await waiter == "call"
+    assert breaker.snapshot()["state"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_on_error_rate_and_gives_up_after_failed_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(
+        "m", failure_threshold=100, error_rate=0.5, window=4, open_seconds=0, probe_attempts=2, clock=clock
+    )
+    for failed in (False, True, False, True):
+        breaker.record(await breaker.acquire(), failed=failed)
+    assert breaker.state == "open" and breaker.opens == 1
+
+    breaker.record(await breaker.acquire(), failed=True)
+    breaker.record(await breaker.acquire(), failed=True)
+    assert breaker.given_up
+    # A probe is still allowed after each cool-down; everyone else is skipped.
+    assert await breaker.acquire() == "probe"
+    with pytest.raises(CircuitOpenError):
+        await breaker.acquire()
+    assert breaker.snapshot()["skipped"] == 1
+    assert CircuitBreakerRegistry().get("m") is not CircuitBreakerRegistry().get("m")
+
+
+@pytest.mark.asyncio
+async def test_items_skipped_while_open_are_retried_on_resume(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(8)), encoding="utf-8")
+    calls = []
+
+    def down(question):
+        calls.append(question)
+        raise RuntimeError("503 Service Unavailable")
+
+    def answer(question):
+        return question.replace("q", "a")
+
+    config = {
+        "output_dir": str(tmp_path / "out"),
+        "model": "m",
+        "max_concurrency": 1,
+        "circuit_breaker": True,
+        "circuit_failure_threshold": 2,
+        "circuit_open_seconds": 0.01,
+        "circuit_probe_attempts": 1,
+    }
+    first = await Evaluator(
+        task=down,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config=config,
+        langfuse_client=None,
+    ).arun(show_tui=False)
+    # Two failures open the breaker, one failed probe gives up on the model.
+    assert len(calls) == 3 and len(first.errors) == 8
+    skipped = [e for e in first.errors.values() if e.get("execution_meta", {}).get("retryable")]
+    assert len(skipped) == 5
+
+    state = load_checkpoint_state(first.last_saved_path)
+    assert len(state.retryable_item_ids) == 5 and len(state.completed_item_ids) == 3
+
+    resumed = await Evaluator(
+        task=answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config={**config, "resume_from": first.last_saved_path},
+        langfuse_client=None,
+    ).arun(show_tui=False)
+    assert len(resumed.results) == 5 and len(resumed.errors) == 3
+    with open(first.last_saved_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 8 and len({row["item_id"] for row in rows}) == 8
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from qym.core.coalescing import SingleFlight, input_key
+
+
+def test_input_key_is_canonical():
+    assert input_key({"q": 1, "ctx": "c"}) == input_key({"ctx": "c", "q": 1})
+    assert input_key("a") != input_key("b")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_call():
+    flight = SingleFlight()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "out"
+
+    results = await asyncio.gather(*(flight.do("k", call) for _ in range(3)))
+    assert results == [("out", False), ("out", True), ("out", True)]
+    assert len(calls) == 1
+    assert flight.snapshot() == {"calls": 1, "coalesced": 2, "in_flight": 0}
+
+    # The key is released once the call finished.
+    assert await flight.do("k", call) == ("out", False)
+
+
+@pytest.mark.asyncio
+async def test_leader_error_reaches_every_waiter():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
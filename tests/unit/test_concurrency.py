@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from qym.core.concurrency import AdaptiveConcurrencyLimiter
+from qym.utils.errors import TaskTimeoutError, classify_error
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+def test_classify_error_signals():
+    assert classify_error(_RateLimited("slow down")) == "throttle"
+    assert classify_error(RuntimeError("Error code: 429 - rate limit exceeded")) == "throttle"
+    assert classify_error(TaskTimeoutError(5)) == "timeout"
+    assert classify_error(RuntimeError("503 Service Unavailable")) == "server"
+    assert classify_error(ValueError("bad input")) is None
+    assert classify_error(RuntimeError("HTTP 502 Bad Gateway")) == "server"
+    assert classify_error(RuntimeError("Server error '504 Gateway Timeout' for url")) == "server"
+    assert classify_error(RuntimeError("Error code: 529 - {'type': 'overloaded_error'}")) == "server"
+
+
+def test_classify_error_ignores_numbers_outside_status_context():
+    assert classify_error(ValueError("item 4290 failed: expected 5 got 503 tokens")) is None
+    assert classify_error(KeyError("row 1429")) is None
+    assert classify_error(ValueError("error in row 5021")) is None
+    assert classify_error(RuntimeError("got 502 results, expected 500")) is None
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_on_flat_latency_and_halves_on_throttle():
+    limiter = AdaptiveConcurrencyLimiter(16, min_limit=2)
+    assert limiter.limit == 2
+
+    for _ in range(6):
+        ticket = await limiter.acquire()
+        await limiter.release(ticket, latency=0.1)
+    assert limiter.limit == 8
+
+    # A burst of 429s from calls started before the cut counts once.
+    tickets = [await limiter.acquire() for _ in range(3)]
+    for ticket in tickets:
+        await limiter.release(ticket, error=_RateLimited())
+    assert limiter.limit == 4
+    assert limiter.snapshot()["decreases"] == 1
+    assert limiter.snapshot()["last_signal"] == "throttle"
+
+    # Non-load errors leave the limit alone.
+    ticket = await limiter.acquire()
+    await limiter.release(ticket, error=ValueError("bad input"))
+    assert limiter.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_limit_holds_when_latency_rises():
+    limiter = AdaptiveConcurrencyLimiter(16, min_limit=4, smoothing=1.0)
+    ticket = await limiter.acquire()
+    await limiter.release(ticket, latency=0.1)
+    assert limiter.limit == 5
+    ticket = await limiter.acquire()
+    await limiter.release(ticket, latency=1.0)
+    assert limiter.limit == 5
+
+
+@pytest.mark.asyncio
+async def test_acquire_blocks_at_limit():
+    limiter = AdaptiveConcurrencyLimiter(4, min_limit=1)
+    first = await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    await limiter.release(first, latency=0.1)
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.in_flight == 1
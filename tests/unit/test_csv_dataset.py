@@ -55,3 +55,17 @@ def test_csv_dataset_missing_required_column_has_clear_error(tmp_path):
     assert "column=input" in str(exc.value)
 
 
+
+
+def test_csv_dataset_iter_items_streams_rows(tmp_path):
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\nq0,a0\nq1,a1\n{bad,a2\n", encoding="utf-8")
+
+    ds = CsvDataset(p, input_col="q", expected_col="a")
+    rows = ds.iter_items()
+
+    assert next(rows).input == "q0"
+    assert next(rows).id == "row_000001"
+    with pytest.raises(CsvDatasetSchemaError):
+        next(rows)
+    assert ds._items is None
@@ -0,0 +1,170 @@
+import csv
+import multiprocessing
+import threading
+
+import pytest
+
+from qym.core.dataset import CsvDataset
+from qym.core.distributed import Coordinator, LeaseTable, _call, function_reference, load_reference, run_worker
+from qym.core.evaluator import Evaluator
+
+
+def answer(question):
+    return question.replace("q", "a")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lease_table_hands_out_ranges_and_requeues_unfinished_items():
+    table = LeaseTable(range(5), lease_size=2, lease_ttl=10)
+    first = table.acquire("w1")
+    second = table.acquire("w2")
+    assert first.indexes == [0, 1] and second.indexes == [2, 3]
+    table.complete(first.id, [0])
+    assert table.acquire("w1").indexes == [1]
+    assert table.acquire("w1").indexes == [4]
+    assert table.acquire("w1") is None
+    assert not table.finished
+
+
+def test_lease_table_reissues_expired_leases_and_skips_late_results():
+    clock = FakeClock()
+    table = LeaseTable(range(2), lease_size=2, lease_ttl=10, clock=clock)
+    dead = table.acquire("w1")
+    clock.now = 5
+    assert table.renew(dead.id)
+    clock.now = 16
+    retry = table.acquire("w2")
+    assert retry.indexes == [0, 1]
+    assert table.snapshot()["expired_leases"] == 1
+    assert not table.renew(dead.id)
+    # The presumed-dead worker delivers after all.
+    table.complete(dead.id, [0, 1])
+    assert table.finished
+
+
+def test_function_references_round_trip():
+    assert function_reference("exact_match") == {"name": "exact_match"}
+    assert load_reference(function_reference(answer))("q3") == "a3"
+    with pytest.raises(ValueError):
+        function_reference(lambda q: q)
+
+
+def test_coordinator_merges_rows_from_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(9)), encoding="utf-8")
+    evaluator = Evaluator(
+        task=answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config={"output_dir": str(tmp_path / "out"), "model": "m1"},
+        langfuse_client=None,
+    )
+    coordinator = Coordinator(evaluator, lease_size=2, lease_ttl=1.0)
+    host, port = coordinator.start()
+    address = f"{host}:{port}"
+    try:
+        # A worker that takes a lease and dies: the lease must be re-issued.
+        abandoned = _call(f"http://{address}", "/lease", {"worker": "dead"})["lease"]
+        ctx = multiprocessing.get_context("spawn")
+        workers = [
+            ctx.Process(target=run_worker, args=(address,), kwargs={"work_dir": str(tmp_path / f"w{i}")})
+            for i in range(2)
+        ]
+        for proc in workers:
+            proc.start()
+        result = coordinator.wait(timeout=120)
+        for proc in workers:
+            proc.join(timeout=30)
+    finally:
+        coordinator.stop()
+
+    assert len(abandoned["items"]) == 2
+    assert coordinator.status()["expired_leases"] >= 1
+    assert len(result.results) == 9 and not result.errors
+    assert all(r["scores"]["exact_match"] == 1.0 for r in result.results.values())
+    assert result.last_saved_path.startswith(str(tmp_path / "out" / "answer" / "m1"))
+    with open(result.last_saved_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(row["item_id"] for row in rows) == sorted(result.results)
+    assert {row["run_name"] for row in rows} == {evaluator.run_name}
+
+    # A restarted coordinator resumes from the run file and has nothing to lease.
+    resumed = Coordinator(
+        Evaluator(
+            task=answer,
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=["exact_match"],
+            config={"output_dir": str(tmp_path / "out"), "model": "m1", "resume_from": result.last_saved_path},
+            langfuse_client=None,
+        )
+    )
+    assert resumed.resumed == 9 and resumed.leases.finished
+
+
+def test_coordinator_requeues_rows_skipped_by_an_open_circuit(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\nq0,a0\nq1,a1\n", encoding="utf-8")
+    evaluator = Evaluator(
+        task=answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config={"output_dir": str(tmp_path / "out"), "model": "m1"},
+        langfuse_client=None,
+    )
+    coordinator = Coordinator(evaluator, lease_size=2)
+    host, port = coordinator.start()
+    url = f"http://{host}:{port}"
+    try:
+        lease = _call(url, "/lease", {"worker": "w1"})["lease"]
+        rows = [
+            {"item_id": lease["items"][0]["id"], "output": "a0", "exact_match_score": "1.0"},
+            {
+                "item_id": lease["items"][1]["id"],
+                "output": "ERROR: Skipped: circuit breaker open for m1",
+                "exact_match_score": "N/A",
+                "execution_meta": '{"retryable": true}',
+            },
+        ]
+        reply = _call(url, "/complete", {"lease": lease["id"], "rows": rows})
+        assert reply["recorded"] == 1 and reply["requeued"] == 1
+        again = _call(url, "/lease", {"worker": "w2"})["lease"]
+        assert [i["id"] for i in again["items"]] == [lease["items"][1]["id"]]
+        assert not coordinator.result.errors
+    finally:
+        coordinator.stop()
+
+
+def test_worker_does_not_leave_a_ui_server_per_lease(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(8)), encoding="utf-8")
+    evaluator = Evaluator(
+        task=answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config={"output_dir": str(tmp_path / "out"), "model": "m1"},
+        langfuse_client=None,
+    )
+    coordinator = Coordinator(evaluator, lease_size=1)
+    host, port = coordinator.start()
+    ui_threads = lambda: sum(1 for t in threading.enumerate() if t.name == "qym-ui")
+    before = ui_threads()
+    try:
+        evaluated = run_worker(f"{host}:{port}", task=answer, work_dir=str(tmp_path / "w"), max_leases=8)
+    finally:
+        coordinator.stop()
+
+    assert evaluated == 8
+    assert ui_threads() == before
@@ -0,0 +1,37 @@
+import random
+
+from qym.core.early_stop import EarlyStopper
+
+
+def test_stops_once_interval_is_narrow_enough():
+    rng = random.Random(0)
+    stopper = EarlyStopper(precision=0.05, min_items=10)
+    stopped = [stopper.observe({"acc": float(rng.random() < 0.8)}) for _ in range(2000)]
+    assert stopped.count(True) == 1
+    est = stopper.estimates()["acc"]
+    assert est["decision"] == "converged" and est["ci_half_width"] <= 0.05
+    assert stopper.stopped_at == stopped.index(True) + 1 < 2000
+    assert abs(est["mean"] - 0.8) < 0.1
+
+
+def test_threshold_is_decided_before_precision():
+    stopper = EarlyStopper(precision=None, threshold=0.5, min_items=20)
+    for i in range(100):
+        if stopper.observe({"acc": {"score": 1.0 if i % 10 else 0.0}}):
+            break
+    assert stopper.stopped_at == 20
+    assert stopper.reason == "acc pass"
+
+    failing = EarlyStopper(precision=None, threshold=0.9, min_items=20)
+    for i in range(100):
+        if failing.observe({"acc": 1.0 if i % 2 else 0.0}):
+            break
+    assert failing.reason == "acc fail"
+
+
+def test_waits_for_min_items_and_ignores_non_numeric_scores():
+    stopper = EarlyStopper(["acc"], min_items=30)
+    for _ in range(29):
+        assert not stopper.observe({"acc": 1.0, "label": "yes", "judge": {"error": "x"}})
+    assert stopper.observe({"acc": 1.0})
+    assert set(stopper.estimates()) == {"acc"}
@@ -1,7 +1,11 @@
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 from qym.core.evaluator import Evaluator
 from qym.core.dataset import CsvDataset
+from qym.adapters import batch_task
+from qym.metrics.registry import register_metric
 
 class TestEvaluator:
     def test_init(self, mock_task, mock_langfuse, mock_dataset):
@@ -85,3 +89,778 @@ class TestEvaluator:
         res = await evaluator._evaluate_item(0, item, tracker)
         assert res["success"] is True
         assert res["output"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_evaluate_item_task_timeout_marks_item(self, mock_task, mock_langfuse, mock_dataset):
+        """A task exceeding config.timeout is cancelled and reported as a timeout."""
+        import asyncio
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=mock_dataset,
+                metrics=[],
+                config={"run_name": "test-run", "timeout": 0.05},
+                langfuse_client=mock_langfuse
+            )
+
+        cancelled = asyncio.Event()
+
+        async def _hang(*args, **kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = _hang
+        evaluator._notify_observer = MagicMock()
+
+        item = MagicMock()
+        item.input = "slow"
+        tracker = MagicMock()
+
+        result = await evaluator._evaluate_item(0, item, tracker)
+
+        assert "timed out" in result["_error"]
+        tracker.fail_item_timeout.assert_called_once_with(0, 0.05)
+        tracker.fail_item.assert_not_called()
+        await asyncio.sleep(0)
+        assert cancelled.is_set()
+
+    @pytest.mark.asyncio
+    async def test_task_timeout_bounds_all_retries_of_an_item(self, mock_task, mock_langfuse, mock_dataset):
+        """With retries, timeout is still the item's deadline; attempt_timeout caps each attempt."""
+        import asyncio
+        import time
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=mock_dataset,
+                metrics=[],
+                config={
+                    "run_name": "test-run",
+                    "timeout": 0.3,
+                    "attempt_timeout": 0.1,
+                    "max_retries": 10,
+                    "retry_budget": 10,
+                    "retry_base_delay": 0.01,
+                    "retry_max_delay": 0.01,
+                },
+                langfuse_client=mock_langfuse
+            )
+        attempts = []
+
+        async def _slow(*args, **kwargs):
+            attempts.append(1)
+            await asyncio.sleep(10)
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = _slow
+        evaluator._notify_observer = MagicMock()
+        item = MagicMock()
+        item.input = "slow"
+        tracker = MagicMock()
+
+        started = time.perf_counter()
+        result = await evaluator._evaluate_item(0, item, tracker)
+
+        assert time.perf_counter() - started < 0.6
+        assert result["_error"] == "Task timed out after 0.3s"
+        # Attempts timed out after 0.1s and were retried until the item deadline.
+        assert 2 <= len(attempts) <= 3
+
+    @pytest.mark.asyncio
+    async def test_attempt_timeout_does_not_extend_a_single_attempt(self, mock_task, mock_langfuse, mock_dataset):
+        """Without retries or hedging, a longer attempt_timeout still stops at the item timeout."""
+        import asyncio
+        import time
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=mock_dataset,
+                metrics=[],
+                config={"run_name": "test-run", "timeout": 0.2, "attempt_timeout": 5},
+                langfuse_client=mock_langfuse
+            )
+
+        async def _slow(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = _slow
+        evaluator._notify_observer = MagicMock()
+        item = MagicMock()
+        item.input = "slow"
+        tracker = MagicMock()
+
+        started = time.perf_counter()
+        result = await evaluator._evaluate_item(0, item, tracker)
+
+        assert time.perf_counter() - started < 1
+        assert result["_error"] == "Task timed out after 0.2s"
+
+    @pytest.mark.asyncio
+    async def test_admission_wait_longer_than_timeout_is_not_charged(self, mock_task, mock_langfuse, mock_dataset):
+        """With retries on, waiting for a fair-share slot does not run the item deadline."""
+        import asyncio
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=mock_dataset,
+                metrics=[],
+                config={"run_name": "test-run", "timeout": 0.3, "max_retries": 1},
+                langfuse_client=mock_langfuse
+            )
+
+        class _SlowFairShare:
+            async def acquire(self):
+                await asyncio.sleep(0.5)
+
+            def release(self):
+                pass
+
+        async def _fast(*args, **kwargs):
+            await asyncio.sleep(0.05)
+            return "ok"
+
+        evaluator.fair_share = _SlowFairShare()
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = _fast
+        evaluator._notify_observer = MagicMock()
+        item = MagicMock()
+        item.input = "queued"
+        item.expected_output = None
+        tracker = MagicMock()
+
+        result = await evaluator._evaluate_item(0, item, tracker)
+
+        assert "_error" not in result
+        assert result["output"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_evaluate_item_metric_timeout_scores_error(self, mock_task, mock_langfuse, mock_dataset):
+        """Metrics still running at metric_timeout get an error score; the item completes."""
+        import asyncio
+
+        async def slow_metric(output, expected):
+            await asyncio.sleep(10)
+            return 1.0
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=mock_dataset,
+                metrics=[slow_metric],
+                config={"run_name": "test-run", "metric_timeout": 0.05},
+                langfuse_client=mock_langfuse
+            )
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = AsyncMock(return_value="out")
+        evaluator._notify_observer = MagicMock()
+
+        item = MagicMock()
+        item.input = "in"
+        tracker = MagicMock()
+
+        result = await evaluator._evaluate_item(0, item, tracker)
+
+        assert result["success"] is True
+        assert "timed out" in result["scores"]["slow_metric"]["error"]
+        tracker.complete_item.assert_called_once_with(0)
+
+    @pytest.mark.asyncio
+    async def test_evaluate_item_runs_metrics_concurrently(self, mock_task, mock_langfuse, mock_dataset):
+        """Metrics of one item overlap; scores keep the configured metric order."""
+        import asyncio
+
+        running = 0
+        peak = 0
+
+        async def _judge(score):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return score
+
+        async def judge_a(output, expected):
+            return await _judge(0.5)
+
+        async def judge_b(output, expected):
+            return await _judge(1.0)
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=mock_dataset,
+                metrics=[judge_a, judge_b],
+                config={"run_name": "test-run"},
+                langfuse_client=mock_langfuse
+            )
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = AsyncMock(return_value="out")
+        evaluator._notify_observer = MagicMock()
+
+        item = MagicMock()
+        item.input = "in"
+        result = await evaluator._evaluate_item(0, item, MagicMock())
+
+        assert peak == 2
+        assert list(result["scores"].keys()) == ["judge_a", "judge_b"]
+        assert result["scores"] == {"judge_a": 0.5, "judge_b": 1.0}
+
+    @pytest.mark.asyncio
+    async def test_arun_with_metric_pool_scores_every_item(self, tmp_path, mock_task, monkeypatch):
+        """With metric_concurrency set, metrics run in their own pool and all items are scored."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(6)), encoding="utf-8")
+        ds = CsvDataset(p, input_col="q", expected_col="a")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=ds,
+                metrics=["exact_match"],
+                config={
+                    "run_name": "pipelined",
+                    "max_concurrency": 3,
+                    "metric_concurrency": 1,
+                    "metric_queue_size": 1,
+                    "output_dir": str(tmp_path / "out"),
+                },
+                langfuse_client=None,
+            )
+
+        async def _echo(task_input, trace=None, **kwargs):
+            return task_input.replace("q", "a")
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = _echo
+
+        result = await evaluator.arun(show_tui=False)
+
+        assert result.total_items == 6
+        assert len(result.results) == 6
+        assert all(r["scores"]["exact_match"]["score"] == 1.0 for r in result.results.values())
+        stages = evaluator._run_stats()["stages"]
+        assert stages["task"]["processed"] == 6
+        assert stages["metric"]["processed"] == 6
+        assert stages["metric"]["workers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_evaluate_item_retries_transient_task_errors(self, mock_task, mock_langfuse, mock_dataset):
+        """Throttled attempts are retried and counted in the item's execution metadata."""
+
+        class RateLimitError(Exception):
+            status_code = 429
+            retry_after = 0
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=mock_dataset,
+                metrics=[],
+                config={"run_name": "test-run", "max_retries": 2},
+                langfuse_client=mock_langfuse
+            )
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = AsyncMock(side_effect=[RateLimitError("slow down"), "ok"])
+        evaluator._notify_observer = MagicMock()
+
+        item = MagicMock()
+        item.input = "q"
+        result = await evaluator._evaluate_item(0, item, MagicMock())
+
+        assert result["success"] is True
+        assert result["output"] == "ok"
+        assert result["execution_meta"] == {"task_retries": 1, "backoff_seconds": 0.0}
+
+    @pytest.mark.asyncio
+    async def test_arun_streams_dataset_through_bounded_queue(self, tmp_path, mock_task, monkeypatch):
+        """stream_dataset pulls items lazily and never materializes the dataset."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(20)), encoding="utf-8")
+        ds = CsvDataset(p, input_col="q", expected_col="a")
+        ds.get_items = MagicMock(side_effect=AssertionError("dataset was materialized"))
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=ds,
+                metrics=["exact_match"],
+                config={
+                    "run_name": "streamed",
+                    "max_concurrency": 2,
+                    "stream_dataset": True,
+                    "stream_queue_size": 1,
+                    "stream_ui_rows": 3,
+                    "output_dir": str(tmp_path / "out"),
+                },
+                langfuse_client=None,
+            )
+
+        async def _echo(task_input, trace=None, **kwargs):
+            return task_input.replace("q", "a")
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = _echo
+
+        result = await evaluator.arun(show_tui=False)
+
+        assert len(result.results) == 20
+        assert evaluator.run_metadata["total_items"] == 20
+        assert all(r["scores"]["exact_match"]["score"] == 1.0 for r in result.results.values())
+
+    @pytest.mark.asyncio
+    async def test_arun_sends_batch_task_micro_batches(self, tmp_path, monkeypatch):
+        """A @batch_task function is called with lists of inputs; outputs land on their items."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(7)), encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        batch_sizes = []
+
+        @batch_task
+        async def answer_all(questions):
+            batch_sizes.append(len(questions))
+            return [q.replace("q", "a") for q in questions]
+
+        evaluator = Evaluator(
+            task=answer_all,
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=["exact_match"],
+            config={
+                "run_name": "batched",
+                "max_concurrency": 4,
+                "task_batch_size": 3,
+                "task_batch_wait": 0.01,
+                "output_dir": str(tmp_path / "out"),
+            },
+            langfuse_client=None,
+        )
+
+        result = await evaluator.arun(show_tui=False)
+
+        assert len(result.results) == 7
+        assert all(r["scores"]["exact_match"]["score"] == 1.0 for r in result.results.values())
+        assert sum(batch_sizes) == 7 and max(batch_sizes) <= 3 and len(batch_sizes) < 7
+        assert evaluator._run_stats()["batching"]["items"] == 7
+
+    @pytest.mark.asyncio
+    async def test_arun_scores_batch_metrics_in_batches(self, tmp_path, mock_task, monkeypatch):
+        """Batch metrics get lists of finished items and their scores fan back out per item."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(8)), encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        batch_sizes = []
+
+        def same_length(outputs, expecteds):
+            batch_sizes.append(len(outputs))
+            return [float(len(o) == len(e)) for o, e in zip(outputs, expecteds)]
+
+        register_metric("same_length_batch", same_length, batch=True)
+
+        with patch("qym.core.evaluator.auto_detect_task"):
+            evaluator = Evaluator(
+                task=mock_task,
+                dataset=CsvDataset(p, input_col="q", expected_col="a"),
+                metrics=["same_length_batch"],
+                config={
+                    "run_name": "batch-metric",
+                    "max_concurrency": 4,
+                    "metric_batch_size": 4,
+                    "metric_batch_wait": 0.01,
+                    "output_dir": str(tmp_path / "out"),
+                },
+                langfuse_client=None,
+            )
+
+        async def _echo(task_input, trace=None, **kwargs):
+            return task_input.replace("q", "a")
+
+        evaluator.task_adapter = MagicMock()
+        evaluator.task_adapter.arun = _echo
+
+        result = await evaluator.arun(show_tui=False)
+
+        assert len(result.results) == 8
+        assert all(r["scores"]["same_length_batch"] == 1.0 for r in result.results.values())
+        assert sum(batch_sizes) == 8 and len(batch_sizes) < 8
+        assert evaluator._run_stats()["metric_batching"]["same_length_batch"]["items"] == 8
+
+    @pytest.mark.asyncio
+    async def test_arun_serves_repeat_runs_from_task_cache(self, tmp_path, monkeypatch):
+        """A rerun with task_cache on skips the task and marks rows as cached."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nq0,a0\nq1,a1\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        calls = []
+
+        def answer(question):
+            calls.append(question)
+            return question.replace("q", "a")
+
+        async def run(name):
+            evaluator = Evaluator(
+                task=answer,
+                dataset=CsvDataset(p, input_col="q", expected_col="a"),
+                metrics=["exact_match"],
+                model="openai/gpt-4o",
+                config={"run_name": name, "task_cache": "on", "output_dir": str(tmp_path / "out")},
+                langfuse_client=None,
+            )
+            return evaluator, await evaluator.arun(show_tui=False)
+
+        await run("first")
+        evaluator, result = await run("second")
+
+        assert sorted(calls) == ["q0", "q1"]
+        assert all(r["execution_meta"] == {"cached": True} for r in result.results.values())
+        assert all(r["scores"]["exact_match"]["score"] == 1.0 for r in result.results.values())
+        assert result.get_timing_stats()["total"] == 0.0
+        assert evaluator._run_stats()["task_cache"]["hits"] == 2
+        with open(result.last_saved_path, encoding="utf-8") as f:
+            assert f.read().count('{""cached"": true}') == 2
+
+    @pytest.mark.asyncio
+    async def test_consecutive_runs_use_their_own_rate_limits(self, tmp_path, monkeypatch):
+        """A finished run's stricter limit does not carry over to the next run."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nq0,a0\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+        async def run(name, rpm):
+            evaluator = Evaluator(
+                task=lambda question: question.replace("q", "a"),
+                dataset=CsvDataset(p, input_col="q", expected_col="a"),
+                metrics=["exact_match"],
+                model="limits-test/model",
+                config={
+                    "run_name": name,
+                    "rate_limits": {"limits-test": {"rpm": rpm}},
+                    "output_dir": str(tmp_path / "out"),
+                },
+                langfuse_client=None,
+            )
+            await evaluator.arun(show_tui=False)
+            return evaluator._run_stats()["rate_limits"]["limits-test"]["rpm"]
+
+        assert await run("strict", 60) == 60
+        assert await run("relaxed", 6000) == 6000
+
+    @pytest.mark.asyncio
+    async def test_empty_dataset_opens_no_caches_or_pools(self, tmp_path, monkeypatch):
+        """An empty run returns before any cache, recorder or worker pool is created."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        evaluator = Evaluator(
+            task=lambda question: question,
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=["exact_match"],
+            config={
+                "run_name": "empty",
+                "task_cache": "on",
+                "metric_processes": 1,
+                "output_dir": str(tmp_path / "out"),
+            },
+            langfuse_client=None,
+        )
+
+        result = await evaluator.arun(show_tui=False)
+
+        assert not result.results
+        assert evaluator._task_cache is None and evaluator._metric_process_pool is None
+        assert not (tmp_path / "out" / "task_cache.sqlite").exists()
+
+    @pytest.mark.asyncio
+    async def test_task_cache_keeps_configured_instances_apart(self, tmp_path, monkeypatch):
+        """Instances of one class are only cached under an explicit task_cache_key."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nq0,a0\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+        class Prompted:
+            def __init__(self, prompt):
+                self.prompt = prompt
+
+            def __call__(self, question):
+                return f"{self.prompt}:{question}"
+
+        async def run(prompt, **config):
+            evaluator = Evaluator(
+                task=Prompted(prompt),
+                dataset=CsvDataset(p, input_col="q", expected_col="a"),
+                metrics=["exact_match"],
+                config={"run_name": prompt, "task_cache": "on", "output_dir": str(tmp_path / "out"), **config},
+                langfuse_client=None,
+            )
+            result = await evaluator.arun(show_tui=False)
+            return evaluator, [r["output"] for r in result.results.values()]
+
+        evaluator, outputs = await run("A")
+        assert evaluator._task_cache is None and outputs == ["A:q0"]
+        assert (await run("B"))[1] == ["B:q0"]
+
+        await run("A", task_cache_key="prompt-a")
+        evaluator, outputs = await run("B", task_cache_key="prompt-b")
+        assert outputs == ["B:q0"] and evaluator._run_stats()["task_cache"]["hits"] == 0
+        evaluator, outputs = await run("A2", task_cache_key="prompt-a")
+        assert outputs == ["A:q0"] and evaluator._run_stats()["task_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_task_cache_errors_do_not_fail_items(self, tmp_path, monkeypatch):
+        """A locked cache database is logged; the task output is still recorded."""
+        import sqlite3
+
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nq0,a0\nq1,a1\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr("qym.core.task_cache.TaskCache.put", locked)
+        evaluator = Evaluator(
+            task=lambda question: question.replace("q", "a"),
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=["exact_match"],
+            config={"run_name": "locked", "task_cache": "on", "output_dir": str(tmp_path / "out")},
+            langfuse_client=None,
+        )
+
+        result = await evaluator.arun(show_tui=False)
+
+        assert len(result.results) == 2 and not result.errors
+
+    @pytest.mark.asyncio
+    async def test_arun_reuses_cached_metric_scores(self, tmp_path, mock_task, monkeypatch):
+        """Metrics opted into metric_cache are not re-scored on a rerun."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nq0,a0\nq1,a1\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        judged = []
+
+        async def judge(output, expected):
+            judged.append(output)
+            return {"score": 1.0, "metadata": {"reason": "match"}}
+
+        async def run(name):
+            with patch("qym.core.evaluator.auto_detect_task"):
+                evaluator = Evaluator(
+                    task=mock_task,
+                    dataset=CsvDataset(p, input_col="q", expected_col="a"),
+                    metrics=[judge, "exact_match"],
+                    config={
+                        "run_name": name,
+                        "metric_cache": ["judge"],
+                        "output_dir": str(tmp_path / "out"),
+                    },
+                    langfuse_client=None,
+                )
+
+            async def _echo(task_input, trace=None, **kwargs):
+                return task_input.replace("q", "a")
+
+            evaluator.task_adapter = MagicMock()
+            evaluator.task_adapter.arun = _echo
+            return await evaluator.arun(show_tui=False)
+
+        await run("first")
+        result = await run("second")
+
+        assert len(judged) == 2
+        assert all(r["scores"]["judge"]["score"] == 1.0 for r in result.results.values())
+        assert result.metric_cache_stats == {"judge": {"hits": 2, "misses": 0}}
+        assert "judge: 2 hits, 0 misses" in result.summary()
+
+    @pytest.mark.asyncio
+    async def test_metric_cache_errors_keep_computed_scores(self, tmp_path, monkeypatch):
+        """A locked metric cache is logged; the score already computed is kept."""
+        import sqlite3
+
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nq0,a0\nq1,a1\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+        def locked(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr("qym.core.metric_cache.MetricCache.get", locked)
+        monkeypatch.setattr("qym.core.metric_cache.MetricCache.put", locked)
+
+        async def judge(output, expected):
+            return {"score": 1.0}
+
+        evaluator = Evaluator(
+            task=lambda question: question.replace("q", "a"),
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=[judge],
+            config={"run_name": "locked", "metric_cache": ["judge"], "output_dir": str(tmp_path / "out")},
+            langfuse_client=None,
+        )
+
+        result = await evaluator.arun(show_tui=False)
+
+        assert [r["scores"]["judge"] for r in result.results.values()] == [{"score": 1.0}] * 2
+
+    @pytest.mark.asyncio
+    async def test_arun_coalesces_duplicate_inputs(self, tmp_path, monkeypatch):
+        """Items with the same input share one task call but keep their own scores."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nsame,ANSWER\nsame,other\nq2,ANSWER\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        calls = []
+
+        async def answer(question):
+            calls.append(question)
+            await asyncio.sleep(0.05)
+            return "ANSWER"
+
+        evaluator = Evaluator(
+            task=answer,
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=["exact_match"],
+            config={"coalesce_inputs": True, "output_dir": str(tmp_path / "out")},
+            langfuse_client=None,
+        )
+        result = await evaluator.arun(show_tui=False)
+
+        assert sorted(calls) == ["q2", "same"]
+        assert result.coalesced_calls == 1
+        assert len(result.results) == 3
+        scores = sorted(r["scores"]["exact_match"]["score"] for r in result.results.values())
+        assert scores == [0.0, 1.0, 1.0]
+        assert sum(bool(r["execution_meta"].get("coalesced")) for r in result.results.values()) == 1
+        assert "1 task calls saved" in result.summary()
+
+    @pytest.mark.asyncio
+    async def test_arun_stops_early_once_estimates_converge(self, tmp_path, monkeypatch):
+        """Early stop scores a random subset and records the sample size."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(200)), encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        calls = []
+
+        def answer(question):
+            calls.append(question)
+            return question.replace("q", "a")
+
+        evaluator = Evaluator(
+            task=answer,
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=["exact_match"],
+            config={
+                "max_concurrency": 2,
+                "early_stop": True,
+                "early_stop_min_items": 20,
+                "early_stop_seed": 7,
+                "output_dir": str(tmp_path / "out"),
+            },
+            langfuse_client=None,
+        )
+        result = await evaluator.arun(show_tui=False)
+
+        assert result.early_stopped
+        assert 20 <= result.early_stop["sample_size"] == result.total_items < 30
+        assert result.early_stop["total_items"] == 200
+        assert result.early_stop["metrics"]["exact_match"]["decision"] == "converged"
+        # Random order, not the first rows of the file.
+        assert calls[:20] != [f"q{i}" for i in range(20)]
+        assert "Early Stopped: after" in result.summary()
+
+    @pytest.mark.asyncio
+    async def test_arun_schedules_historically_slow_items_first(self, tmp_path, monkeypatch):
+        """schedule='longest_first' starts items by past latency, slowest first."""
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\nfast,x\nslow,x\nmedium,x\n", encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        delays = {"fast": 0.0, "slow": 0.06, "medium": 0.03}
+        calls = []
+
+        async def answer(question):
+            calls.append(question)
+            await asyncio.sleep(delays[question])
+            return "x"
+
+        async def run(name, schedule):
+            evaluator = Evaluator(
+                task=answer,
+                dataset=CsvDataset(p, input_col="q", expected_col="a"),
+                metrics=["exact_match"],
+                config={
+                    "run_name": name,
+                    "max_concurrency": 1,
+                    "schedule": schedule,
+                    "output_dir": str(tmp_path / "out"),
+                },
+                langfuse_client=None,
+            )
+            return evaluator, await evaluator.arun(show_tui=False)
+
+        await run("history", "dataset")
+        assert calls == ["fast", "slow", "medium"]
+        calls.clear()
+        evaluator, _ = await run("scheduled", "longest_first")
+
+        assert calls == ["slow", "medium", "fast"]
+        assert evaluator._run_stats()["schedule"]["from_history"] == 3
+
+    @pytest.mark.asyncio
+    async def test_runner_caps_in_flight_calls_across_runs(self, tmp_path, monkeypatch):
+        """global_concurrency bounds task calls of all runs together."""
+        from qym.core.multi_runner import MultiModelRunner
+
+        p = tmp_path / "qa.csv"
+        p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(6)), encoding="utf-8")
+        monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+        monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+        state = {"in_flight": 0, "peak": 0}
+
+        async def answer(question):
+            state["in_flight"] += 1
+            state["peak"] = max(state["peak"], state["in_flight"])
+            await asyncio.sleep(0.01)
+            state["in_flight"] -= 1
+            return question.replace("q", "a")
+
+        runs = [
+            {
+                "name": f"run-{model}",
+                "task": answer,
+                "dataset": CsvDataset(p, input_col="q", expected_col="a"),
+                "metrics": ["exact_match"],
+                "model": model,
+                "config": {"output_dir": str(tmp_path / "out")},
+            }
+            for model in ("m1", "m2", "m3")
+        ]
+        runner = MultiModelRunner.from_runs(runs)
+        results = await runner.arun(show_tui=False, auto_save=False, global_concurrency=2)
+
+        assert state["peak"] == 2
+        assert all(r.total_items == 6 and r.success_rate == 1.0 for r in results)
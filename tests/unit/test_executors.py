@@ -0,0 +1,225 @@
+import asyncio
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from qym.adapters.base import FunctionAdapter
+from qym.core.dataset import CsvDataset
+from qym.core.evaluator import Evaluator, NullTrace
+from qym.core.executors import (
+    CpuProfiler,
+    InstrumentedThreadPoolExecutor,
+    IsolatedTaskPool,
+    compute_metric_batch,
+)
+from qym.metrics import cpu_bound
+from qym.metrics.builtin import fuzzy_match
+from qym.utils.errors import TaskExecutionError, classify_error
+
+
+def test_snapshot_tracks_active_and_completed():
+    executor = InstrumentedThreadPoolExecutor(2, thread_name_prefix="test")
+    release = threading.Event()
+    started = threading.Event()
+
+    def work():
+        started.set()
+        release.wait(5)
+        return 1
+
+    future = executor.submit(work)
+    started.wait(5)
+    snap = executor.snapshot()
+    assert snap["size"] == 2
+    assert snap["active"] == 1
+    assert snap["utilization"] == 0.5
+
+    release.set()
+    assert future.result(5) == 1
+    assert executor.snapshot()["completed"] == 1
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_function_adapter_uses_assigned_executor():
+    executor = InstrumentedThreadPoolExecutor(1, thread_name_prefix="qym-task")
+    adapter = FunctionAdapter(lambda question: threading.current_thread().name, None)
+    adapter.executor = executor
+
+    thread_name = await adapter.arun("q", NullTrace())
+
+    assert thread_name.startswith("qym-task")
+    assert executor.snapshot()["completed"] == 1
+    executor.shutdown()
+
+
+def test_cpu_profiler_detects_busy_metrics():
+    profiler = CpuProfiler(min_samples=2, min_cpu_seconds=0.001)
+
+    def busy():
+        end = time.thread_time() + 0.005
+        while time.thread_time() < end:
+            pass
+
+    def idle():
+        time.sleep(0.005)
+
+    for _ in range(2):
+        profiler.measure("busy", busy)
+        profiler.measure("idle", idle)
+
+    assert profiler.is_cpu_bound("busy")
+    assert not profiler.is_cpu_bound("idle")
+    assert not profiler.is_cpu_bound("unseen")
+
+
+def test_metric_batch_maps_errors_like_sync_metrics():
+    def broken(output):
+        raise ValueError("boom")
+
+    results = compute_metric_batch(
+        {"fuzzy_match": fuzzy_match, "broken": broken}, "abc", "abd", None
+    )
+    assert 0 < results["fuzzy_match"] < 1
+    assert results["broken"]["score"] == 0
+    assert results["broken"]["error"] == "boom"
+
+
+def _csv_evaluator(tmp_path, metrics):
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(3)), encoding="utf-8")
+    with patch("qym.core.evaluator.auto_detect_task"):
+        evaluator = Evaluator(
+            task=lambda q: q,
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=metrics,
+            config={"metric_processes": 1, "output_dir": str(tmp_path / "out")},
+            langfuse_client=None,
+        )
+
+    async def _echo(task_input, trace=None, **kwargs):
+        return task_input.replace("q", "a")
+
+    evaluator.task_adapter = MagicMock()
+    evaluator.task_adapter.arun = _echo
+    return evaluator
+
+
+@pytest.mark.asyncio
+async def test_cpu_bound_metrics_run_in_process_pool(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    evaluator = _csv_evaluator(tmp_path, ["fuzzy_match"])
+
+    result = await evaluator.arun(show_tui=False)
+
+    assert all(r["scores"]["fuzzy_match"] == 1.0 for r in result.results.values())
+    assert evaluator._run_stats()["executors"]["metric_processes"]["completed"] == 3
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_cpu_bound_metric_falls_back_to_threads(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+    @cpu_bound
+    def local_length(output):
+        return len(output)
+
+    evaluator = _csv_evaluator(tmp_path, [local_length])
+
+    result = await evaluator.arun(show_tui=False)
+
+    assert all(r["scores"]["local_length"] == 2 for r in result.results.values())
+    assert "local_length" in evaluator._process_fallback
+
+
+class KeywordOnlyStatusError(Exception):
+    """Pickles but does not unpickle, like provider SDK errors with keyword-only arguments."""
+
+    def __init__(self, message, *, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def isolated_answer(question):
+    if question == "hang":
+        time.sleep(60)
+    if question == "crash":
+        os._exit(3)
+    if question == "bad":
+        raise RuntimeError("HTTP 503 from backend")
+    if question == "throttled":
+        raise KeywordOnlyStatusError("Rate limited", status_code=429)
+    return question.replace("q", "a"), os.getpid()
+
+
+@pytest.mark.asyncio
+async def test_isolated_pool_returns_outputs_errors_and_recycles_workers():
+    pool = IsolatedTaskPool(isolated_answer, size=1, max_items=2)
+    try:
+        (first, pid1), (second, pid2) = [await pool.call((q,), {}) for q in ("q1", "q2")]
+        assert (first, second) == ("a1", "a2") and pid1 == pid2 != os.getpid()
+        with pytest.raises(RuntimeError, match="503"):
+            await pool.call(("bad",), {})
+        assert pool.snapshot()["recycled"] == 1 and pool.started == 2
+        with pytest.raises(TaskExecutionError, match="exit code 3"):
+            await pool.call(("crash",), {})
+        assert (await pool.call(("q3",), {}))[0] == "a3"
+        assert pool.snapshot()["crashed"] == 1
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_isolated_pool_survives_errors_that_do_not_unpickle():
+    pool = IsolatedTaskPool(isolated_answer, size=1)
+    try:
+        for _ in range(3):
+            with pytest.raises(TaskExecutionError, match="KeywordOnlyStatusError") as caught:
+                await pool.call(("throttled",), {})
+            assert caught.value.status_code == 429
+            assert classify_error(caught.value) == "throttle"
+        assert pool.started == 1 and pool.snapshot()["workers"] == 1
+        assert (await pool.call(("q1",), {}))[0] == "a1"
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_isolated_pool_kills_a_hung_call_at_the_deadline():
+    pool = IsolatedTaskPool(isolated_answer, size=1)
+    try:
+        await pool.call(("q0",), {})  # worker is up
+        started = time.perf_counter()
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(pool.call(("hang",), {}), 0.5)
+        assert time.perf_counter() - started < 5
+        assert pool.snapshot()["killed"] == 1
+        assert (await pool.call(("q1",), {}))[0] == "a1"
+    finally:
+        pool.close()
+
+
+@pytest.mark.asyncio
+async def test_task_processes_turn_hung_calls_into_timeout_errors(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\nq1,a1\nhang,x\nq2,a2\n", encoding="utf-8")
+    evaluator = Evaluator(
+        task=isolated_answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=[lambda output: 1.0],
+        config={"task_processes": 2, "timeout": 5, "output_dir": str(tmp_path / "out")},
+        langfuse_client=None,
+    )
+
+    result = await evaluator.arun(show_tui=False)
+
+    assert len(result.results) == 2
+    assert [e["error"] for e in result.errors.values()] == ["Task timed out after 5s"]
+    assert evaluator._run_stats()["executors"]["task_processes"]["killed"] == 1
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from qym.core.fair_share import FairShareScheduler
+
+
+async def _saturate(scheduler, flows, per_flow, hold=0.005):
+    """Keep every flow busy and return the order slots were granted in."""
+    grants = []
+
+    async def worker(flow):
+        for _ in range(per_flow):
+            await flow.acquire()
+            grants.append(flow.run_id)
+            await asyncio.sleep(hold)
+            flow.release()
+
+    await asyncio.gather(*(worker(flow) for flow in flows for _ in range(2)))
+    return grants
+
+
+@pytest.mark.asyncio
+async def test_slots_follow_run_weights():
+    scheduler = FairShareScheduler(1)
+    heavy = scheduler.register("heavy", weight=3.0)
+    light = scheduler.register("light", weight=1.0)
+    grants = await _saturate(scheduler, [heavy, light], per_flow=20)
+    first = grants[:20]
+    assert 13 <= first.count("heavy") <= 17
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_model_weights_split_before_runs():
+    scheduler = FairShareScheduler(1, model_weights={"gpt": 1.0, "claude": 1.0})
+    flows = [
+        scheduler.register("gpt-a", model="gpt"),
+        scheduler.register("gpt-b", model="gpt"),
+        scheduler.register("claude-a", model="claude"),
+    ]
+    grants = await _saturate(scheduler, flows, per_flow=20)
+    first = grants[:24]
+    # Each model gets half, so the lone claude run gets as much as both gpt runs.
+    assert 10 <= first.count("claude-a") <= 14
+
+
+@pytest.mark.asyncio
+async def test_capacity_is_global_and_idle_runs_do_not_hold_share():
+    scheduler = FairShareScheduler(3)
+    busy = scheduler.register("busy")
+    scheduler.register("idle")
+    peak = 0
+
+    async def call():
+        nonlocal peak
+        await busy.acquire()
+        peak = max(peak, scheduler.in_flight)
+        await asyncio.sleep(0.01)
+        busy.release()
+
+    await asyncio.gather(*(call() for _ in range(9)))
+    assert peak == 3
+    assert scheduler.snapshot()["runs"]["busy"]["granted"] == 9
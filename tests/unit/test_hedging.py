@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from qym.core.hedging import Hedger, call_hedged
+
+
+def _warm(hedger, latency=0.01, n=20):
+    for _ in range(n):
+        hedger.record_latency(latency)
+
+
+def test_no_hedge_without_history():
+    hedger = Hedger(0.95, min_samples=5)
+    assert hedger.delay() is None
+    _warm(hedger, n=5)
+    assert hedger.delay() == pytest.approx(0.01)
+
+
+@pytest.mark.asyncio
+async def test_hedge_wins_and_cancels_straggler():
+    hedger = Hedger(0.95, max_extra=1.0)
+    _warm(hedger)
+    cancelled = asyncio.Event()
+    calls = {"n": 0}
+
+    async def call():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return f"call-{calls['n']}"
+
+    result, from_hedge = await call_hedged(call, hedger)
+    assert (result, from_hedge) == ("call-2", True)
+    await asyncio.sleep(0)
+    assert cancelled.is_set()
+    assert hedger.snapshot()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_extra_load_cap_blocks_hedges():
+    hedger = Hedger(0.95, max_extra=0.0)
+    _warm(hedger)
+    calls = {"n": 0}
+
+    async def call():
+        calls["n"] += 1
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert await call_hedged(call, hedger) == ("primary", False)
+    assert calls["n"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_hedge_falls_back_to_primary():
+    hedger = Hedger(0.95, max_extra=1.0)
+    _warm(hedger)
+    calls = {"n": 0}
+
+    async def call():
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise RuntimeError("hedge failed")
+        await asyncio.sleep(0.05)
+        return "primary"
+
+    assert await call_hedged(call, hedger) == ("primary", False)
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+from qym.core.dataset import CsvDataset
+from qym.core.evaluator import Evaluator
+from qym.core.load import LoadTimeline, arrival_offsets, target_rate_at
+
+
+def _take(iterator, n):
+    return [next(iterator) for _ in range(n)]
+
+
+def test_constant_arrivals_are_evenly_spaced():
+    assert _take(arrival_offsets(4.0), 3) == [0.0, 0.25, 0.5]
+
+
+def test_poisson_arrivals_average_the_target_rate():
+    offsets = _take(arrival_offsets(10.0, pattern="poisson", seed=7), 2001)
+    assert 9.0 < 2000 / offsets[-1] < 11.0
+    assert offsets == sorted(offsets)
+
+
+def test_ramp_arrivals_follow_the_rising_rate():
+    offsets = _take(arrival_offsets(10.0, pattern="ramp", ramp_from=0.0, ramp_seconds=10.0), 60)
+    # 50 items are sent during the ramp, then 10 per second.
+    assert offsets[50] == pytest.approx(10.0)
+    assert offsets[59] == pytest.approx(10.9)
+    assert offsets[1] - offsets[0] > offsets[50] - offsets[49]
+    assert target_rate_at(5.0, 10.0, pattern="ramp", ramp_seconds=10.0) == 5.0
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_timeline_excludes_warmup_and_counts_queueing_in_latency():
+    clock = FakeClock()
+    timeline = LoadTimeline(2.0, warmup_seconds=1.0, clock=clock)
+    timeline.start()
+    for i in range(6):
+        clock.now = i * 0.5
+        timeline.record_send(i * 0.5, capped=i == 5)
+    clock.now = 3.2
+    for i in range(6):
+        timeline.record_done(i * 0.5, error=i == 4)
+
+    summary = timeline.summary()
+    assert summary["sent"] == 6 and summary["measured"] == 4
+    assert summary["achieved_rate"] == 2.0
+    assert summary["error_rate"] == 0.25
+    assert summary["latency_p50"] == pytest.approx(1.7)
+    assert summary["capped"] == 1
+    rows = timeline.timeline()
+    assert [row["sent"] for row in rows] == [2, 2, 2, 0]
+    assert rows[3]["completed"] == 6 and rows[3]["errors"] == 1
+    assert rows[0]["warmup"] and not rows[1]["warmup"]
+
+
+@pytest.mark.asyncio
+async def test_arun_sends_items_at_the_target_rate(tmp_path, monkeypatch):
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(10)), encoding="utf-8")
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+    async def answer(question):
+        await asyncio.sleep(0.2)
+        return question.replace("q", "a")
+
+    result = await Evaluator(
+        task=answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config={"load_rate": 20, "max_concurrency": 10, "output_dir": str(tmp_path / "out")},
+        langfuse_client=None,
+    ).arun(show_tui=False)
+
+    load = result.load_test
+    assert load["sent"] == 10 and load["measured"] == 10
+    # Open loop: items go out every 50ms although each takes 200ms.
+    assert 15 <= load["achieved_rate"] <= 21
+    assert load["latency_p50"] >= 0.2
+    assert sum(row["sent"] for row in load["timeline"]) == 10
+    load_path = os.path.splitext(result.last_saved_path)[0] + ".load.json"
+    with open(load_path, encoding="utf-8") as f:
+        assert json.load(f)["sent"] == 10
+    assert "Load Test:" in result.summary()
+
+
+@pytest.mark.asyncio
+async def test_load_latency_stops_when_the_task_returns(tmp_path, monkeypatch):
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(4)), encoding="utf-8")
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+
+    async def answer(question):
+        await asyncio.sleep(0.05)
+        return question.replace("q", "a")
+
+    async def slow_judge(output, expected):
+        await asyncio.sleep(0.5)
+        return 1.0
+
+    result = await Evaluator(
+        task=answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=[slow_judge],
+        config={"load_rate": 20, "max_concurrency": 10, "output_dir": str(tmp_path / "out")},
+        langfuse_client=None,
+    ).arun(show_tui=False)
+
+    load = result.load_test
+    assert load["measured"] == 4
+    assert 0.05 <= load["latency_p99"] < 0.4
+    assert load["capped"] == 0
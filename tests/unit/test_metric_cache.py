@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from qym.core.dataset import CsvDataset
+from qym.core.evaluator import Evaluator
+from qym.core.metric_cache import MetricCache, metric_cache_key
+from qym.metrics import cache_metric
+from qym.metrics.markers import cache_version
+
+
+def test_key_covers_metric_version_and_arguments():
+    key = metric_cache_key("judge", "v1", "out", "exp", {"q": 1, "ctx": "c"})
+    assert key == metric_cache_key("judge", "v1", "out", "exp", {"ctx": "c", "q": 1})
+    assert key != metric_cache_key("judge", "v2", "out", "exp", {"q": 1, "ctx": "c"})
+    assert key != metric_cache_key("judge", "v1", "other", "exp", {"q": 1, "ctx": "c"})
+
+
+def test_counts_hits_and_misses_per_metric(tmp_path):
+    cache = MetricCache(str(tmp_path / "m.sqlite"))
+    assert cache.get("judge", "k") == (False, None)
+    cache.put("judge", "k", {"score": 0.5, "metadata": {"reason": "ok"}})
+    assert cache.get("judge", "k") == (True, {"score": 0.5, "metadata": {"reason": "ok"}})
+    assert cache.snapshot() == {"judge": {"hits": 1, "misses": 1}}
+
+
+def test_hits_do_not_commit(tmp_path):
+    cache = MetricCache(str(tmp_path / "m.sqlite"))
+    cache.put("judge", "k", 1.0)
+    changes = cache._conn.total_changes
+    assert cache.get("judge", "k") == (True, 1.0)
+    assert cache._conn.total_changes == changes and not cache._conn.in_transaction
+    cache.close()
+
+
+def test_lru_and_ttl_eviction(tmp_path):
+    cache = MetricCache(str(tmp_path / "m.sqlite"), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put("m", key, 1.0)
+        time.sleep(0.01)
+    cache.get("m", "a")
+    cache.prune()
+    assert cache.get("m", "b") == (False, None)
+    assert cache.get("m", "a")[0] and cache.get("m", "c")[0]
+
+    expiring = MetricCache(str(tmp_path / "ttl.sqlite"), ttl=0.05)
+    expiring.put("m", "k", 1.0)
+    time.sleep(0.1)
+    assert expiring.get("m", "k") == (False, None)
+
+
+def test_cache_metric_marker_records_version():
+    @cache_metric
+    def plain(output, expected):
+        return 1.0
+
+    @cache_metric(version="2")
+    def versioned(output, expected):
+        return 1.0
+
+    def unmarked(output, expected):
+        return 1.0
+
+    assert cache_version(plain) == ""
+    assert cache_version(versioned) == "2"
+    assert cache_version(unmarked) is None
+
+
+def _answer(question):
+    return question.replace("q", "a")
+
+
+@pytest.mark.asyncio
+async def test_cached_cpu_bound_metrics_skip_the_process_pool(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\nq1,a1\nq2,a2\n", encoding="utf-8")
+
+    def run():
+        evaluator = Evaluator(
+            task=_answer,
+            dataset=CsvDataset(p, input_col="q", expected_col="a"),
+            metrics=["fuzzy_match"],
+            config={
+                "metric_processes": 1,
+                "metric_cache": ["fuzzy_match"],
+                "output_dir": str(tmp_path / "out"),
+            },
+            langfuse_client=None,
+        )
+        return evaluator, evaluator.arun(show_tui=False)
+
+    first, pending = run()
+    await pending
+    assert first._run_stats()["executors"]["metric_processes"]["completed"] == 2
+    second, pending = run()
+    result = await pending
+    assert all(r["scores"]["fuzzy_match"] == 1.0 for r in result.results.values())
+    assert second._run_stats()["executors"]["metric_processes"]["completed"] == 0
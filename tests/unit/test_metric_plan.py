@@ -0,0 +1,81 @@
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from qym.core.metric_plan import compile_metric_plan
+from qym.metrics import batch_metric
+from qym.metrics.builtin import exact_match, faithfulness, fuzzy_match
+
+
+def test_plan_passes_as_many_positional_args_as_the_metric_takes():
+    calls = []
+
+    def one(output):
+        calls.append((output,))
+        return 1.0
+
+    def none():
+        return 0.5
+
+    assert compile_metric_plan("one", one).call("o", "e", "i") == 1.0
+    assert calls == [("o",)]
+    assert compile_metric_plan("none", none).call("o", "e", "i") == 0.5
+    assert compile_metric_plan("em", exact_match).positional == 2
+    assert compile_metric_plan("faith", faithfulness).positional == 3
+
+
+def test_plan_uses_keywords_for_wide_signatures():
+    def wide(input_data, expected, output, threshold=0.5):
+        return (output, expected, input_data)
+
+    plan = compile_metric_plan("wide", wide)
+    assert plan.kwarg_names == ("output", "expected", "input_data")
+    assert plan.call("o", "e", "i") == ("o", "e", "i")
+
+
+def test_wide_signatures_with_other_names_get_positional_args():
+    def renamed(out, gold, inp, k=1):
+        return (out, gold, inp, k)
+
+    def with_context(output, expected, context, strict=False):
+        return (output, expected, context, strict)
+
+    for func in (renamed, with_context):
+        plan = compile_metric_plan(func.__name__, func)
+        assert plan.kwarg_names == () and plan.positional == 3
+    assert compile_metric_plan("renamed", renamed).call("o", "e", "i") == ("o", "e", "i", 1)
+    assert compile_metric_plan("ctx", with_context).call("o", "e", "i") == ("o", "e", "i", False)
+
+
+@pytest.mark.asyncio
+async def test_plan_records_async_flag_and_executor():
+    async def judge(output, expected):
+        return 1.0 if output == expected else 0.0
+
+    plan = compile_metric_plan("judge", judge)
+    assert plan.is_async and plan.executor == "async"
+    assert await plan.call("a", "a", None) == 1.0
+
+    assert compile_metric_plan("fuzzy", fuzzy_match).executor == "process"
+    assert compile_metric_plan("em", exact_match).executor == "thread"
+
+
+def test_plan_is_picklable_for_the_process_pool():
+    plan = pickle.loads(pickle.dumps(compile_metric_plan("fuzzy_match", fuzzy_match)))
+    assert plan.call("abc", "abc", None) == 1.0
+
+
+def test_calls_do_not_inspect_signatures():
+    plan = compile_metric_plan("em", exact_match)
+    with patch("qym.core.metric_plan.inspect.signature", side_effect=AssertionError):
+        assert plan.call("x", "x", None)["score"] == 1.0
+
+
+def test_batch_metrics_get_the_batch_executor():
+    @batch_metric
+    async def judge_all(outputs, expecteds):
+        return [1.0 for _ in outputs]
+
+    plan = compile_metric_plan("judge_all", judge_all)
+    assert plan.is_batch and plan.is_async and plan.executor == "batch"
@@ -0,0 +1,27 @@
+from types import SimpleNamespace
+
+from qym.core.progress import ProgressTracker
+
+
+def _item(i):
+    return SimpleNamespace(input=f"q{i}", expected_output=f"a{i}")
+
+
+def test_lazy_tracker_keeps_only_recent_finished_items():
+    tracker = ProgressTracker(None, ["exact_match"], keep_finished=2)
+    assert tracker.item_statuses == {}
+
+    for i in range(5):
+        tracker.add_item(i, _item(i))
+        tracker.start_item(i)
+        if i == 1:
+            tracker.fail_item(i, "boom")
+        else:
+            tracker.complete_item(i)
+
+    assert sorted(tracker.item_statuses) == [3, 4]
+    stats = tracker.get_snapshot()["stats"]
+    assert (stats["completed"], stats["failed"], stats["total"]) == (4, 1, 5)
+
+    tracker.set_total(8)
+    assert tracker.get_snapshot()["stats"]["pending"] == 3
@@ -0,0 +1,60 @@
+import pytest
+
+from qym.core.config import EvaluatorConfig
+from qym.core.rate_limit import RateLimiterRegistry, TokenBucket, acquire_rate_limits
+
+
+def test_token_bucket_reserves_then_waits():
+    bucket = TokenBucket(60)  # one token per second
+    assert bucket.reserve(60) == 0.0
+    wait = bucket.reserve(1)
+    assert 0.9 < wait <= 1.0
+    # Reservations queue up behind each other.
+    assert bucket.reserve(1) > wait
+
+
+def test_registry_shares_buckets_by_model_and_provider():
+    registry = RateLimiterRegistry()
+    limits = {"openai": {"rpm": 100}, "openai/gpt-4o": {"tpm": 1000}}
+
+    run_a = registry.resolve("openai/gpt-4o", limits)
+    run_b = registry.resolve("openai/gpt-4o-mini", {"openai": {"rpm": 50}})
+
+    assert [lim.key for lim in run_a] == ["openai/gpt-4o", "openai"]
+    assert run_b[0] is run_a[1]
+    # The stricter limit wins while both runs are active.
+    assert run_b[0].rpm == 50
+    registry.release("openai/gpt-4o-mini", {"openai": {"rpm": 50}})
+    assert run_a[1].rpm == 100
+    assert registry.resolve("anthropic/claude", limits) == []
+    assert registry.resolve(None, limits) == []
+
+
+def test_released_limits_are_replaced_by_the_next_run():
+    registry = RateLimiterRegistry()
+    (strict,) = registry.resolve("gpt-4o", {"gpt-4o": {"rpm": 10, "tpm": 1000}})
+    registry.release("gpt-4o", {"gpt-4o": {"rpm": 10, "tpm": 1000}})
+
+    (relaxed,) = registry.resolve("gpt-4o", {"gpt-4o": {"rpm": 600}})
+
+    assert relaxed is strict
+    assert (relaxed.rpm, relaxed.tpm) == (600, None)
+
+
+@pytest.mark.asyncio
+async def test_acquire_counts_tokens_and_requests():
+    registry = RateLimiterRegistry()
+    (limiter,) = registry.resolve("gpt-4o", {"gpt-4o": {"rpm": 600, "tpm": 6000}})
+    assert await acquire_rate_limits([limiter], tokens=10) == 0.0
+    limiter.record_tokens(6000)
+    assert limiter.tokens.reserve(1) > 0
+    assert limiter.snapshot()["acquired"] == 1
+
+
+def test_config_validates_rate_limits():
+    cfg = EvaluatorConfig(rate_limits={"openai": {"rpm": "100"}})
+    assert cfg.rate_limits == {"openai": {"rpm": 100.0}}
+    with pytest.raises(ValueError):
+        EvaluatorConfig(rate_limits={"openai": {"rps": 1}})
+    with pytest.raises(ValueError):
+        EvaluatorConfig(rate_limits={"openai": {"rpm": 0}})
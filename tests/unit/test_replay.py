@@ -0,0 +1,116 @@
+import json
+import time
+
+import pytest
+
+from qym.adapters.base import auto_detect_task
+from qym.adapters.replay import Replay, ReplayAdapter, ReplayError, ReplayMiss, TaskRecorder
+from qym.core.dataset import CsvDataset
+from qym.core.evaluator import Evaluator
+from qym.utils.errors import classify_error
+
+
+class _Trace:
+    def update(self, **kwargs):
+        pass
+
+
+def _recording(tmp_path):
+    path = str(tmp_path / "calls.jsonl")
+    recorder = TaskRecorder(path, task_name="answer")
+    recorder.record("q1", "m", 0.05, output="a1")
+    recorder.record("q2", "m", 0.01, error=RuntimeError("HTTP 503"))
+    recorder.record("q2", "m", 0.02, output="a2")
+    recorder.close()
+    return path
+
+
+def test_auto_detect_task_picks_the_replay_adapter(tmp_path):
+    replay = Replay(_recording(tmp_path))
+    assert isinstance(auto_detect_task(replay, None), ReplayAdapter)
+    assert replay.__name__ == "answer_replay"
+    assert len(replay) == 3
+
+
+@pytest.mark.asyncio
+async def test_replay_returns_recorded_outputs_after_recorded_delays(tmp_path):
+    adapter = ReplayAdapter(Replay(_recording(tmp_path), speed=2.0), None)
+    started = time.perf_counter()
+    assert await adapter.arun("q1", _Trace(), model_name="m") == "a1"
+    assert time.perf_counter() - started >= 0.02
+    # Calls with the same input replay in order: the failure, then the retry.
+    with pytest.raises(ReplayError, match="503"):
+        await adapter.arun("q2", _Trace(), model_name="m")
+    assert await adapter.arun("q2", _Trace(), model_name="m") == "a2"
+    with pytest.raises(ReplayMiss):
+        await adapter.arun("q1", _Trace(), model_name="other-model")
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class _ProviderError(Exception):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@pytest.mark.asyncio
+async def test_replayed_errors_classify_like_the_recorded_ones(tmp_path):
+    path = str(tmp_path / "calls.jsonl")
+    recorder = TaskRecorder(path)
+    recorded = [_ProviderError("upstream failed", 502), RateLimitError("slow down"), ValueError("bad input")]
+    for error in recorded:
+        recorder.record("q", "m", 0.0, error=error)
+    recorder.close()
+    adapter = ReplayAdapter(Replay(path), None)
+
+    for error in recorded:
+        with pytest.raises(ReplayError) as replayed:
+            await adapter.arun("q", _Trace(), model_name="m")
+        assert classify_error(replayed.value) == classify_error(error)
+    assert replayed.value.error_type == "ValueError"
+    assert [classify_error(e) for e in recorded] == ["server", "throttle", None]
+
+
+def test_sampled_timing_draws_from_all_recorded_latencies(tmp_path):
+    replay = Replay(_recording(tmp_path), timing="sampled", seed=1)
+    assert {replay.delay(None) for _ in range(50)} == {0.05, 0.01, 0.02}
+    assert Replay(_recording(tmp_path), ignore_model=True).lookup("q1", "other-model")["output"] == "a1"
+
+
+@pytest.mark.asyncio
+async def test_recorded_run_replays_offline(tmp_path, monkeypatch):
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\nq1,a1\nq2,a2\nq3,a3\n", encoding="utf-8")
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    recording = str(tmp_path / "calls.jsonl")
+
+    def answer(question):
+        time.sleep(0.02)
+        return question.replace("q", "a")
+
+    recorded = await Evaluator(
+        task=answer,
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config={"record_task_calls": recording, "output_dir": str(tmp_path / "out"), "model": "m"},
+        langfuse_client=None,
+    ).arun(show_tui=False)
+    with open(recording, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert len(entries) == 3
+    assert all(e["latency"] >= 0.02 and e["model"] == "m" for e in entries)
+
+    replayed = await Evaluator(
+        task=Replay(recording),
+        dataset=CsvDataset(p, input_col="q", expected_col="a"),
+        metrics=["exact_match"],
+        config={"output_dir": str(tmp_path / "out"), "model": "m", "max_concurrency": 3},
+        langfuse_client=None,
+    ).arun(show_tui=False)
+    outputs = lambda res: sorted(r["output"] for r in res.results.values())
+    assert outputs(replayed) == outputs(recorded) == ["a1", "a2", "a3"]
+    assert replayed.run_metadata["task_name"] == recorded.run_metadata["task_name"] + "_replay"
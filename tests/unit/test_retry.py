@@ -0,0 +1,73 @@
+import pytest
+
+from qym.core.retry import (
+    RetryBudget,
+    RetryPolicy,
+    call_with_retry,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+class _Throttled(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after=None):
+        super().__init__("rate limited")
+        if retry_after is not None:
+            self.response = type("Resp", (), {"headers": {"retry-after": str(retry_after)}})()
+
+
+def _flaky(failures, exc_factory):
+    calls = {"n": 0}
+
+    async def call():
+        calls["n"] += 1
+        if calls["n"] <= failures:
+            raise exc_factory()
+        return "ok"
+
+    return call, calls
+
+
+def test_classification_and_retry_after():
+    assert is_retryable(_Throttled())
+    assert not is_retryable(ValueError("bad prompt"))
+    assert retry_after_seconds(_Throttled(retry_after=3)) == 3.0
+    assert retry_after_seconds(ValueError("x")) is None
+
+
+def test_backoff_is_capped_and_uses_retry_after():
+    policy = RetryPolicy(max_retries=5, base_delay=1.0, max_delay=4.0)
+    assert all(0.0 <= policy.delay(attempt) <= 4.0 for attempt in range(10))
+    assert policy.delay(0, _Throttled(retry_after=2)) == 2.0
+    assert policy.delay(0, _Throttled(retry_after=100)) == 4.0
+
+
+@pytest.mark.asyncio
+async def test_call_with_retry_records_stats():
+    call, calls = _flaky(2, lambda: _Throttled(retry_after=0))
+    stats = {}
+    result = await call_with_retry(call, policy=RetryPolicy(max_retries=3), stats=stats)
+    assert result == "ok"
+    assert calls["n"] == 3
+    assert stats == {"task_retries": 2, "backoff_seconds": 0.0}
+
+
+@pytest.mark.asyncio
+async def test_fatal_errors_are_not_retried():
+    call, calls = _flaky(1, lambda: ValueError("bad prompt"))
+    with pytest.raises(ValueError):
+        await call_with_retry(call, policy=RetryPolicy(max_retries=3))
+    assert calls["n"] == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_stops_retry_storm():
+    budget = RetryBudget(ratio=0.0, min_retries=1)
+    policy = RetryPolicy(max_retries=3, base_delay=0.001)
+    call, calls = _flaky(10, lambda: _Throttled(retry_after=0))
+    with pytest.raises(_Throttled):
+        await call_with_retry(call, policy=policy, budget=budget)
+    assert calls["n"] == 2
+    assert budget.snapshot() == {"calls": 1, "retries": 1, "exhausted": 1}
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from qym.core.scheduling import longest_first_order, predict_latencies
+
+
+def _item(item_id, text):
+    return SimpleNamespace(id=item_id, input=text)
+
+
+def test_history_orders_slowest_first():
+    items = [_item("a", "x"), _item("b", "x"), _item("c", "x")]
+    order, from_history = longest_first_order(items, {"a": 0.1, "b": 2.0, "c": 0.5})
+    assert order == [1, 2, 0]
+    assert from_history == 3
+
+
+def test_items_without_history_are_estimated_from_input_size():
+    items = [_item("a", "x" * 40), _item("new-long", "x" * 400), _item("new-short", "x" * 4)]
+    predicted, from_history = predict_latencies(items, {"a": 1.0})
+    # 10 tokens took 1s, so 100 tokens are predicted at ~10s and 1 token at ~0.1s.
+    assert from_history == 1
+    assert predicted[1] == 10.0 and predicted[2] == 0.1
+    assert longest_first_order(items, {"a": 1.0})[0] == [1, 0, 2]
+
+
+def test_positional_ids_and_no_history():
+    items = [SimpleNamespace(input="short"), SimpleNamespace(input="a much longer input")]
+    assert longest_first_order(items, {"item_0": 1.0, "item_1": 0.1})[0] == [0, 1]
+    assert longest_first_order(items, {})[0] == [1, 0]
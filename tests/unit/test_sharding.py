@@ -0,0 +1,158 @@
+import csv
+
+import pytest
+
+from qym.core.dataset import CsvDataset
+from qym.core.evaluator import Evaluator
+from qym.core.sharding import (
+    ShardDataset,
+    ShardItem,
+    _portable,
+    _resolve,
+    existing_shard_files,
+    run_item_id,
+    shard_checkpoint_path,
+    split_config,
+)
+
+
+def answer(question):
+    return question.replace("q", "a")
+
+
+def stale_answer(question):
+    return "stale"
+
+
+def _rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def _write_dataset(tmp_path, n):
+    p = tmp_path / "qa.csv"
+    p.write_text("q,a\n" + "".join(f"q{i},a{i}\n" for i in range(n)), encoding="utf-8")
+    return CsvDataset(p, input_col="q", expected_col="a")
+
+
+def test_shard_paths_sit_next_to_the_run_file(tmp_path):
+    run_path = str(tmp_path / "run.csv")
+    assert shard_checkpoint_path(run_path, 0, 3) == str(tmp_path / "run.shard1of3.csv")
+    (tmp_path / "run.shard2of3.csv").write_text("", encoding="utf-8")
+    (tmp_path / "other.shard1of2.csv").write_text("", encoding="utf-8")
+    assert existing_shard_files(run_path) == {str(tmp_path / "run.shard2of3.csv"): 3}
+
+
+def test_run_item_id_prefers_dataset_id():
+    assert run_item_id(4, ShardItem(id="abc", input="x")) == "abc"
+    assert run_item_id(4, object()) == "item_4"
+
+
+def test_portable_reloads_functions_by_source_file():
+    kind, ref = _portable(answer)
+    assert kind == "object"
+    assert _resolve(("file", (__file__, "answer")))("q1") == "a1"
+    assert _portable("exact_match") == ("object", "exact_match")
+    with pytest.raises(ValueError):
+        _portable(lambda q: q)
+
+
+def test_split_config_divides_run_totals_across_shards():
+    config = {
+        "max_concurrency": 10,
+        "min_concurrency": 4,
+        "rate_limits": {"openai": {"rpm": 600, "tpm": 90000}},
+        "timeout": 30,
+    }
+    shard = split_config(config, 4)
+
+    assert shard["max_concurrency"] == 2 and shard["min_concurrency"] == 2
+    assert shard["rate_limits"] == {"openai": {"rpm": 150, "tpm": 22500}}
+    assert shard["timeout"] == 30
+    assert split_config({"max_concurrency": 2, "rate_limits": {}}, 4)["max_concurrency"] == 1
+    assert split_config(config, 1) == config
+
+
+def test_shard_dataset_is_a_plain_item_list():
+    items = [ShardItem(id="item_0", input="q0"), ShardItem(id="item_2", input="q2")]
+    dataset = ShardDataset("qa", items)
+    assert dataset.size == 2
+    assert [item.id for item in dataset.iter_items()] == ["item_0", "item_2"]
+
+
+@pytest.mark.asyncio
+async def test_arun_with_workers_merges_shards_into_one_run(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    evaluator = Evaluator(
+        task=answer,
+        dataset=_write_dataset(tmp_path, 6),
+        metrics=["exact_match"],
+        config={"output_dir": str(tmp_path / "out")},
+        langfuse_client=None,
+        workers=2,
+    )
+    result = await evaluator.arun(show_tui=False)
+
+    assert len(result.results) == 6
+    assert not result.errors
+    assert all(r["scores"]["exact_match"]["score"] == 1.0 for r in result.results.values())
+    rows = _rows(result.last_saved_path)
+    assert sorted(row["item_id"] for row in rows) == sorted(result.results)
+    assert not existing_shard_files(result.last_saved_path)
+
+
+@pytest.mark.asyncio
+async def test_arun_with_workers_resumes_each_shard(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    dataset = _write_dataset(tmp_path, 4)
+    items = dataset.get_items()
+    run_path = tmp_path / "run.csv"
+    # A partial first shard, as left behind by an interrupted run.
+    first = items[0]
+    partial = Evaluator(
+        task=stale_answer,
+        dataset=ShardDataset(dataset.name, [ShardItem(run_item_id(0, first), first.input, first.expected_output)]),
+        metrics=["exact_match"],
+        config={"resume_from": shard_checkpoint_path(str(run_path), 0, 2), "output_dir": str(tmp_path / "out")},
+        langfuse_client=None,
+    )
+    await partial.arun(show_tui=False)
+
+    with pytest.raises(ValueError, match="2 workers"):
+        await Evaluator(
+            task=answer, dataset=dataset, metrics=["exact_match"],
+            config={"resume_from": str(run_path)}, langfuse_client=None, workers=3,
+        ).arun(show_tui=False)
+
+    result = await Evaluator(
+        task=answer,
+        dataset=dataset,
+        metrics=["exact_match"],
+        config={"resume_from": str(run_path), "output_dir": str(tmp_path / "out")},
+        langfuse_client=None,
+        workers=2,
+    ).arun(show_tui=False)
+
+    outputs = {item_id: r["output"] for item_id, r in result.results.items()}
+    assert outputs[run_item_id(0, first)] == "stale"
+    assert sorted(outputs.values()) == ["a1", "a2", "a3", "stale"]
+    assert len(_rows(run_path)) == 4
+    assert not existing_shard_files(str(run_path))
+
+
+@pytest.mark.asyncio
+async def test_arun_with_workers_rejects_load_rate(tmp_path, monkeypatch):
+    monkeypatch.delenv("LANGFUSE_PUBLIC_KEY", raising=False)
+    monkeypatch.delenv("LANGFUSE_SECRET_KEY", raising=False)
+    evaluator = Evaluator(
+        task=answer,
+        dataset=_write_dataset(tmp_path, 4),
+        metrics=["exact_match"],
+        config={"output_dir": str(tmp_path / "out"), "load_rate": 10},
+        langfuse_client=None,
+        workers=2,
+    )
+    with pytest.raises(ValueError, match="load_rate"):
+        await evaluator.arun(show_tui=False)
@@ -0,0 +1,98 @@
+import functools
+import time
+
+from qym.core.task_cache import TaskCache, cache_key, task_identity
+
+
+def _answer(question):
+    return question.upper()
+
+
+def test_key_ignores_dict_order_but_not_model_or_task():
+    task_id = task_identity(_answer)
+    key = cache_key(task_id, "openai/gpt-4o", {"q": "hi", "lang": "en"})
+
+    assert key == cache_key(task_id, "openai/gpt-4o", {"lang": "en", "q": "hi"})
+    assert key != cache_key(task_id, "openai/gpt-4o-mini", {"q": "hi", "lang": "en"})
+    assert key != cache_key("other.task", "openai/gpt-4o", {"q": "hi", "lang": "en"})
+    assert task_identity(_answer).startswith("test_task_cache._answer")
+
+
+def _styled(question, style="plain"):
+    return f"{style}:{question}"
+
+
+class _Chain:
+    def __init__(self, prompt):
+        self.prompt = prompt
+
+    def __call__(self, question):
+        return self.prompt.format(question)
+
+
+def test_partial_arguments_are_part_of_the_identity():
+    terse = task_identity(functools.partial(_styled, style="terse"))
+    verbose = task_identity(functools.partial(_styled, style="verbose"))
+
+    assert terse != verbose
+    assert terse == task_identity(functools.partial(_styled, style="terse"))
+    assert terse.startswith(task_identity(_styled))
+
+
+def _prompted(prompt):
+    def task(question):
+        return prompt.format(question)
+
+    return task
+
+
+def test_factory_prompts_are_part_of_the_identity():
+    assert task_identity(_prompted("A: {}")) != task_identity(_prompted("B: {}"))
+    assert task_identity(_prompted("A: {}")) == task_identity(_prompted("A: {}"))
+
+
+def test_configured_instances_have_no_derived_identity():
+    assert task_identity(_Chain("A: {}")) is None
+    assert task_identity(_Chain("B: {}").__call__) is None
+
+
+def test_hit_miss_and_refresh(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = TaskCache(path)
+    assert cache.get("k") == (False, None)
+    cache.put("k", {"answer": "42"})
+    assert cache.get("k") == (True, {"answer": "42"})
+    cache.close()
+
+    refreshing = TaskCache(path, refresh=True)
+    assert refreshing.get("k") == (False, None)
+    refreshing.put("k", "new")
+    refreshing.close()
+    assert TaskCache(path).get("k") == (True, "new")
+
+
+def test_hits_do_not_commit(tmp_path):
+    cache = TaskCache(str(tmp_path / "cache.sqlite"))
+    cache.put("k", "v")
+    changes = cache._conn.total_changes
+    assert cache.get("k") == (True, "v")
+    assert cache._conn.total_changes == changes and not cache._conn.in_transaction
+    cache.close()
+
+
+def test_age_and_size_eviction(tmp_path):
+    cache = TaskCache(str(tmp_path / "cache.sqlite"), max_age=0.05)
+    cache.put("old", "x")
+    time.sleep(0.1)
+    assert cache.get("old") == (False, None)
+    cache.prune()
+    assert cache.evictions == 1
+
+    sized = TaskCache(str(tmp_path / "sized.sqlite"), max_bytes=25)
+    for key in ("a", "b", "c"):
+        sized.put(key, "0123456789")  # 12 bytes as JSON
+        time.sleep(0.01)
+    sized.get("a")  # most recently used now
+    sized.prune()
+    assert sized.get("b") == (False, None)
+    assert sized.get("a")[0] and sized.get("c")[0]